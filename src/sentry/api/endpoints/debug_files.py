@@ -36,6 +36,7 @@ from sentry.models import (
     create_files_from_dif_zip,
 )
 from sentry.models.debugfile import ProguardArtifactRelease
+from sentry.models.files.utils import STREAMING_READ_AHEAD
 from sentry.models.project import Project
 from sentry.models.release import get_artifact_counts
 from sentry.tasks.assemble import (
@@ -206,7 +207,7 @@ class DebugFilesEndpoint(ProjectEndpoint):
             raise Http404
 
         try:
-            fp = debug_file.file.getfile()
+            fp = debug_file.file.getfile(read_ahead=STREAMING_READ_AHEAD)
             response = StreamingHttpResponse(
                 iter(lambda: fp.read(4096), b""), content_type="application/octet-stream"
             )
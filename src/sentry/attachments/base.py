@@ -1,3 +1,4 @@
+import io
 import zlib
 
 from sentry.utils import metrics
@@ -14,6 +15,32 @@ class MissingAttachmentChunks(Exception):
     pass
 
 
+class AttachmentChunksReader(io.RawIOBase):
+    """
+    A read-only file object over the decompressed chunks of an attachment,
+    holding only a single chunk in memory at a time.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._chunk = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._chunk:
+            try:
+                self._chunk = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+
+        n = min(len(b), len(self._chunk))
+        b[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+
 class CachedAttachment:
     def __init__(
         self,
@@ -63,6 +90,19 @@ class CachedAttachment:
         assert self._data is not UNINITIALIZED_DATA
         return self._data
 
+    def open(self):
+        """
+        Returns a file object with the attachment's data. Unless the data was
+        already loaded, chunks are fetched from the cache lazily while reading.
+
+        Raises `MissingAttachmentChunks` while reading if chunks are missing.
+        """
+        if self._data is UNINITIALIZED_DATA and self._cache is not None:
+            return io.BufferedReader(AttachmentChunksReader(self._cache.get_data_chunks(self)))
+
+        assert self._data is not UNINITIALIZED_DATA
+        return io.BytesIO(self._data)
+
     def delete(self):
         for key in self.chunk_keys:
             self._cache.inner.delete(key)
@@ -152,15 +192,14 @@ class BaseAttachmentCache:
             yield CachedAttachment(cache=self, **attachment)
 
     def get_data(self, attachment):
-        data = []
+        return b"".join(self.get_data_chunks(attachment))
 
+    def get_data_chunks(self, attachment):
         for key in attachment.chunk_keys:
             raw_data = self.inner.get(key, raw=True)
             if raw_data is None:
                 raise MissingAttachmentChunks()
-            data.append(zlib.decompress(raw_data))
-
-        return b"".join(data)
+            yield zlib.decompress(raw_data)
 
     def delete(self, key):
         for attachment in self.get(key):
@@ -1224,6 +1224,10 @@ BGTASKS = {
         "interval": 5 * 60,
         "roles": ["worker"],
     },
+    "sentry.bgtasks.clean_artifactbundlecache:clean_artifactbundlecache": {
+        "interval": 5 * 60,
+        "roles": ["worker"],
+    },
 }
 
 # Sentry logs to two major places: stdout, and it's internal project.
@@ -2122,6 +2126,15 @@ SENTRY_METRICS_DISALLOW_BAD_TAGS = IS_DEV
 SENTRY_METRICS_INDEXER = "sentry.sentry_metrics.indexer.postgres.postgres_v2.PostgresIndexer"
 SENTRY_METRICS_INDEXER_OPTIONS: dict[str, Any] = {}
 SENTRY_METRICS_INDEXER_CACHE_TTL = 3600 * 2
+# Size of the in-process LRU that sits in front of the string indexer cache.
+# Set to 0 to disable the local tier entirely.
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE = 10000
+# TTL of local entries. Kept much shorter than the shared cache so that
+# consumers don't hold on to stale mappings for long.
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_TTL = 300
+# How long a rate-limited string is remembered locally so that we don't go back
+# to the shared cache and the DB for it on every batch.
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_NEGATIVE_TTL = 10
 SENTRY_METRICS_INDEXER_TRANSACTIONS_SAMPLE_RATE = 0.1
 
 SENTRY_METRICS_INDEXER_SPANNER_OPTIONS: dict[str, Any] = {}
@@ -3256,6 +3269,12 @@ KAFKA_TOPICS: Mapping[str, Optional[TopicDefinition]] = {
     KAFKA_SNUBA_SPANS: {"cluster": "default"},
 }
 
+# Number of seconds for which identical outcomes are aggregated in process
+# before they are produced as a single message with the summed quantity. If 0,
+# every outcome is produced right away. See ``sentry.utils.outcomes``.
+SENTRY_OUTCOMES_AGGREGATION_WINDOW = 0
+# Maximum number of distinct aggregated outcomes held before they are produced.
+SENTRY_OUTCOMES_AGGREGATION_MAX_SIZE = 1000
 
 # If True, consumers will create the topics if they don't exist
 KAFKA_CONSUMER_AUTO_CREATE_TOPICS = True
@@ -103,6 +103,42 @@ _INGEST_SPANS_OPTIONS = multiprocessing_options(default_max_batch_size=100) + [
     click.Option(["--output-topic", "output_topic"], type=str, default="snuba-spans"),
 ]
 
+_INGEST_OCCURRENCES_OPTIONS = multiprocessing_options(default_max_batch_size=20) + [
+    click.Option(
+        ["--mode", "mode"],
+        type=click.Choice(["serial", "batched"]),
+        default="serial",
+        help="The mode to process occurrences in. Batched groups occurrences per project.",
+    ),
+]
+
+_INGEST_MONITORS_OPTIONS = [
+    click.Option(
+        ["--mode", "mode"],
+        type=click.Choice(["serial", "parallel"]),
+        default="serial",
+        help="The mode to process check-ins in. Parallel uses multithreading.",
+    ),
+    click.Option(
+        ["--max-batch-size", "max_batch_size"],
+        type=int,
+        default=500,
+        help="Maximum number of check-ins to batch before processing in parallel.",
+    ),
+    click.Option(
+        ["--max-batch-time", "max_batch_time"],
+        type=int,
+        default=10,
+        help="Maximum time (in seconds) to wait before processing a batch in parallel.",
+    ),
+    click.Option(
+        ["--max-workers", "max_workers"],
+        type=int,
+        default=None,
+        help="The maximum number of threads to spawn in parallel mode.",
+    ),
+]
+
 # consumer name -> consumer definition
 # XXX: default_topic is needed to lookup the schema even if the actual topic name has been
 # overridden. This is because the current topic override mechanism means the default topic name
@@ -119,6 +155,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
         "click_options": ingest_replay_recordings_options(),
     },
     "ingest-monitors": {
+        "click_options": _INGEST_MONITORS_OPTIONS,
         "topic": settings.KAFKA_INGEST_MONITORS,
         "strategy_factory": "sentry.monitors.consumers.monitor_consumer.StoreMonitorCheckInStrategyFactory",
     },
@@ -132,7 +169,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "ingest-occurrences": {
         "topic": settings.KAFKA_INGEST_OCCURRENCES,
         "strategy_factory": "sentry.issues.run.OccurrenceStrategyFactory",
-        "click_options": multiprocessing_options(default_max_batch_size=20),
+        "click_options": _INGEST_OCCURRENCES_OPTIONS,
     },
     "events-subscription-results": {
         "topic": settings.KAFKA_EVENTS_SUBSCRIPTIONS_RESULTS,
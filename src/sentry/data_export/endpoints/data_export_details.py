@@ -9,6 +9,7 @@ from sentry.api.base import pending_silo_endpoint
 from sentry.api.bases.organization import OrganizationDataExportPermission, OrganizationEndpoint
 from sentry.api.serializers import serialize
 from sentry.models import Project
+from sentry.models.files.utils import STREAMING_READ_AHEAD
 from sentry.models.organization import Organization
 from sentry.utils import metrics
 
@@ -51,7 +52,7 @@ class DataExportDetailsEndpoint(OrganizationEndpoint):
     def download(self, data_export):
         metrics.incr("dataexport.download", sample_rate=1.0)
         file = data_export._get_file()
-        raw_file = file.getfile()
+        raw_file = file.getfile(read_ahead=STREAMING_READ_AHEAD)
         response = StreamingHttpResponse(
             iter(lambda: raw_file.read(4096), b""), content_type="text/csv"
         )
@@ -1,13 +1,15 @@
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
-from typing import Any, Iterable, Optional, Tuple
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
 
 from rb.clients import LocalClient
 from redis.exceptions import ResponseError
 
 from sentry.digests import Record, ScheduleEntry
 from sentry.digests.backends.base import Backend, InvalidState
+from sentry.utils import metrics
 from sentry.utils.locking.backends.redis import RedisLockBackend
 from sentry.utils.locking.lock import Lock
 from sentry.utils.locking.manager import LockManager
@@ -84,6 +86,21 @@ class RedisBackend(Backend):
         # too early.
         self.ttl = options.pop("ttl", 60 * 60)
 
+        # Sets the number of records that are fetched (and decoded) at a time
+        # when reading a digest. ``digest`` yields an iterator over the records,
+        # so that callers can drop records they do not need without holding
+        # the entire digest in memory.
+        self.chunk_size = options.pop("chunk_size", 1000)
+        if self.chunk_size < 1:
+            raise ValueError("Digest chunk size must be at least 1.")
+
+        # Sets how many partitions (hosts) are scheduled and maintained
+        # concurrently. Each partition is still handled with a single script
+        # call, but partitions no longer wait on each other.
+        self.partition_concurrency = options.pop("partition_concurrency", 4)
+        if self.partition_concurrency < 1:
+            raise ValueError("Partition concurrency must be at least 1.")
+
         super().__init__(**options)
 
     def validate(self) -> None:
@@ -148,22 +165,60 @@ class RedisBackend(Backend):
             ["SCHEDULE", self.namespace, self.ttl, timestamp, deadline],
         )
 
+    def __map_partitions(
+        self, operation: str, function: Callable[[int], Any]
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Calls ``function`` for every partition, ``partition_concurrency`` at a
+        time, yielding ``(host, result)`` pairs as they complete. Partitions
+        that fail are logged and skipped so that one unavailable host does not
+        hold up the others.
+        """
+        hosts = list(self.cluster.hosts)
+        if not hosts:
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(hosts), self.partition_concurrency)
+        ) as executor:
+            futures = {executor.submit(function, host): host for host in hosts}
+            for future in as_completed(futures):
+                host = futures[future]
+                try:
+                    yield host, future.result()
+                except Exception as error:
+                    logger.error(
+                        f"Failed to perform {operation} for partition {host} due to error: {error}",
+                        exc_info=True,
+                    )
+
     def schedule(
         self, deadline: float, timestamp: Optional[float] = None
     ) -> Iterable[ScheduleEntry]:
         if timestamp is None:
             timestamp = time.time()
 
-        for host in self.cluster.hosts:
-            try:
-                for key, timestamp in self.__schedule_partition(host, deadline, timestamp):
-                    yield ScheduleEntry(key.decode("utf-8"), float(timestamp))
-            except Exception as error:
-                logger.error(
-                    f"Failed to perform scheduling for partition {host} due to error: {error}",
-                    exc_info=True,
+        for host, response in self.__map_partitions(
+            "scheduling",
+            lambda host: self.__schedule_partition(host, deadline, timestamp),
+        ):
+            entries = [
+                ScheduleEntry(key.decode("utf-8"), float(entry_timestamp))
+                for key, entry_timestamp in response
+            ]
+
+            tags = {"partition": str(host)}
+            metrics.gauge("digests.schedule.ready", len(entries), tags=tags)
+            if entries:
+                # How far behind its scheduled time the most overdue timeline is.
+                metrics.timing(
+                    "digests.schedule.lag",
+                    timestamp - min(entry.timestamp for entry in entries),
+                    tags=tags,
                 )
 
+            yield from entries
+
     def __maintenance_partition(self, host: int, deadline: float, timestamp: float) -> Any:
         return script(
             self.cluster.get_local_client(host),
@@ -175,14 +230,11 @@ class RedisBackend(Backend):
         if timestamp is None:
             timestamp = time.time()
 
-        for host in self.cluster.hosts:
-            try:
-                self.__maintenance_partition(host, deadline, timestamp)
-            except Exception as error:
-                logger.error(
-                    f"Failed to perform maintenance on digest partition {host} due to error: {error}",
-                    exc_info=True,
-                )
+        for _ in self.__map_partitions(
+            "maintenance",
+            lambda host: self.__maintenance_partition(host, deadline, timestamp),
+        ):
+            pass
 
     @contextmanager
     def digest(
@@ -201,7 +253,7 @@ class RedisBackend(Backend):
                     connection,
                     [key],
                     [
-                        "DIGEST_OPEN",
+                        "DIGEST_OPEN_KEYS",
                         self.namespace,
                         self.ttl,
                         timestamp,
@@ -215,35 +267,48 @@ class RedisBackend(Backend):
                 else:
                     raise
 
-            records = [
-                Record(
-                    key.decode(),
-                    self.codec.decode(value) if value is not None else None,
-                    float(timestamp),
-                )
-                for key, value, timestamp in response
+            # The response is a flat list of alternating record keys and scores.
+            entries = [
+                (record_key.decode(), float(score))
+                for record_key, score in zip(response[::2], response[1::2])
             ]
-
-            # If the record value is `None`, this means the record data was
-            # missing (it was presumably evicted by Redis) so we don't need to
-            # return it here.
-            filtered_records = [record for record in records if record.value is not None]
-            if len(records) != len(filtered_records):
-                logger.warning(
-                    "Filtered out missing records when fetching digest",
-                    extra={
-                        "key": key,
-                        "record_count": len(records),
-                        "filtered_record_count": len(filtered_records),
-                    },
-                )
-            yield filtered_records
+            yield self.__iterate_records(connection, key, entries)
 
             script(
                 connection,
                 [key],
                 ["DIGEST_CLOSE", self.namespace, self.ttl, timestamp, key, minimum_delay]
-                + [record.key for record in records],
+                + [record_key for record_key, _ in entries],
+            )
+
+    def __iterate_records(
+        self, connection: LocalClient, key: str, entries: Sequence[Tuple[str, float]]
+    ) -> Iterator[Record]:
+        # Record contents are fetched and decoded a chunk at a time, so that callers which
+        # only keep some of the records never hold the entire digest in memory.
+        missing = 0
+        for i in range(0, len(entries), self.chunk_size):
+            chunk = entries[i : i + self.chunk_size]
+            values = connection.mget(
+                [f"{self.namespace}:t:{key}:r:{record_key}" for record_key, _ in chunk]
+            )
+            for (record_key, timestamp), value in zip(chunk, values):
+                # If the record value is `None`, this means the record data was
+                # missing (it was presumably evicted by Redis) so we don't need to
+                # return it here.
+                if value is None:
+                    missing += 1
+                    continue
+                yield Record(record_key, self.codec.decode(value), timestamp)
+
+        if missing:
+            logger.warning(
+                "Filtered out missing records when fetching digest",
+                extra={
+                    "key": key,
+                    "record_count": len(entries),
+                    "filtered_record_count": len(entries) - missing,
+                },
             )
 
     def delete(self, key: str, timestamp: Optional[float] = None) -> None:
@@ -4,7 +4,8 @@ import functools
 import itertools
 import logging
 from collections import defaultdict, namedtuple
-from typing import Any, Mapping, MutableMapping, MutableSequence, Sequence
+from datetime import datetime
+from typing import Any, Iterable, Mapping, MutableMapping, MutableSequence, Sequence
 
 from sentry import tsdb
 from sentry.digests import Digest, Record
@@ -21,6 +22,8 @@ Notification = namedtuple(
     "Notification", "event rules notification_uuid", defaults=(None, None, None)
 )
 
+TruncatedRecords = namedtuple("TruncatedRecords", "records start end")
+
 
 def split_key(
     key: str,
@@ -72,13 +75,56 @@ def event_to_record(
     )
 
 
-def fetch_state(project: Project, records: Sequence[Record]) -> Mapping[str, Any]:
+def truncate_records(records: Iterable[Record], limit: int) -> TruncatedRecords:
+    """
+    Consume records (in reverse chronological order, as returned by the
+    backend) and only keep the ``limit`` most recent records that each rule
+    files under each group (see ``group_records``). Records that are not among
+    the most recent ones of any of their rules are dropped, as are records
+    without rules, which never show up in a digest. A ``limit`` of 0 keeps
+    everything.
+
+    With a limit, each group of a rule lists at most ``limit`` records in the
+    digest (more if a retained record is also among the most recent records of
+    another rule). The time range covered by all records is returned alongside
+    the retained records, so that event and user counts are still fetched for
+    the whole digest.
+    """
+    if not limit:
+        return TruncatedRecords(list(records), None, None)
+
+    retained: MutableSequence[Record] = []
+    counts: MutableMapping[tuple[int, int], int] = defaultdict(int)
+    start = end = None
+    for record in records:
+        start = record.datetime
+        if end is None:
+            end = start
+
+        group_id = record.value.event.group_id
+        keys = [(rule, group_id) for rule in record.value.rules]
+        keys = [key for key in keys if counts[key] < limit]
+        if keys:
+            for key in keys:
+                counts[key] += 1
+            retained.append(record)
+
+    return TruncatedRecords(retained, start, end)
+
+
+def fetch_state(
+    project: Project,
+    records: Sequence[Record],
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> Mapping[str, Any]:
     # This reads a little strange, but remember that records are returned in
     # reverse chronological order, and we query the database in chronological
-    # order.
+    # order. ``start`` and ``end`` cover records that were dropped by
+    # ``truncate_records``.
     # NOTE: This doesn't account for any issues that are filtered out later.
-    start = records[-1].datetime
-    end = records[0].datetime
+    start = start or records[-1].datetime
+    end = end or records[0].datetime
 
     groups = Group.objects.in_bulk(record.value.event.group_id for record in records)
     tenant_ids = {"organization_id": project.organization_id}
@@ -206,12 +252,14 @@ def build_digest(
     project: Project,
     records: Sequence[Record],
     state: Mapping[str, Any] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
 ) -> tuple[Digest | None, Sequence[str]]:
     if not records:
         return None, []
 
     # XXX(hack): Allow generating a mock digest without actually doing any real IO!
-    state = state or fetch_state(project, records)
+    state = state or fetch_state(project, records, start, end)
 
     pipeline = (
         Pipeline()
@@ -1,4 +1,4 @@
-from .rules.base import generate_rules
+from .rules.base import generate_rules, generate_rules_many
 from .rules.biases.boost_environments_bias import ENVIRONMENT_GLOBS, BoostEnvironmentsBias
 from .rules.biases.boost_latest_releases_bias import BoostLatestReleasesBias
 from .rules.biases.ignore_health_checks_bias import IgnoreHealthChecksBias
@@ -23,6 +23,7 @@ from .rules.utils import (
 
 __all__ = [
     "generate_rules",
+    "generate_rules_many",
     "get_supported_biases_ids",
     "get_user_biases",
     "get_enabled_user_biases",
@@ -1,6 +1,7 @@
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import List, OrderedDict, Set
+from typing import Dict, List, Optional, OrderedDict, Sequence, Set
 
 import sentry_sdk
 
@@ -57,15 +58,30 @@ def is_sliding_window_org_enabled(organization: Organization) -> bool:
 
 
 def get_guarded_blended_sample_rate(organization: Organization, project: Project) -> float:
+    return _guard_blended_sample_rate(
+        organization, project, _get_blended_sample_rate(organization), None
+    )
+
+
+def _get_blended_sample_rate(organization: Organization) -> float:
     sample_rate = quotas.get_blended_sample_rate(organization_id=organization.id)  # type:ignore
 
     # If the sample rate is None, it means that dynamic sampling rules shouldn't be generated.
     if sample_rate is None:
         raise Exception("get_blended_sample_rate returns none")
 
+    return float(sample_rate)
+
+
+def _guard_blended_sample_rate(
+    organization: Organization,
+    project: Project,
+    sample_rate: float,
+    sliding_window_enabled: Optional[bool],
+) -> float:
     # If the sample rate is 100%, we don't want to use any special dynamic sample rate, we will just sample at 100%.
     if sample_rate == 1.0:
-        return float(sample_rate)
+        return sample_rate
 
     # For now, we will keep this new boost for orgs with the sliding window enabled.
     #
@@ -74,8 +90,11 @@ def get_guarded_blended_sample_rate(organization: Organization, project: Project
     if is_recently_added(model=project) or is_recently_added(model=organization):
         return 1.0
 
+    if sliding_window_enabled is None:
+        sliding_window_enabled = is_sliding_window_enabled(organization)
+
     # We want to use the normal sliding window only if the sliding window at the org level is disabled.
-    if is_sliding_window_enabled(organization):
+    if sliding_window_enabled:
         # In case we use sliding window, we want to fall back to the original sample rate in case there was an error,
         # whereas if we don't find a value in cache, we just sample at 100% under the assumption that the project
         # has just been created.
@@ -133,3 +152,46 @@ def generate_rules(project: Project) -> List[PolymorphicRule]:
         return []
     else:
         return rules
+
+
+def generate_rules_many(projects: Sequence[Project]) -> Dict[int, List[PolymorphicRule]]:
+    """
+    Generates the rules of many projects, keyed by project id.
+
+    The blended sample rate, the sliding window mode and the combined biases only depend on the
+    organization, so they are computed once per organization instead of once per project.
+    """
+    projects_by_org: Dict[int, List[Project]] = defaultdict(list)
+    for project in projects:
+        projects_by_org[project.organization_id].append(project)
+
+    rules: Dict[int, List[PolymorphicRule]] = {}
+    for org_projects in projects_by_org.values():
+        organization = org_projects[0].organization
+
+        try:
+            blended_sample_rate = _get_blended_sample_rate(organization)
+            sliding_window_enabled = is_sliding_window_enabled(organization)
+            combined_biases = get_relay_biases_combinator(organization).get_combined_biases()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            rules.update((project.id, []) for project in org_projects)
+            continue
+
+        for project in org_projects:
+            try:
+                rules[project.id] = _get_rules_of_enabled_biases(
+                    project,
+                    _guard_blended_sample_rate(
+                        organization, project, blended_sample_rate, sliding_window_enabled
+                    ),
+                    get_enabled_user_biases(
+                        project.get_option("sentry:dynamic_sampling_biases", None)
+                    ),
+                    combined_biases,
+                )
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+                rules[project.id] = []
+
+    return rules
@@ -1,5 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypedDict, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 
 from snuba_sdk import (
     AliasedExpression,
@@ -25,7 +38,7 @@ from sentry.dynamic_sampling.rules.base import (
     is_sliding_window_enabled,
     is_sliding_window_org_enabled,
 )
-from sentry.dynamic_sampling.tasks.common import GetActiveOrgs, TimedIterator
+from sentry.dynamic_sampling.tasks.common import GetActiveOrgs, TimedIterator, TimeoutException
 from sentry.dynamic_sampling.tasks.constants import (
     BOOST_LOW_VOLUME_TRANSACTIONS_QUERY_INTERVAL,
     CHUNK_SIZE,
@@ -37,7 +50,7 @@ from sentry.dynamic_sampling.tasks.helpers.boost_low_volume_projects import (
     get_boost_low_volume_projects_sample_rate,
 )
 from sentry.dynamic_sampling.tasks.helpers.boost_low_volume_transactions import (
-    set_transactions_resampling_rates,
+    set_transactions_resampling_rates_many,
 )
 from sentry.dynamic_sampling.tasks.helpers.sliding_window import get_sliding_window_sample_rate
 from sentry.dynamic_sampling.tasks.logging import log_sample_rate_source
@@ -135,10 +148,27 @@ def boost_low_volume_transactions(context: TaskContext) -> None:
             name=get_volumes_big,
         )
 
-        for project_transactions in transactions_zip(
+        # the three queries are independent of each other, page through them concurrently
+        # instead of waiting on Snuba one page at a time
+        (totals, big_transactions, small_transactions), timeout = fetch_concurrently(
             totals_it, big_transactions_it, small_transactions_it
+        )
+
+        org_transactions: List[ProjectTransactions] = []
+        for project_transactions in transactions_zip(
+            iter(totals), iter(big_transactions), iter(small_transactions)
         ):
-            boost_low_volume_transactions_of_project.delay(project_transactions)
+            if org_transactions and org_transactions[0]["org_id"] != project_transactions["org_id"]:
+                boost_low_volume_transactions_of_org.delay(org_transactions)
+                org_transactions = []
+            org_transactions.append(project_transactions)
+
+        if org_transactions:
+            boost_low_volume_transactions_of_org.delay(org_transactions)
+
+        # the projects fetched before the timeout have been dispatched, stop here
+        if timeout is not None:
+            raise timeout
 
 
 @instrumented_task(
@@ -152,6 +182,56 @@ def boost_low_volume_transactions(context: TaskContext) -> None:
 )
 @dynamic_sampling_task
 def boost_low_volume_transactions_of_project(project_transactions: ProjectTransactions) -> None:
+    _boost_low_volume_transactions_of_org([project_transactions])
+
+
+@instrumented_task(
+    name="sentry.dynamic_sampling.boost_low_volume_transactions_of_org",
+    queue="dynamicsampling",
+    default_retry_delay=5,
+    max_retries=5,
+    soft_time_limit=25 * 60,
+    time_limit=2 * 60 + 5,
+    silo_mode=SiloMode.REGION,
+)
+@dynamic_sampling_task
+def boost_low_volume_transactions_of_org(org_transactions: List[ProjectTransactions]) -> None:
+    """
+    Rebalances the transactions of all given projects, which belong to the same organization,
+    and stores the resulting rates in a single Redis round trip.
+    """
+    _boost_low_volume_transactions_of_org(org_transactions)
+
+
+def _boost_low_volume_transactions_of_org(org_transactions: List[ProjectTransactions]) -> None:
+    if not org_transactions:
+        return
+
+    rates = []
+    for project_transactions in org_transactions:
+        rebalanced_transactions = _rebalance_transactions_of_project(project_transactions)
+        if rebalanced_transactions is not None:
+            named_rates, implicit_rate = rebalanced_transactions
+            rates.append((project_transactions["project_id"], named_rates, implicit_rate))
+
+    if not rates:
+        return
+
+    set_transactions_resampling_rates_many(
+        org_id=org_transactions[0]["org_id"],
+        rates=rates,
+        ttl_ms=DEFAULT_REDIS_CACHE_KEY_TTL,
+    )
+
+    for project_id, _, _ in rates:
+        schedule_invalidate_project_config(
+            project_id=project_id, trigger="dynamic_sampling_boost_low_volume_transactions"
+        )
+
+
+def _rebalance_transactions_of_project(
+    project_transactions: ProjectTransactions,
+) -> Optional[Tuple[List[RebalancedItem], float]]:
     org_id = project_transactions["org_id"]
     project_id = project_transactions["project_id"]
     total_num_transactions = project_transactions.get("total_num_transactions")
@@ -196,7 +276,7 @@ def boost_low_volume_transactions_of_project(project_transactions: ProjectTransa
 
     if sample_rate is None or sample_rate == 1.0:
         # no sampling => no rebalancing
-        return
+        return None
 
     intensity = options.get("dynamic-sampling.prioritise_transactions.rebalance_intensity", 1.0)
 
@@ -211,23 +291,52 @@ def boost_low_volume_transactions_of_project(project_transactions: ProjectTransa
             intensity=intensity,
         ),
     )
-    # In case the result of the model is None, it means that an error occurred, thus we want to early return.
-    if rebalanced_transactions is None:
-        return
+    # In case the result of the model is None, it means that an error occurred.
+    return rebalanced_transactions
 
-    # Only after checking the nullability of rebalanced_transactions, we want to unpack the tuple.
-    named_rates, implicit_rate = rebalanced_transactions
-    set_transactions_resampling_rates(
-        org_id=org_id,
-        proj_id=project_id,
-        named_rates=named_rates,
-        default_rate=implicit_rate,
-        ttl_ms=DEFAULT_REDIS_CACHE_KEY_TTL,
-    )
 
-    schedule_invalidate_project_config(
-        project_id=project_id, trigger="dynamic_sampling_boost_low_volume_transactions"
+def fetch_concurrently(
+    *iterators: Iterator[Any],
+) -> Tuple[List[List[Any]], Optional[TimeoutException]]:
+    """
+    Exhausts each of the passed iterators on its own thread and returns the collected results
+    in the same order as the iterators.
+
+    The iterators must yield items ordered by project identity. If an iterator times out, the
+    results fetched so far are kept for the projects before the last one it yielded, since the
+    data of the following projects is incomplete. The timeout is returned with the results so
+    that the caller can process them before re-raising it. Any other exception is re-raised.
+    """
+
+    def collect(iterator: Iterator[Any]) -> Tuple[List[Any], Optional[TimeoutException]]:
+        items: List[Any] = []
+        try:
+            for item in iterator:
+                items.append(item)
+        except TimeoutException as e:
+            return items, e
+        return items, None
+
+    with ThreadPoolExecutor(max_workers=len(iterators)) as executor:
+        futures = [executor.submit(collect, iterator) for iterator in iterators]
+        collected = [future.result() for future in futures]
+
+    timeouts = [(items, timeout) for items, timeout in collected if timeout is not None]
+    if not timeouts:
+        return [items for items, _ in collected], None
+
+    timeout = timeouts[0][1]
+    if not all(items for items, _ in timeouts):
+        return [[] for _ in collected], timeout
+
+    cutoff = min(
+        (items[-1] for items, _ in timeouts), key=lambda item: (item["org_id"], item["project_id"])
     )
+    results = [
+        [item for item in items if is_project_identity_before(item, cutoff)]
+        for items, _ in collected
+    ]
+    return results, timeout
 
 
 def is_same_project(left: Optional[ProjectIdentity], right: Optional[ProjectIdentity]) -> bool:
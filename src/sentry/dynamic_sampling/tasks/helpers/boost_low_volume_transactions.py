@@ -1,4 +1,4 @@
-from typing import List, Mapping, Tuple
+from typing import List, Mapping, Sequence, Tuple
 
 import sentry_sdk
 
@@ -29,10 +29,24 @@ def get_transactions_resampling_rates(
 def set_transactions_resampling_rates(
     org_id: int, proj_id: int, named_rates: List[RebalancedItem], default_rate: float, ttl_ms: int
 ) -> None:
+    set_transactions_resampling_rates_many(
+        org_id=org_id, rates=[(proj_id, named_rates, default_rate)], ttl_ms=ttl_ms
+    )
+
+
+def set_transactions_resampling_rates_many(
+    org_id: int, rates: Sequence[Tuple[int, List[RebalancedItem], float]], ttl_ms: int
+) -> None:
+    """
+    Stores the resampling rates of many projects of an organization, given as
+    ``(proj_id, named_rates, default_rate)`` tuples, in a single pipeline.
+    """
     redis_client = get_redis_client_for_ds()
-    cache_key = _get_cache_key(org_id=org_id, proj_id=proj_id)
-    named_rates_dict = {rate.id: rate.new_sample_rate for rate in named_rates}
-    val = [named_rates_dict, default_rate]
-    val_str = json.dumps(val)
-    redis_client.set(cache_key, val_str)
-    redis_client.pexpire(cache_key, ttl_ms)
+    with redis_client.pipeline(transaction=False) as pipeline:
+        for proj_id, named_rates, default_rate in rates:
+            cache_key = _get_cache_key(org_id=org_id, proj_id=proj_id)
+            named_rates_dict = {rate.id: rate.new_sample_rate for rate in named_rates}
+            val = [named_rates_dict, default_rate]
+            val_str = json.dumps(val)
+            pipeline.set(cache_key, val_str, px=ttl_ms)
+        pipeline.execute()
@@ -9,7 +9,6 @@ import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from io import BytesIO
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -2313,9 +2312,20 @@ def save_attachment(
     else:
         timestamp = datetime.utcnow().replace(tzinfo=timezone.utc)
 
+    file = File.objects.create(
+        name=attachment.name,
+        type=attachment.type,
+        headers={"Content-Type": attachment.content_type},
+    )
+
     try:
-        data = attachment.data
+        # Chunked attachments are streamed from the attachment cache into the
+        # file store, so large attachments are never held in memory at once.
+        with attachment.open() as fp:
+            file.putfile(fp, blob_size=settings.SENTRY_ATTACHMENT_BLOB_SIZE)
     except MissingAttachmentChunks:
+        file.delete()
+
         track_outcome(
             org_id=project.organization_id,
             project_id=project.id,
@@ -2330,13 +2340,6 @@ def save_attachment(
         logger.exception("Missing chunks for cache_key=%s", cache_key)
         return
 
-    file = File.objects.create(
-        name=attachment.name,
-        type=attachment.type,
-        headers={"Content-Type": attachment.content_type},
-    )
-    file.putfile(BytesIO(data), blob_size=settings.SENTRY_ATTACHMENT_BLOB_SIZE)
-
     EventAttachment.objects.create(
         event_id=event_id,
         project_id=project.id,
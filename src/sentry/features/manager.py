@@ -264,7 +264,7 @@ class FeatureManager(RegisteredFeatureManager):
             )
         else:
             # Fall back to default handler if no entity handler available.
-            project_features = filter(lambda name: name.startswith("projects:"), feature_names)
+            project_features = [name for name in feature_names if name.startswith("projects:")]
             if projects and project_features:
                 results: MutableMapping[str, Mapping[str, bool]] = {}
                 for project in projects:
@@ -273,7 +273,7 @@ class FeatureManager(RegisteredFeatureManager):
                         proj_results[feature_name] = self.has(feature_name, project, actor=actor)
                 return results
 
-            org_features = filter(lambda name: name.startswith("organizations:"), feature_names)
+            org_features = [name for name in feature_names if name.startswith("organizations:")]
             if organization and org_features:
                 org_results = {}
                 for feature_name in org_features:
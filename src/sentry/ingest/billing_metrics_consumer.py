@@ -18,7 +18,7 @@ from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.sentry_metrics.utils import reverse_resolve_tag_value
 from sentry.utils import json
 from sentry.utils.kafka_config import get_kafka_consumer_cluster_options, get_topic_definition
-from sentry.utils.outcomes import Outcome, track_outcome
+from sentry.utils.outcomes import Outcome, flush_outcomes, track_outcome
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +67,9 @@ class BillingMetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPaylo
     ) -> ProcessingStrategy[KafkaPayload]:
         return BillingTxCountMetricConsumerStrategy(commit)
 
+    def shutdown(self) -> None:
+        flush_outcomes()
+
 
 class MetricsBucket(TypedDict):
     """
@@ -21,6 +21,7 @@ from sentry.ingest.types import ConsumerType
 from sentry.processing.backpressure.arroyo import HealthChecker, create_backpressure_step
 from sentry.utils import kafka_config
 from sentry.utils.arroyo import RunTaskWithMultiprocessing
+from sentry.utils.outcomes import flush_outcomes
 
 from .attachment_event import decode_and_process_chunks, process_attachments_and_events
 from .simple_event import process_simple_event_message
@@ -117,6 +118,9 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
 
         return create_backpressure_step(health_checker=self.health_checker, next_step=step_1)
 
+    def shutdown(self) -> None:
+        flush_outcomes()
+
 
 def get_ingest_consumer(
     consumer_type: str,
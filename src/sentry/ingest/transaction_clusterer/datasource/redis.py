@@ -1,10 +1,14 @@
 """ Write transactions into redis sets """
+import atexit
 import logging
 import random
-from typing import Any, Iterator, Mapping, Optional
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
 import sentry_sdk
+from celery.signals import worker_process_shutdown
 from django.conf import settings
 
 from sentry import features, options
@@ -26,9 +30,16 @@ MAX_SET_SIZE = 4000
 #: Remove the set if it has not received any updates for 24 hours.
 SET_TTL = 24 * 60 * 60
 
+#: Retention of the serialized clusterer tree of a project.
+#: The tree is rewritten on every clusterer run, so it only expires for
+#: projects that stopped sending samples.
+TREE_TTL = 7 * 24 * 60 * 60
+
+#: Maximum number of distinct samples per project kept in the in-process
+#: buffer between two flushes.
+MAX_BUFFERED_SAMPLES_PER_PROJECT = 100
+
 
-# TODO(iker): accept multiple values to add to the set. Right now, multiple
-# calls for each individual value are required, producing too many Redis calls.
 add_to_set = redis.load_script("utils/sadd_capped.lua")
 logger = logging.getLogger(__name__)
 
@@ -38,6 +49,11 @@ def _get_redis_key(namespace: ClustererNamespace, project: Project) -> str:
     return f"{prefix}:o:{project.organization_id}:p:{project.id}"
 
 
+def _get_tree_key(namespace: ClustererNamespace, project: Project) -> str:
+    """The key for the serialized clusterer tree of a project"""
+    return f"{_get_redis_key(namespace, project)}:tree"
+
+
 def _get_projects_key(namespace: ClustererNamespace) -> str:
     """The key for the meta-set of projects"""
     prefix = namespace.value.data
@@ -71,17 +87,120 @@ def get_active_projects(namespace: ClustererNamespace) -> Iterator[Project]:
             logger.debug("Could not find project %s in db", project_id)
 
 
+def _store_sample(namespace: ClustererNamespace, project: Project, sample: str) -> None:
+    """Write the sample to redis right away, or buffer it if buffering is enabled"""
+    flush_size = options.get("txnames.sample-buffer.flush-size")
+    if flush_size:
+        _sample_buffers[namespace].add(
+            project, sample, flush_size, options.get("txnames.sample-buffer.flush-interval")
+        )
+    else:
+        # Buffering may just have been switched off, write out what is still held.
+        _sample_buffers[namespace].flush()
+        _record_sample(namespace, project, sample)
+
+
 def _record_sample(namespace: ClustererNamespace, project: Project, sample: str) -> None:
-    with sentry_sdk.start_span(op="cluster.{namespace.value.name}.record_sample"):
+    _record_samples(namespace, project, [sample])
+
+
+def _record_samples(
+    namespace: ClustererNamespace, project: Project, samples: Sequence[str]
+) -> None:
+    with sentry_sdk.start_span(op=f"cluster.{namespace.value.name}.record_sample"):
         client = get_redis_client()
         redis_key = _get_redis_key(namespace, project)
-        created = add_to_set(client, [redis_key], [sample, MAX_SET_SIZE, SET_TTL])
+        created = add_to_set(client, [redis_key], [MAX_SET_SIZE, SET_TTL, *samples])
         if created:
             projects_key = _get_projects_key(namespace)
             client.sadd(projects_key, project.id)
             client.expire(projects_key, SET_TTL)
 
 
+class SampleBuffer:
+    """Collects samples in process and writes them to redis in batches.
+
+    Every project keeps a reservoir of at most ``MAX_BUFFERED_SAMPLES_PER_PROJECT``
+    distinct samples, so that each sample seen since the last flush has the same
+    chance of being written. The buffer is flushed once it holds ``flush_size``
+    samples, or on the first sample after ``flush_interval`` seconds.
+    """
+
+    def __init__(self, namespace: ClustererNamespace) -> None:
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._projects: Dict[int, Project] = {}
+        self._reservoirs: Dict[int, List[str]] = {}
+        self._seen: Dict[int, int] = {}
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, project: Project, sample: str, flush_size: int, flush_interval: float) -> None:
+        with self._lock:
+            reservoir = self._reservoirs.setdefault(project.id, [])
+            if sample not in reservoir:
+                self._projects[project.id] = project
+                seen = self._seen[project.id] = self._seen.get(project.id, 0) + 1
+                if len(reservoir) < MAX_BUFFERED_SAMPLES_PER_PROJECT:
+                    reservoir.append(sample)
+                    self._size += 1
+                else:
+                    index = random.randrange(seen)
+                    if index < MAX_BUFFERED_SAMPLES_PER_PROJECT:
+                        reservoir[index] = sample
+
+            if self._size < flush_size and time.monotonic() - self._last_flush < flush_interval:
+                return
+            batch = self._take()
+
+        self._write(batch)
+
+    def flush(self) -> None:
+        if not self._size:
+            return
+        with self._lock:
+            batch = self._take()
+        self._write(batch)
+
+    def _take(self) -> List[Tuple[Project, List[str]]]:
+        batch = [
+            (self._projects[project_id], samples)
+            for project_id, samples in self._reservoirs.items()
+            if samples
+        ]
+        self._reset()
+        return batch
+
+    def _write(self, batch: List[Tuple[Project, List[str]]]) -> None:
+        for project, samples in batch:
+            # One failing project must not take the rest of the batch with it.
+            safe_execute(
+                _record_samples, self._namespace, project, samples, _with_transaction=False
+            )
+
+
+_sample_buffers = {namespace: SampleBuffer(namespace) for namespace in ClustererNamespace}
+
+
+def flush_sample_buffers() -> None:
+    """Write all samples still held in the in-process buffers to redis"""
+    for buffer in _sample_buffers.values():
+        buffer.flush()
+
+
+atexit.register(flush_sample_buffers)
+
+
+@worker_process_shutdown.connect(weak=False)
+def _flush_sample_buffers_on_worker_shutdown(**kwargs: object) -> None:
+    # Samples are recorded from post_process tasks. Celery prefork children exit through
+    # `os._exit`, which skips `atexit` handlers.
+    flush_sample_buffers()
+
+
 def get_transaction_names(project: Project) -> Iterator[str]:
     """Return all transaction names stored for the given project"""
     client = get_redis_client()
@@ -100,10 +219,26 @@ def clear_samples(namespace: ClustererNamespace, project: Project) -> None:
     client.unlink(redis_key)
 
 
+def get_tree_state(namespace: ClustererNamespace, project: Project) -> Optional[str]:
+    """Return the clusterer tree stored by the previous run, if any"""
+    client = get_redis_client()
+    return client.get(_get_tree_key(namespace, project))
+
+
+def set_tree_state(namespace: ClustererNamespace, project: Project, state: Optional[str]) -> None:
+    """Store the clusterer tree for the next run, or drop it if ``state`` is None"""
+    client = get_redis_client()
+    tree_key = _get_tree_key(namespace, project)
+    if state is None:
+        client.unlink(tree_key)
+    else:
+        client.set(tree_key, state, ex=TREE_TTL)
+
+
 def record_transaction_name(project: Project, event_data: Mapping[str, Any], **kwargs: Any) -> None:
     if transaction_name := _should_store_transaction_name(event_data):
         safe_execute(
-            _record_sample,
+            _store_sample,
             ClustererNamespace.TRANSACTIONS,
             project,
             transaction_name,
@@ -191,7 +326,7 @@ def record_span_descriptions(
             continue
         url_path = _get_url_path_from_description(description)
         if url_path:
-            safe_execute(_record_sample, ClustererNamespace.SPANS, project, url_path)
+            safe_execute(_store_sample, ClustererNamespace.SPANS, project, url_path)
 
         update_rule_rate = options.get("span_descs.bump-lifetime-sample-rate")
         if update_rule_rate and random.random() < update_rule_rate:
@@ -1,9 +1,9 @@
 from itertools import islice
-from typing import Any, Sequence
+from typing import Any, List, Sequence
 
 import sentry_sdk
 
-from sentry import features
+from sentry import features, options
 from sentry.ingest.transaction_clusterer.base import ReplacementRule
 from sentry.models import Project
 from sentry.tasks.base import instrumented_task
@@ -31,6 +31,10 @@ PROJECTS_PER_TASK = 100
 #: this estimation for project batches instead.
 CLUSTERING_TIMEOUT_PER_PROJECT = 0.15
 
+#: Maximum number of nodes of a clusterer tree kept between runs. Bigger trees
+#: are dropped and rebuilt from scratch with the next samples.
+MAX_TREE_SIZE = 50000
+
 
 @instrumented_task(
     name="sentry.ingest.transaction_clusterer.tasks.spawn_clusterers",
@@ -66,7 +70,11 @@ def cluster_projects(projects: Sequence[Project]) -> None:
                 span.set_data("project_id", project.id)
                 tx_names = list(redis.get_transaction_names(project))
                 new_rules = []
-                if len(tx_names) >= MERGE_THRESHOLD:
+                if options.get("txnames.clusterer.incremental"):
+                    new_rules = _cluster_incrementally(
+                        ClustererNamespace.TRANSACTIONS, project, tx_names
+                    )
+                elif len(tx_names) >= MERGE_THRESHOLD:
                     clusterer = TreeClusterer(merge_threshold=MERGE_THRESHOLD)
                     clusterer.add_input(tx_names)
                     new_rules = clusterer.get_rules()
@@ -95,6 +103,26 @@ def cluster_projects(projects: Sequence[Project]) -> None:
             )
 
 
+def _cluster_incrementally(
+    namespace: ClustererNamespace, project: Project, samples: Sequence[str]
+) -> List[ReplacementRule]:
+    """Adds the new samples to the tree stored by the previous run and
+    computes rules for the parts of the tree they changed."""
+    clusterer = TreeClusterer(
+        merge_threshold=MERGE_THRESHOLD, state=redis.get_tree_state(namespace, project)
+    )
+    clusterer.add_input(samples)
+    new_rules = clusterer.get_rules()
+
+    tree_size = clusterer.tree_size()
+    metrics.timing("txcluster.tree_size", tree_size, tags={"namespace": namespace.value.name})
+    redis.set_tree_state(
+        namespace, project, clusterer.dump_state() if tree_size <= MAX_TREE_SIZE else None
+    )
+
+    return new_rules
+
+
 @instrumented_task(
     name="sentry.ingest.span_clusterer.tasks.spawn_span_cluster_projects",
     queue="transactions.name_clusterer",  # XXX(iker): we should use a different queue
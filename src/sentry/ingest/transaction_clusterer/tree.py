@@ -43,15 +43,22 @@ Resulting in the following replacement rules:
 
 The replacement rules are interpreted by Relay to match and replace `*`, and to match but ignore `**`.
 
+The (merged) tree can be dumped into a compact serialized state and loaded
+again on the next run. Only the nodes touched by new input are then merged and
+looked at for rules, the untouched subtrees keep their state from the previous
+run.
+
 """
 
 import logging
 from collections import UserDict, defaultdict
-from typing import Iterable, List, Optional, Union
+from typing import Any, Iterable, List, Optional, Union
 
 import sentry_sdk
 from typing_extensions import TypeAlias
 
+from sentry.utils import json
+
 from .base import Clusterer, ReplacementRule
 from .rule_validator import RuleValidator
 
@@ -73,17 +80,39 @@ logger = logging.getLogger(__name__)
 
 
 class TreeClusterer(Clusterer):
-    def __init__(self, *, merge_threshold: int) -> None:
+    def __init__(self, *, merge_threshold: int, state: Optional[str] = None) -> None:
+        """
+        :param state: A tree previously obtained with ``dump_state``. When
+            given, new input is added on top of it and only the changed parts
+            of the tree are merged and turned into rules.
+        """
         self._merge_threshold = merge_threshold
-        self._tree = Node()
+        self._tree = Node.from_state(json.loads(state)) if state else Node()
         self._rules: Optional[List[ReplacementRule]] = None
 
     def add_input(self, strings: Iterable[str]) -> None:
         for string in strings:
             parts = string.split(SEP)
             node = self._tree
+            node.dirty = True
             for part in parts:
-                node = node.setdefault(part, Node())
+                child = node.get(part)
+                if child is None:
+                    # A segment below an already merged node would be merged
+                    # into it on the next merge anyway.
+                    child = node.get(MERGED)
+                if child is None:
+                    child = node[part] = Node()
+                child.dirty = True
+                node = child
+
+    def dump_state(self) -> str:
+        """Serializes the (merged) tree so it can be passed back as ``state``."""
+        return json.dumps(self._tree.to_state())
+
+    def tree_size(self) -> int:
+        """Number of nodes in the tree, not counting the root."""
+        return self._tree.size()
 
     def get_rules(self) -> List[ReplacementRule]:
         """Computes the rules for the current tree."""
@@ -100,7 +129,7 @@ class TreeClusterer(Clusterer):
             self._tree.merge(self._merge_threshold)
 
         # Generate exactly 1 rule for every merge
-        rule_paths = [path for path in self._tree.paths() if path[-1] is MERGED]
+        rule_paths = [path for path in self._tree.paths(only_dirty=True) if path[-1] is MERGED]
         self._rules = [self._build_rule(path) for path in rule_paths]
 
     def _clean_rules(self) -> None:
@@ -128,19 +157,58 @@ Edge: TypeAlias = Union[str, Merged]
 
 
 class Node(UserDict):
-    """Keys in this dict are names of the children"""
+    """Keys in this dict are names of the children
+
+    Nodes created in this process start out as ``dirty``, nodes loaded from a
+    serialized state are clean until new input is added below them.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.dirty = True
 
-    def paths(self, ancestors: Optional[List[Edge]] = None) -> Iterable[List[Edge]]:
-        """Collect all paths and subpaths through the graph"""
+    def paths(
+        self, ancestors: Optional[List[Edge]] = None, only_dirty: bool = False
+    ) -> Iterable[List[Edge]]:
+        """Collect all paths and subpaths through the graph
+
+        With ``only_dirty``, subtrees that did not change are skipped.
+        """
         if ancestors is None:
             ancestors = []
         for name, child in self.items():
+            if only_dirty and not child.dirty:
+                continue
             path = ancestors + [name]
             yield path
-            yield from child.paths(ancestors=path)
+            yield from child.paths(ancestors=path, only_dirty=only_dirty)
+
+    def size(self) -> int:
+        return sum(1 + child.size() for child in self.values())
+
+    def to_state(self) -> List[Any]:
+        """Compact representation of the subtree as nested ``[edge, children]``
+        lists, with ``None`` standing in for merged edges."""
+        return [
+            [None if name is MERGED else name, child.to_state()] for name, child in self.items()
+        ]
+
+    @classmethod
+    def from_state(cls, state: List[Any]) -> "Node":
+        node = cls(
+            {MERGED if name is None else name: cls.from_state(children) for name, children in state}
+        )
+        node.dirty = False
+        return node
 
     def merge(self, merge_threshold: int) -> None:
-        """Recursively merge children of high-cardinality nodes"""
+        """Recursively merge children of high-cardinality nodes
+
+        Subtrees that did not change since they were last merged are skipped.
+        """
+        if not self.dirty:
+            return
+
         if len(self) >= merge_threshold:
             merged_children = self._merge_nodes(self.values())
             self.clear()
@@ -3,7 +3,18 @@ from __future__ import annotations
 import logging
 from datetime import datetime
 from hashlib import md5
-from typing import Any, Mapping, Optional, Tuple, TypedDict, cast
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    cast,
+)
 
 import sentry_sdk
 from django.conf import settings
@@ -23,7 +34,7 @@ from sentry.event_manager import (
 from sentry.eventstore.models import Event, GroupEvent, augment_message_with_occurrence
 from sentry.issues.grouptype import should_create_group
 from sentry.issues.issue_occurrence import IssueOccurrence, IssueOccurrenceData
-from sentry.models import GroupHash, Release
+from sentry.models import GroupHash, Project, Release
 from sentry.ratelimits.sliding_windows import Quota, RedisSlidingWindowRateLimiter, RequestedQuota
 from sentry.utils import json, metrics, redis
 
@@ -37,7 +48,9 @@ logger = logging.getLogger(__name__)
 
 
 def save_issue_occurrence(
-    occurrence_data: IssueOccurrenceData, event: Event
+    occurrence_data: IssueOccurrenceData,
+    event: Event,
+    grouphashes: Optional[MutableMapping[str, Optional[GroupHash]]] = None,
 ) -> Tuple[IssueOccurrence, Optional[GroupInfo]]:
     process_occurrence_data(occurrence_data)
     # Convert occurrence data to `IssueOccurrence`
@@ -54,7 +67,7 @@ def save_issue_occurrence(
         # The release should always exist here since event has been ingested at this point, but just
         # in case it has been deleted
         release = None
-    group_info = save_issue_from_occurrence(occurrence, event, release)
+    group_info = save_issue_from_occurrence(occurrence, event, release, grouphashes)
     if group_info:
         send_issue_occurrence_to_eventstream(event, occurrence, group_info)
         environment = event.get_environment()
@@ -69,9 +82,23 @@ def save_issue_occurrence(
 
 def process_occurrence_data(occurrence_data: IssueOccurrenceData) -> None:
     # Hash fingerprints to make sure they're a consistent length
-    occurrence_data["fingerprint"] = [
-        md5(part.encode("utf-8")).hexdigest() for part in occurrence_data["fingerprint"]
-    ]
+    occurrence_data["fingerprint"] = hash_fingerprint(occurrence_data["fingerprint"])
+
+
+def hash_fingerprint(fingerprint: Sequence[str]) -> List[str]:
+    return [md5(part.encode("utf-8")).hexdigest() for part in fingerprint]
+
+
+def get_existing_grouphashes(
+    project: Project, hashes: Sequence[str]
+) -> Dict[str, Optional[GroupHash]]:
+    """
+    Fetches the grouphashes of many occurrences at once, to be passed on to
+    `save_issue_occurrence`. Hashes without a grouphash map to `None`.
+    """
+    queryset = GroupHash.objects.filter(project=project, hash__in=hashes).select_related("group")
+    existing = {grouphash.hash: grouphash for grouphash in queryset}
+    return {h: existing.get(h) for h in hashes}
 
 
 class IssueArgs(TypedDict):
@@ -142,7 +169,10 @@ def materialize_metadata(occurrence: IssueOccurrence, event: Event) -> Occurrenc
 
 @metrics.wraps("issues.ingest.save_issue_from_occurrence")
 def save_issue_from_occurrence(
-    occurrence: IssueOccurrence, event: Event, release: Optional[Release]
+    occurrence: IssueOccurrence,
+    event: Event,
+    release: Optional[Release],
+    grouphashes: Optional[MutableMapping[str, Optional[GroupHash]]] = None,
 ) -> Optional[GroupInfo]:
     project = event.project
     issue_kwargs = _create_issue_kwargs(occurrence, event, release)
@@ -154,11 +184,14 @@ def save_issue_from_occurrence(
     # Note that additional fingerprints won't be used to generated additional issues, they'll be
     # used to map the occurrence to a specific issue.
     new_grouphash = occurrence.fingerprint[0]
-    existing_grouphash = (
-        GroupHash.objects.filter(project=project, hash=new_grouphash)
-        .select_related("group")
-        .first()
-    )
+    if grouphashes is not None and new_grouphash in grouphashes:
+        existing_grouphash = grouphashes[new_grouphash]
+    else:
+        existing_grouphash = (
+            GroupHash.objects.filter(project=project, hash=new_grouphash)
+            .select_related("group")
+            .first()
+        )
 
     if not existing_grouphash:
         cluster_key = settings.SENTRY_ISSUE_PLATFORM_RATE_LIMITER_OPTIONS.get("cluster", "default")
@@ -198,6 +231,10 @@ def save_issue_from_occurrence(
             )
             group_info = GroupInfo(group=group, is_new=is_new, is_regression=is_regression)
 
+            # Later occurrences of the same batch have to look up the grouphash created here.
+            if grouphashes is not None:
+                grouphashes.pop(new_grouphash, None)
+
             # This only applies to events with stacktraces
             frame_mix = event.get_event_metadata().get("in_app_frame_mix")
             if is_new and frame_mix:
@@ -1,5 +1,6 @@
 import logging
-from typing import Any, Dict, Mapping, Optional, Tuple
+from collections import defaultdict
+from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 from uuid import UUID
 
 import jsonschema
@@ -10,10 +11,10 @@ from sentry import nodestore
 from sentry.event_manager import GroupInfo
 from sentry.eventstore.models import Event
 from sentry.issues.grouptype import get_group_type_by_type_id
-from sentry.issues.ingest import save_issue_occurrence
+from sentry.issues.ingest import get_existing_grouphashes, hash_fingerprint, save_issue_occurrence
 from sentry.issues.issue_occurrence import DEFAULT_LEVEL, IssueOccurrence, IssueOccurrenceData
 from sentry.issues.json_schemas import EVENT_PAYLOAD_SCHEMA
-from sentry.models import Organization, Project
+from sentry.models import GroupHash, Organization, Project
 from sentry.utils import metrics
 
 logger = logging.getLogger(__name__)
@@ -54,8 +55,26 @@ def lookup_event(project_id: int, event_id: str) -> Event:
     return event
 
 
+def lookup_events(project_id: int, event_ids: Sequence[str]) -> Dict[str, Event]:
+    """
+    Looks up many events of a project with a single nodestore request. Events which couldn't be
+    found are missing from the result.
+    """
+    node_ids = {Event.generate_node_id(project_id, event_id): event_id for event_id in event_ids}
+    events = {}
+    for node_id, data in nodestore.get_multi(list(node_ids)).items():
+        if data is None:
+            continue
+        event = Event(event_id=node_ids[node_id], project_id=project_id)
+        event.data = data
+        events[event.event_id] = event
+    return events
+
+
 def process_event_and_issue_occurrence(
-    occurrence_data: IssueOccurrenceData, event_data: Dict[str, Any]
+    occurrence_data: IssueOccurrenceData,
+    event_data: Dict[str, Any],
+    grouphashes: Optional[MutableMapping[str, Optional[GroupHash]]] = None,
 ) -> Tuple[IssueOccurrence, Optional[GroupInfo]]:
     if occurrence_data["event_id"] != event_data["event_id"]:
         raise ValueError(
@@ -67,7 +86,7 @@ def process_event_and_issue_occurrence(
         "occurrence_consumer._process_message.save_issue_occurrence",
         tags={"method": "process_event_and_issue_occurrence"},
     ):
-        return save_issue_occurrence(occurrence_data, event)
+        return save_issue_occurrence(occurrence_data, event, grouphashes)
 
 
 def lookup_event_and_process_issue_occurrence(
@@ -246,3 +265,121 @@ def _process_message(
         except (ValueError, KeyError) as e:
             txn.set_tag("result", "error")
             raise InvalidEventPayloadError(e)
+
+
+def _process_batch(
+    messages: Sequence[Mapping[str, Any]]
+) -> List[Tuple[IssueOccurrence, Optional[GroupInfo]]]:
+    """
+    Processes a batch of occurrence messages. Occurrences are grouped per project, so the
+    referenced events and existing grouphashes of a project are fetched once for the whole batch.
+    Occurrences which fail to process are logged and skipped.
+    """
+    with sentry_sdk.start_transaction(
+        op="_process_batch",
+        name="issues.occurrence_consumer",
+        sampled=True,
+    ) as txn:
+        occurrences_by_project: Dict[int, List[Mapping[str, Any]]] = defaultdict(list)
+        for message in messages:
+            try:
+                with metrics.timer("occurrence_consumer._process_message._get_kwargs"):
+                    kwargs = _get_kwargs(message)
+            except Exception:
+                logger.exception("failed to process message payload")
+                continue
+
+            occurrence_data = kwargs["occurrence_data"]
+            metrics.incr(
+                "occurrence_ingest.messages",
+                sample_rate=1.0,
+                tags={"occurrence_type": occurrence_data["type"]},
+            )
+            occurrences_by_project[occurrence_data["project_id"]].append(kwargs)
+
+        txn.set_tag("projects", len(occurrences_by_project))
+        results = []
+        for project_id, project_occurrences in occurrences_by_project.items():
+            try:
+                results.extend(_process_project_occurrences(project_id, project_occurrences))
+            except Exception:
+                logger.exception("failed to process message payload")
+        return results
+
+
+def _process_project_occurrences(
+    project_id: int, project_occurrences: Sequence[Mapping[str, Any]]
+) -> List[Tuple[IssueOccurrence, Optional[GroupInfo]]]:
+    project = Project.objects.get_from_cache(id=project_id)
+    organization = Organization.objects.get_from_cache(id=project.organization_id)
+
+    occurrences = []
+    for kwargs in project_occurrences:
+        occurrence_type = kwargs["occurrence_data"]["type"]
+        if not get_group_type_by_type_id(occurrence_type).allow_ingest(organization):
+            metrics.incr(
+                "occurrence_ingest.dropped_feature_disabled",
+                sample_rate=1.0,
+                tags={"occurrence_type": occurrence_type},
+            )
+            continue
+        occurrences.append(kwargs)
+
+    event_ids = [
+        kwargs["occurrence_data"]["event_id"]
+        for kwargs in occurrences
+        if "event_data" not in kwargs
+    ]
+    events: Optional[Dict[str, Event]] = None
+    try:
+        with metrics.timer("occurrence_consumer._process_batch.lookup_events"):
+            events = lookup_events(project_id, event_ids)
+    except Exception:
+        # Fall back to looking up the events one by one, so that a single broken event only
+        # fails its own occurrence.
+        logger.exception("failed to lookup events in batch")
+
+    hashes = []
+    valid_occurrences = []
+    for kwargs in occurrences:
+        fingerprint = kwargs["occurrence_data"]["fingerprint"]
+        try:
+            if fingerprint:
+                hashes.append(hash_fingerprint(fingerprint[:1])[0])
+        except Exception:
+            logger.exception("failed to process message payload")
+            continue
+        valid_occurrences.append(kwargs)
+
+    with metrics.timer("occurrence_consumer._process_batch.get_existing_grouphashes"):
+        grouphashes = get_existing_grouphashes(project, hashes)
+
+    results = []
+    for kwargs in valid_occurrences:
+        occurrence_data = kwargs["occurrence_data"]
+        event_id = occurrence_data["event_id"]
+        try:
+            if "event_data" in kwargs:
+                results.append(
+                    process_event_and_issue_occurrence(
+                        occurrence_data, kwargs["event_data"], grouphashes
+                    )
+                )
+                continue
+
+            if events is None:
+                event = lookup_event(project_id, event_id)
+            else:
+                event = events.get(event_id)
+            if event is None:
+                raise EventLookupError(
+                    f"Failed to lookup event({event_id}) for project_id({project_id})"
+                )
+            with metrics.timer(
+                "occurrence_consumer._process_message.save_issue_occurrence",
+                tags={"method": "lookup_event_and_process_issue_occurrence"},
+            ):
+                results.append(save_issue_occurrence(occurrence_data, event, grouphashes))
+        except Exception:
+            logger.exception("failed to process message payload")
+    return results
@@ -11,6 +11,7 @@ from arroyo.processing.strategies import (
     ProcessingStrategy,
     ProcessingStrategyFactory,
 )
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.types import Commit, Message, Partition
 
 from sentry.utils.arroyo import RunTaskWithMultiprocessing
@@ -91,6 +92,7 @@ class OccurrenceStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         num_processes: int,
         input_block_size: int,
         output_block_size: int,
+        mode: str = "serial",
     ):
         super().__init__()
         self.max_batch_size = max_batch_size
@@ -98,12 +100,16 @@ class OccurrenceStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         self.num_processes = num_processes
         self.input_block_size = input_block_size
         self.output_block_size = output_block_size
+        self.batched = mode == "batched"
 
     def create_with_partitions(
         self,
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
+        if self.batched:
+            return self.create_batched_worker(commit)
+
         return RunTaskWithMultiprocessing(
             function=process_message,
             next_step=CommitOffsets(commit),
@@ -114,6 +120,24 @@ class OccurrenceStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
             output_block_size=self.output_block_size,
         )
 
+    def create_batched_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
+        # Occurrences are batched before being handed to the worker processes, so each process
+        # can look up the events and grouphashes of a whole batch at once.
+        process_step = RunTaskWithMultiprocessing(
+            function=process_batch,
+            next_step=CommitOffsets(commit),
+            num_processes=self.num_processes,
+            max_batch_size=1,
+            max_batch_time=self.max_batch_time,
+            input_block_size=self.input_block_size,
+            output_block_size=self.output_block_size,
+        )
+        return BatchStep(
+            max_batch_size=self.max_batch_size,
+            max_batch_time=self.max_batch_time,
+            next_step=process_step,
+        )
+
 
 def process_message(message: Message[KafkaPayload]) -> None:
     from sentry.issues.occurrence_consumer import (
@@ -134,3 +158,18 @@ def process_message(message: Message[KafkaPayload]) -> None:
         Exception,
     ):
         logger.exception("failed to process message payload")
+
+
+def process_batch(message: Message[ValuesBatch[KafkaPayload]]) -> None:
+    from sentry.issues.occurrence_consumer import _process_batch
+    from sentry.utils import json, metrics
+
+    payloads = []
+    for value in message.payload:
+        try:
+            payloads.append(json.loads(value.payload.value, use_rapid_json=True))
+        except rapidjson.JSONDecodeError:
+            logger.exception("failed to process message payload")
+
+    with metrics.timer("occurrence_consumer.process_batch"):
+        _process_batch(payloads)
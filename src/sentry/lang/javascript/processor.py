@@ -787,11 +787,20 @@ class Fetcher:
         if result:
             return BytesIO(result)
 
+        # `cache.set` will only keep values up to a certain size, so bundles which are too large
+        # for caching are instead kept in the on-disk cache shared by all processes on this host.
+        file_size = artifact_bundle.file.size
+        if (
+            CACHE_MAX_VALUE_SIZE is not None
+            and file_size is not None
+            and file_size > CACHE_MAX_VALUE_SIZE
+        ):
+            return fetch_retry_policy(lambda: ArtifactBundle.cache.getfile(artifact_bundle))
+
         # We didn't find the bundle in the cache, thus we want to fetch it.
         artifact_bundle_file = fetch_retry_policy(artifact_bundle.file.getfile)
 
-        # `cache.set` will only keep values up to a certain size,
-        # so we should not read the entire file if it's too large for caching
+        # The file size may be unknown for legacy files.
         if CACHE_MAX_VALUE_SIZE is not None and artifact_bundle_file.size > CACHE_MAX_VALUE_SIZE:
             return artifact_bundle_file
 
@@ -135,7 +135,13 @@ class RatelimitMiddleware:
                     response[
                         "X-Sentry-Rate-Limit-ConcurrentLimit"
                     ] = rate_limit_metadata.concurrent_limit
-                if hasattr(request, "rate_limit_key") and hasattr(request, "rate_limit_uid"):
+                # Only requests that took a slot in the concurrent limiter have to give it back.
+                if (
+                    rate_limit_metadata
+                    and rate_limit_metadata.concurrent_requests is not None
+                    and hasattr(request, "rate_limit_key")
+                    and hasattr(request, "rate_limit_uid")
+                ):
                     finish_request(request.rate_limit_key, request.rate_limit_uid)
             except Exception:
                 logging.exception("COULD NOT POPULATE RATE LIMIT HEADERS")
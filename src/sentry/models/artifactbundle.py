@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import os
 import zipfile
 from enum import Enum
-from typing import IO, Callable, Dict, List, Mapping, Optional, Set, Tuple
+from typing import IO, TYPE_CHECKING, Callable, ClassVar, Dict, List, Mapping, Optional, Set, Tuple
 
 import sentry_sdk
 from django.conf import settings
@@ -12,6 +13,7 @@ from django.utils import timezone
 from symbolic.debuginfo import normalize_debug_id
 from symbolic.exceptions import SymbolicError
 
+from sentry import options
 from sentry.backup.scopes import RelocationScope
 from sentry.db.models import (
     BoundedBigIntegerField,
@@ -25,6 +27,9 @@ from sentry.utils import json, metrics
 from sentry.utils.hashlib import sha1_text
 from sentry.utils.services import LazyServiceWrapper
 
+if TYPE_CHECKING:
+    from sentry.models.files.file import File
+
 # Sentinel values used to represent a null state in the database. This is done since the `NULL` type in the db is
 # always different from `NULL`.
 NULL_UUID = "00000000-00000000-00000000-00000000"
@@ -86,6 +91,8 @@ class ArtifactBundle(Model):
     # association has been added or any of its fields have been modified.
     date_last_modified = models.DateTimeField(null=True)
 
+    cache: ClassVar[ArtifactBundleFileCache]
+
     class Meta:
         app_label = "sentry"
         db_table = "sentry_artifactbundle"
@@ -489,3 +496,84 @@ class ArtifactBundleArchive:
         file_info = files.get(file_path, {})
 
         return file_info.get("url")
+
+
+class ArtifactBundleFileCache:
+    """
+    A per-host, on-disk cache of artifact bundle files.
+
+    Files are keyed by their checksum and read straight from disk, so all
+    processes on a host share the pages of a bundle through the OS page cache
+    instead of each downloading and holding their own copy.
+    """
+
+    @property
+    def cache_path(self) -> str:
+        return options.get("artifactbundle.cache-path")
+
+    def get_path(self, file: File) -> str:
+        return os.path.join(self.cache_path, file.checksum[:2], file.checksum)
+
+    def getfile(self, artifact_bundle: ArtifactBundle) -> IO[bytes]:
+        file = artifact_bundle.file
+        if not file.checksum:
+            return file.getfile()
+
+        path = self.get_path(file)
+
+        hit = True
+        try:
+            fp = open(path, "rb")
+        except FileNotFoundError:
+            file.save_to(path)
+            fp = open(path, "rb")
+            hit = False
+        else:
+            # The modification time tracks the last use of an entry for eviction.
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+        metrics.timing("artifact_bundle.file_cache.get.size", file.size, tags={"hit": hit})
+
+        return fp
+
+    def clear_old_entries(self) -> None:
+        from sentry.models.files.utils import clear_cached_files
+
+        clear_cached_files(self.cache_path)
+        self.evict(options.get("artifactbundle.cache-max-size"))
+
+    def evict(self, max_size: int) -> None:
+        """
+        Removes the least recently used entries until the cache fits into
+        `max_size` bytes.
+        """
+        entries = []
+        total_size = 0
+        for cache_folder, _, cached_files in os.walk(self.cache_path):
+            for cached_file in cached_files:
+                # Skip files which are still being downloaded by `File.save_to`.
+                if cached_file.startswith("._prefetch-"):
+                    continue
+                cached_file = os.path.join(cache_folder, cached_file)
+                try:
+                    stat = os.stat(cached_file)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, cached_file))
+                total_size += stat.st_size
+
+        entries.sort()
+        for _, size, cached_file in entries:
+            if total_size <= max_size:
+                break
+            try:
+                os.remove(cached_file)
+            except OSError:
+                continue
+            total_size -= size
+
+
+ArtifactBundle.cache = ArtifactBundleFileCache()
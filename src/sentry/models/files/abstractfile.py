@@ -5,9 +5,10 @@ import logging
 import mmap
 import os
 import tempfile
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from hashlib import sha1
-from typing import ClassVar, Type
+from typing import ClassVar, Deque, Tuple, Type
 
 import sentry_sdk
 from django.core.files.base import ContentFile
@@ -26,12 +27,23 @@ from sentry.utils.db import atomic_transaction
 logger = logging.getLogger(__name__)
 
 
+def _read_blob(blob):
+    with blob.getfile() as f:
+        return f.read()
+
+
 class ChunkedFileBlobIndexWrapper:
-    def __init__(self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    def __init__(
+        self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True, read_ahead=0
+    ):
         # eager load from database incase its a queryset
         self._indexes = list(indexes)
         self._curfile = None
         self._curidx = None
+        self._idxiter = None
+        # number of blobs fetched concurrently ahead of the one being read
+        self._read_ahead = read_ahead
+        self._read_ahead_executor = None
         if prefetch:
             self.prefetched = True
             self._prefetch(prefetch_to, delete)
@@ -56,13 +68,43 @@ class ChunkedFileBlobIndexWrapper:
         rv.seek(0)
         return rv
 
+    def _iter_blobs(self, indexes):
+        if not self._read_ahead:
+            for idx in indexes:
+                yield idx, idx.blob.getfile()
+            return
+
+        if self._read_ahead_executor is None:
+            self._read_ahead_executor = ThreadPoolExecutor(max_workers=self._read_ahead)
+
+        # Blobs are fetched in full in the background while the current one
+        # is being read, so at most `read_ahead + 1` blobs are held in memory.
+        pending: Deque[Tuple[object, Future[bytes]]] = deque()
+        try:
+            for idx in indexes:
+                pending.append((idx, self._read_ahead_executor.submit(_read_blob, idx.blob)))
+                if len(pending) > self._read_ahead:
+                    idx, future = pending.popleft()
+                    yield idx, io.BytesIO(future.result())
+
+            while pending:
+                idx, future = pending.popleft()
+                yield idx, io.BytesIO(future.result())
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def _reset_idxiter(self, indexes):
+        if self._idxiter is not None:
+            self._idxiter.close()
+        self._idxiter = self._iter_blobs(indexes)
+
     def _nextidx(self):
         assert not self.prefetched, "this makes no sense"
         old_file = self._curfile
         try:
             try:
-                self._curidx = next(self._idxiter)
-                self._curfile = self._curidx.blob.getfile()
+                self._curidx, self._curfile = next(self._idxiter)
             except StopIteration:
                 self._curidx = None
                 self._curfile = None
@@ -111,6 +153,12 @@ class ChunkedFileBlobIndexWrapper:
     def close(self):
         if self._curfile:
             self._curfile.close()
+        if self._idxiter is not None:
+            self._idxiter.close()
+            self._idxiter = None
+        if self._read_ahead_executor is not None:
+            self._read_ahead_executor.shutdown(wait=False)
+            self._read_ahead_executor = None
         self._curfile = None
         self._curidx = None
         self.closed = True
@@ -132,7 +180,7 @@ class ChunkedFileBlobIndexWrapper:
         for n, idx in enumerate(self._indexes[::-1]):
             if idx.offset <= pos:
                 if idx != self._curidx:
-                    self._idxiter = iter(self._indexes[-(n + 1) :])
+                    self._reset_idxiter(self._indexes[-(n + 1) :])
                     self._nextidx()
                 break
         else:
@@ -214,7 +262,9 @@ class AbstractFile(Model):
     DELETE_UNREFERENCED_BLOB_TASK: ClassVar[SentryTask]
     blobs: models.ManyToManyField
 
-    def _get_chunked_blob(self, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    def _get_chunked_blob(
+        self, mode=None, prefetch=False, prefetch_to=None, delete=True, read_ahead=0
+    ):
         return ChunkedFileBlobIndexWrapper(
             self.FILE_BLOB_INDEX_MODEL.objects.filter(file=self)
             .select_related("blob")
@@ -223,15 +273,19 @@ class AbstractFile(Model):
             prefetch=prefetch,
             prefetch_to=prefetch_to,
             delete=delete,
+            read_ahead=read_ahead,
         )
 
     @sentry_sdk.tracing.trace
-    def getfile(self, mode=None, prefetch=False):
+    def getfile(self, mode=None, prefetch=False, read_ahead=0):
         """Returns a file object.  By default the file is fetched on
         demand but if prefetch is enabled the file is fully prefetched
         into a tempfile before reading can happen.
+
+        If `read_ahead` is set, up to that many of the following blobs are
+        fetched concurrently while the current one is being read.
         """
-        impl = self._get_chunked_blob(mode, prefetch)
+        impl = self._get_chunked_blob(mode, prefetch, read_ahead=read_ahead)
         return FileObj(impl, self.name)
 
     def save_to(self, path):
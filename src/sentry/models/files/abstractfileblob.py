@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from concurrent.futures import ThreadPoolExecutor
-from threading import Semaphore
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any, ClassVar
 from uuid import uuid4
 
@@ -71,7 +70,7 @@ class AbstractFileBlob(Model):
         blobs_created = []
         blobs_to_save = []
         locks = set()
-        semaphore = Semaphore(value=MULTI_BLOB_UPLOAD_CONCURRENCY)
+        uploads: set[Future[None]] = set()
 
         def _upload_and_pend_chunk(fileobj, size, checksum, lock):
             logger.debug(
@@ -116,7 +115,14 @@ class AbstractFileBlob(Model):
                 _save_blob(blob)
                 lock.__exit__(None, None, None)
                 locks.discard(lock)
-                semaphore.release()
+
+        def _wait_for_uploads(return_when):
+            done, _ = wait(uploads, return_when=return_when)
+            uploads.difference_update(done)
+            for future in done:
+                # Re-raise any errors from the upload
+                future.result()
+            _flush_blobs()
 
         try:
             with ThreadPoolExecutor(max_workers=MULTI_BLOB_UPLOAD_CONCURRENCY) as exe:
@@ -154,16 +160,17 @@ class AbstractFileBlob(Model):
                     locks.add(lock)
 
                     # Otherwise we leave the blob locked and submit the task.
-                    # We use the semaphore to ensure we never schedule too
-                    # many.  The upload will be done with a certain amount
-                    # of concurrency controlled by the semaphore and the
-                    # `_flush_blobs` call will take all those uploaded
-                    # blobs and associate them with the database.
-                    semaphore.acquire()
-                    exe.submit(_upload_and_pend_chunk(fileobj, size, checksum, lock))
+                    # We wait for a running upload to finish first to ensure
+                    # we never schedule too many.  The upload will be done
+                    # with a certain amount of concurrency and the
+                    # `_flush_blobs` call will take all those uploaded blobs
+                    # and associate them with the database.
+                    if len(uploads) >= MULTI_BLOB_UPLOAD_CONCURRENCY:
+                        _wait_for_uploads(FIRST_COMPLETED)
+                    uploads.add(exe.submit(_upload_and_pend_chunk, fileobj, size, checksum, lock))
                     logger.debug("FileBlob.from_files.end", extra={"checksum": reference_checksum})
 
-            _flush_blobs()
+                _wait_for_uploads(ALL_COMPLETED)
         finally:
             for lock in locks:
                 try:
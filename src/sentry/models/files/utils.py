@@ -15,6 +15,7 @@ ONE_DAY_AND_A_HALF = int(ONE_DAY * 1.5)
 UPLOAD_RETRY_TIME = getattr(settings, "SENTRY_UPLOAD_RETRY_TIME", 60)  # 1min
 
 DEFAULT_BLOB_SIZE = 1024 * 1024  # one mb
+STREAMING_READ_AHEAD = 4  # blobs fetched ahead when streaming files to clients
 CHUNK_STATE_HEADER = "__state"
 
 MAX_FILE_SIZE = 2**31  # 2GB is the maximum offset supported by fileblob
@@ -120,6 +120,40 @@ class ProjectOptionManager(OptionManager["ProjectOption"]):
 
         return self._option_cache.get(cache_key, {})
 
+    def prefetch_all_values(self, project_ids: Sequence[int]) -> None:
+        """
+        Loads the options of many projects into the local cache at once, so
+        that subsequent ``get_all_values`` calls for them don't have to go to
+        the cache or the database one project at a time.
+        """
+        cache_keys = {
+            self._make_key(project_id): project_id
+            for project_id in project_ids
+            if self._make_key(project_id) not in self._option_cache
+        }
+        if not cache_keys:
+            return
+
+        cached = cache.get_many(list(cache_keys))
+        for cache_key, result in cached.items():
+            if result is not None:
+                self._option_cache[cache_key] = result
+
+        missing = [
+            project_id
+            for cache_key, project_id in cache_keys.items()
+            if cached.get(cache_key) is None
+        ]
+        if not missing:
+            return
+
+        results: dict[str, dict[str, Value]] = {self._make_key(i): {} for i in missing}
+        for option in self.filter(project_id__in=missing):
+            results[self._make_key(option.project_id)][option.key] = option.value
+
+        cache.set_many(results)
+        self._option_cache.update(results)
+
     def reload_cache(self, project_id: int, update_reason: str) -> Mapping[str, Value]:
         from sentry.tasks.relay import schedule_invalidate_project_config
 
@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import logging
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, Mapping, Optional
+from functools import partial
+from typing import DefaultDict, Dict, List, Literal, Mapping, Optional
 
 import msgpack
 import sentry_sdk
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import BrokerValue, Commit, Message, Partition
@@ -147,6 +151,10 @@ def _process_message(ts: datetime, wrapper: CheckinMessage | ClockPulseMessage)
     if wrapper["message_type"] == "clock_pulse":
         return
 
+    _process_checkin(wrapper)
+
+
+def _process_checkin(wrapper: CheckinMessage) -> None:
     with sentry_sdk.start_transaction(
         op="_process_message",
         name="monitors.monitor_consumer",
@@ -532,12 +540,131 @@ def _process_message(ts: datetime, wrapper: CheckinMessage | ClockPulseMessage)
             logger.exception("Failed to process check-in", exc_info=True)
 
 
+def process_batch(executor: ThreadPoolExecutor, message: Message[ValuesBatch[KafkaPayload]]):
+    """
+    Receives batches of check-in messages. This function will take the batch
+    and group them together by monitor environment, processing each group
+    serially while the groups themselves are processed in parallel.
+
+    Since check-ins for the same monitor environment always land in the same
+    group, their relative ordering is preserved.
+    """
+    batch = message.payload
+
+    latest_tick: Optional[datetime] = None
+    checkin_mapping: DefaultDict[str, List[CheckinMessage]] = defaultdict(list)
+
+    for item in batch:
+        assert isinstance(item, BrokerValue)
+
+        try:
+            wrapper = msgpack.unpackb(item.payload.value)
+        except Exception:
+            logger.exception("Failed to unpack message payload")
+            continue
+
+        # Trigger the monitor tasks once for every minute observed in the
+        # batch, in order, exactly as processing each message would.
+        tick = item.timestamp.replace(second=0, microsecond=0)
+        if tick != latest_tick:
+            latest_tick = tick
+            try:
+                try_monitor_tasks_trigger(item.timestamp)
+            except Exception:
+                logger.exception("Failed to trigger monitor tasks", exc_info=True)
+
+        # XXX: Relay does not attach a message type, see _process_message
+        if "message_type" not in wrapper:
+            wrapper["message_type"] = "check_in"
+
+        # Nothing else to do with clock pulses
+        if wrapper["message_type"] == "clock_pulse":
+            continue
+
+        try:
+            params: CheckinPayload = json.loads(wrapper["payload"])
+            monitor_slug = slugify(params["monitor_slug"])[:MAX_SLUG_LENGTH].strip("-")
+            checkin_key = f"{wrapper['project_id']}:{monitor_slug}:{params.get('environment')}"
+        except Exception:
+            logger.exception("Failed to process message payload")
+            continue
+
+        checkin_mapping[checkin_key].append(wrapper)
+
+    if not checkin_mapping:
+        return
+
+    metrics.gauge("monitors.checkin.parallel_batch_count", len(batch))
+    metrics.gauge("monitors.checkin.parallel_batch_groups", len(checkin_mapping))
+
+    futures = [
+        executor.submit(process_checkin_group, items) for items in checkin_mapping.values()
+    ]
+    wait(futures)
+
+
+def process_checkin_group(items: List[CheckinMessage]) -> None:
+    """
+    Process a group of check-ins (for the same monitor environment) serially.
+    """
+    for item in items:
+        try:
+            _process_checkin(item)
+        except Exception:
+            logger.exception("Failed to process check-in")
+
+
 class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
-    def create_with_partitions(
+    parallel_executor: Optional[ThreadPoolExecutor] = None
+
+    parallel = False
+    """
+    Does the consumer process unrelated check-ins in parallel?
+    """
+
+    max_batch_size = 500
+    """
+    How many messages will be batched at once when in parallel mode.
+    """
+
+    max_batch_time = 10
+    """
+    The maximum time in seconds to accumulate a batch of check-ins.
+    """
+
+    def __init__(
         self,
-        commit: Commit,
-        partitions: Mapping[Partition, int],
-    ) -> ProcessingStrategy[KafkaPayload]:
+        mode: Optional[Literal["parallel", "serial"]] = None,
+        max_batch_size: Optional[int] = None,
+        max_batch_time: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        if mode == "parallel":
+            self.parallel = True
+            self.parallel_executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        if max_batch_size is not None:
+            self.max_batch_size = max_batch_size
+        if max_batch_time is not None:
+            self.max_batch_time = max_batch_time
+
+    def shutdown(self) -> None:
+        if self.parallel_executor:
+            self.parallel_executor.shutdown()
+
+    def create_parallel_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
+        assert self.parallel_executor is not None
+        batch_processor = RunTask(
+            function=partial(process_batch, self.parallel_executor),
+            next_step=CommitOffsets(commit),
+        )
+        return BatchStep(
+            max_batch_size=self.max_batch_size,
+            max_batch_time=self.max_batch_time,
+            next_step=batch_processor,
+        )
+
+    def create_synchronous_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
         def process_message(message: Message[KafkaPayload]) -> None:
             assert isinstance(message.value, BrokerValue)
             try:
@@ -550,3 +677,13 @@ class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]
             function=process_message,
             next_step=CommitOffsets(commit),
         )
+
+    def create_with_partitions(
+        self,
+        commit: Commit,
+        partitions: Mapping[Partition, int],
+    ) -> ProcessingStrategy[KafkaPayload]:
+        if self.parallel:
+            return self.create_parallel_worker(commit)
+        else:
+            return self.create_synchronous_worker(commit)
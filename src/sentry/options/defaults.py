@@ -126,6 +126,19 @@ register(
     default=1024 * 1024 * 1024,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+register(
+    "artifactbundle.cache-path",
+    type=String,
+    default="/tmp/sentry-artifactbundle-cache",
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# The total size of the artifact bundle cache, least recently used bundles are evicted beyond it.
+register(
+    "artifactbundle.cache-max-size",
+    type=Int,
+    default=10 * 1024 * 1024 * 1024,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 
 # Mail
@@ -375,6 +388,13 @@ register(
     default=0,
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Serve recording segments to clients accepting gzip in their stored, compressed form.
+register(
+    "replay.storage.compressed-download",
+    type=Bool,
+    default=False,
+    flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Analytics
 register("analytics.backend", default="noop", flags=FLAG_NOSTORE)
@@ -940,6 +960,11 @@ register(
     "relay.project-config-cache-compress-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE
 )  # unused
 
+# Maximum number of records each rule keeps per group when building a digest.
+# Older records are dropped while the digest is read, which bounds the memory
+# used for digests of very noisy groups. 0 keeps everything.
+register("digests.max-records-per-group", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # default brownout crontab for api deprecations
 register(
     "api.deprecation.brownout-cron",
@@ -953,6 +978,17 @@ register("api.deprecation.brownout-duration", default="PT1M", flags=FLAG_AUTOMAT
 # Option to disable misbehaving use case IDs
 register("sentry-metrics.indexer.disabled-namespaces", default=[], flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Fraction of ingest-metrics messages that are validated against the schema
+# in the indexer. Schema validation is the most expensive part of parsing a
+# message, so this can be turned down on high-volume consumers. Messages that
+# are not validated are decoded without their value, which is passed through
+# to the output as raw JSON.
+register(
+    "sentry-metrics.indexer.input-validation-sample-rate",
+    default=1.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # A slow rollout option for writing "new" cache keys
 # as the transition from UseCaseKey to UseCaseID occurs
 register(
@@ -1398,8 +1434,15 @@ register(
 register("hybrid_cloud.outbox_rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 # Decides whether an incoming transaction triggers an update of the clustering rule applied to it.
 register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Keeps the transaction clusterer tree between runs and only feeds it new samples.
+register("txnames.clusterer.incremental", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 # Decides whether an incoming span triggers an update of the clustering rule applied to it.
 register("span_descs.bump-lifetime-sample-rate", default=0.25, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Number of transaction name and span description samples buffered in process before they are
+# written to redis. 0 writes every sample right away.
+register("txnames.sample-buffer.flush-size", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Maximum number of seconds samples are held in the buffer.
+register("txnames.sample-buffer.flush-interval", default=10.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # === Backpressure related runtime options ===
 
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from array import array
+from itertools import chain
+from typing import Iterable, Iterator, List, Mapping, Sequence
+
+# Frame indices are stored as C unsigned ints rather than boxed Python integers, which keeps
+# the stacks of a large profile a fraction of the size of the equivalent lists.
+INDEX_TYPECODE = "I"
+
+
+class StackTable:
+    """
+    The stacks of a sample profile, stored as a single flat array of frame indices.
+
+    Stack `i` spans `frames[offsets[i]:offsets[i + 1]]`. Profiles are converted into a table
+    after being decoded and back into lists only when they are serialized again.
+    """
+
+    def __init__(self, frames: array[int], offsets: array[int]) -> None:
+        self.frames = frames
+        self.offsets = offsets
+
+    @classmethod
+    def from_stacks(cls, stacks: Iterable[Sequence[int]]) -> StackTable:
+        frames = array(INDEX_TYPECODE)
+        offsets = array(INDEX_TYPECODE, [0])
+        for stack in stacks:
+            frames.extend(stack)
+            offsets.append(len(frames))
+        return cls(frames, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> array[int]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("stack index out of range")
+        return self.frames[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[array[int]]:
+        frames = self.frames
+        offsets = self.offsets
+        for i in range(len(offsets) - 1):
+            yield frames[offsets[i] : offsets[i + 1]]
+
+    def remap(self, index_map: Mapping[int, Sequence[int]]) -> StackTable:
+        """
+        Replace every frame index found in `index_map` with the indices it maps to, keeping
+        all other indices as they are.
+        """
+        if not self.frames:
+            return StackTable(array(INDEX_TYPECODE), array(INDEX_TYPECODE, self.offsets))
+
+        num_frames = max(max(self.frames), max(index_map, default=0)) + 1
+        expansions: List[Sequence[int]] = [(i,) for i in range(num_frames)]
+        for index, indices in index_map.items():
+            expansions[index] = indices
+
+        frames = array(INDEX_TYPECODE)
+        offsets = array(INDEX_TYPECODE, [0])
+        for stack in self:
+            frames.extend(chain.from_iterable(map(expansions.__getitem__, stack)))
+            offsets.append(len(frames))
+        return StackTable(frames, offsets)
+
+    def to_stacks(self) -> List[List[int]]:
+        return [stack.tolist() for stack in self]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
 from copy import deepcopy
 from datetime import datetime, timezone
 from time import time
@@ -7,7 +9,9 @@ from typing import Any, List, Mapping, MutableMapping, Optional, Tuple
 
 import msgpack
 import sentry_sdk
+from cachetools import TTLCache
 from django.conf import settings
+from symbolic.common import parse_addr
 from symbolic.proguard import ProguardMapper
 
 from sentry import quotas
@@ -18,6 +22,7 @@ from sentry.lang.native.symbolicator import Symbolicator, SymbolicatorTaskKind
 from sentry.models import EventError, Organization, Project, ProjectDebugFile
 from sentry.profiles.device import classify_device
 from sentry.profiles.java import deobfuscate_signature
+from sentry.profiles.stacks import StackTable
 from sentry.profiles.utils import get_from_profiling_service
 from sentry.signals import first_profile_received
 from sentry.silo import SiloMode
@@ -156,12 +161,20 @@ def _symbolicate_profile(profile: Profile, project: Project) -> bool:
 
             set_measurement("profile.frames.sent", len(frames_sent))
 
-            modules, stacktraces, success = run_symbolicate(
-                project=project,
-                profile=profile,
-                modules=raw_modules,
-                stacktraces=raw_stacktraces,
-            )
+            if profile["platform"] in SHOULD_SYMBOLICATE_JS:
+                modules, stacktraces, success = run_symbolicate(
+                    project=project,
+                    profile=profile,
+                    modules=raw_modules,
+                    stacktraces=raw_stacktraces,
+                )
+            else:
+                modules, stacktraces, success = run_symbolicate_native(
+                    project=project,
+                    profile=profile,
+                    modules=raw_modules,
+                    stacktraces=raw_stacktraces,
+                )
 
             if success:
                 _process_symbolicator_results(
@@ -290,17 +303,21 @@ def _prepare_frames_from_profile(profile: Profile) -> Tuple[List[Any], List[Any]
                 frames = [profile["profile"]["frames"][idx] for idx in frames_sent]
             else:
                 frames = profile["profile"]["frames"]
+                leaf_frames: dict[int, int] = {}
 
                 for stack in profile["profile"]["stacks"]:
                     if len(stack) > 0:
                         # Make a deep copy of the leaf frame with adjust_instruction_addr = False
                         # and append it to the list. This ensures correct behavior
                         # if the leaf frame also shows up in the middle of another stack.
+                        # Stacks sharing a leaf frame share its copy.
                         first_frame_idx = stack[0]
-                        frame = deepcopy(frames[first_frame_idx])
-                        frame["adjust_instruction_addr"] = False
-                        frames.append(frame)
-                        stack[0] = len(frames) - 1
+                        if first_frame_idx not in leaf_frames:
+                            frame = deepcopy(frames[first_frame_idx])
+                            frame["adjust_instruction_addr"] = False
+                            frames.append(frame)
+                            leaf_frames[first_frame_idx] = len(frames) - 1
+                        stack[0] = leaf_frames[first_frame_idx]
 
             stacktraces = [{"frames": frames}]
         # in the original format, we need to gather frames from all samples
@@ -401,6 +418,172 @@ def run_symbolicate(
     return modules, stacktraces, False
 
 
+# Native frames resolve to the same symbols for as long as the binary they belong to is in use,
+# and profiles of the same release share nearly all of their frames. Symbolicated frames are kept
+# for a short while, keyed by the image they were found in and their offset into it, so that
+# only frames which have not been seen recently are sent to symbolicator.
+SYMBOLICATED_FRAMES_CACHE_SIZE = 100_000
+SYMBOLICATED_FRAMES_CACHE_TTL = 5 * 60
+
+FrameCacheKey = Tuple[int, str, int, bool]
+
+_symbolicated_frames: TTLCache[FrameCacheKey, Tuple[int, List[Any]]] = TTLCache(
+    maxsize=SYMBOLICATED_FRAMES_CACHE_SIZE, ttl=SYMBOLICATED_FRAMES_CACHE_TTL
+)
+_symbolicated_modules: TTLCache[Tuple[int, str], Mapping[str, Any]] = TTLCache(
+    maxsize=SYMBOLICATED_FRAMES_CACHE_SIZE // 100, ttl=SYMBOLICATED_FRAMES_CACHE_TTL
+)
+
+
+def _get_image_ranges(modules: List[Any]) -> List[Tuple[int, int, Any]]:
+    ranges = []
+    for image in modules:
+        try:
+            image_addr = parse_addr(image["image_addr"])
+            image_size = int(image["image_size"])
+            debug_id = image["debug_id"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if debug_id and image_size > 0:
+            ranges.append((image_addr, image_addr + image_size, image))
+    ranges.sort(key=lambda r: r[0])
+    return ranges
+
+
+def _rebase_frames(frames: List[Any], delta: int) -> List[Any]:
+    if delta == 0:
+        return frames
+
+    rebased = []
+    for frame in frames:
+        frame = dict(frame)
+        for key in ("instruction_addr", "sym_addr"):
+            if frame.get(key) is not None:
+                frame[key] = hex(parse_addr(frame[key]) + delta)
+        rebased.append(frame)
+    return rebased
+
+
+@metrics.wraps("process_profile.symbolicate.native")
+def run_symbolicate_native(
+    project: Project,
+    profile: Profile,
+    modules: List[Any],
+    stacktraces: List[Any],
+) -> Tuple[List[Any], List[Any], bool]:
+    """
+    Symbolicate native stacktraces, sending each distinct frame to symbolicator at most once.
+
+    Frames repeat heavily across the samples of a profile, and frames symbolicated for a recent
+    profile of the same project are reused from the cache. The returned stacktraces have the
+    same shape `run_symbolicate` would return, with `original_index` pointing at the frame
+    each result originated from.
+    """
+    ranges = _get_image_ranges(modules)
+    range_starts = [r[0] for r in ranges]
+
+    unique_frames: List[dict[str, Any]] = []
+    unique_cache_keys: List[Optional[FrameCacheKey]] = []
+    unique_image_addrs: List[int] = []
+    unique_indices: dict[Any, int] = {}
+    frame_indices: List[List[int]] = []
+
+    for stacktrace in stacktraces:
+        indices = []
+        for position, frame in enumerate(stacktrace["frames"]):
+            adjust = frame.get("adjust_instruction_addr")
+            if adjust is None:
+                # symbolicator does not adjust the first frame of a stacktrace, which no longer
+                # holds once frames are moved to another stacktrace or position
+                adjust = position > 0
+
+            try:
+                addr = parse_addr(frame["instruction_addr"])
+            except (KeyError, TypeError, ValueError):
+                addr = None
+
+            key: Any = (addr, adjust) if addr is not None else ("frame", len(unique_frames))
+            idx = unique_indices.get(key)
+            if idx is None:
+                idx = unique_indices[key] = len(unique_frames)
+                unique_frames.append({**frame, "adjust_instruction_addr": adjust})
+
+                cache_key = None
+                image_addr = 0
+                if addr is not None:
+                    r = bisect_right(range_starts, addr) - 1
+                    if r >= 0 and addr < ranges[r][1]:
+                        image_addr, _, image = ranges[r]
+                        cache_key = (project.id, image["debug_id"], addr - image_addr, adjust)
+                unique_cache_keys.append(cache_key)
+                unique_image_addrs.append(image_addr)
+            indices.append(idx)
+        frame_indices.append(indices)
+
+    resolved: List[Optional[List[Any]]] = [None] * len(unique_frames)
+    frames_to_send: List[int] = []
+    for idx, cache_key in enumerate(unique_cache_keys):
+        cached = _symbolicated_frames.get(cache_key) if cache_key is not None else None
+        if cached is None:
+            frames_to_send.append(idx)
+            continue
+        image_addr, frames = cached
+        resolved[idx] = _rebase_frames(frames, unique_image_addrs[idx] - image_addr)
+
+    metrics.incr(
+        "process_profile.symbolicate.native.frames",
+        amount=len(unique_frames) - len(frames_to_send),
+        tags={"source": "cache"},
+        sample_rate=1.0,
+    )
+    metrics.incr(
+        "process_profile.symbolicate.native.frames",
+        amount=len(frames_to_send),
+        tags={"source": "symbolicator"},
+        sample_rate=1.0,
+    )
+
+    if frames_to_send:
+        symbolicated_modules, symbolicated_stacktraces, success = run_symbolicate(
+            project=project,
+            profile=profile,
+            modules=modules,
+            stacktraces=[{"frames": [unique_frames[idx] for idx in frames_to_send]}],
+        )
+        if not success:
+            return modules, stacktraces, False
+
+        symbolicated_frames = symbolicated_stacktraces[0]["frames"]
+        for sent_idx, indices in get_frame_index_map(symbolicated_frames).items():
+            idx = frames_to_send[sent_idx]
+            frames = [symbolicated_frames[i] for i in indices]
+            resolved[idx] = frames
+
+            cache_key = unique_cache_keys[idx]
+            # frames which could not be symbolicated may resolve once debug files are uploaded
+            if cache_key is not None and all(f.get("status") == "symbolicated" for f in frames):
+                _symbolicated_frames[cache_key] = (unique_image_addrs[idx], frames)
+
+        for module in symbolicated_modules:
+            if module.get("debug_id") and module.get("debug_status") == "found":
+                _symbolicated_modules[(project.id, module["debug_id"])] = module
+    else:
+        symbolicated_modules = []
+        for image in modules:
+            cached_module = _symbolicated_modules.get((project.id, image.get("debug_id")))
+            symbolicated_modules.append({**cached_module, **image} if cached_module else image)
+
+    symbolicated_stacktraces = []
+    for indices in frame_indices:
+        frames = []
+        for position, idx in enumerate(indices):
+            for frame in resolved[idx] or [unique_frames[idx]]:
+                frames.append({**frame, "original_index": position})
+        symbolicated_stacktraces.append({"frames": frames})
+
+    return symbolicated_modules, symbolicated_stacktraces, True
+
+
 @metrics.wraps("process_profile.symbolicate.process")
 def _process_symbolicator_results(
     profile: Profile,
@@ -434,7 +617,7 @@ def _process_symbolicator_results_for_sample(
 ) -> None:
     if profile["platform"] == "rust":
 
-        def truncate_stack_needed(frames: List[dict[str, Any]], stack: List[Any]) -> List[Any]:
+        def truncate_stack_needed(frames: List[dict[str, Any]], stack: array[int]) -> array[int]:
             # remove top frames related to the profiler (top of the stack)
             if frames[stack[0]].get("function", "") == "perf_signal_handler":
                 stack = stack[2:]
@@ -447,8 +630,8 @@ def _process_symbolicator_results_for_sample(
 
         def truncate_stack_needed(
             frames: List[dict[str, Any]],
-            stack: List[Any],
-        ) -> List[Any]:
+            stack: array[int],
+        ) -> array[int]:
             # remove bottom frames we can't symbolicate
             if frames[stack[-1]].get("instruction_addr", "") == "0xffffffffc":
                 return stack[:-2]
@@ -458,8 +641,8 @@ def _process_symbolicator_results_for_sample(
 
         def truncate_stack_needed(
             frames: List[dict[str, Any]],
-            stack: List[Any],
-        ) -> List[Any]:
+            stack: array[int],
+        ) -> array[int]:
             return stack
 
     symbolicated_frames = stacktraces[0]["frames"]
@@ -498,36 +681,26 @@ def _process_symbolicator_results_for_sample(
     elif symbolicated_frames:
         profile["profile"]["frames"] = symbolicated_frames
 
-    if profile["platform"] in SHOULD_SYMBOLICATE:
+    stack_table = StackTable.from_stacks(profile["profile"]["stacks"])
+    # release the decoded stacks before materializing the processed ones
+    profile["profile"]["stacks"] = []
 
-        def get_stack(stack: List[int]) -> List[int]:
-            new_stack: List[int] = []
-            for index in stack:
-                if index in symbolicated_frames_dict:
-                    # the new stack extends the older by replacing
-                    # a specific frame index with the indices of
-                    # the frames originated from the original frame
-                    # should inlines be present                    # should inlines be present
-                    new_stack.extend(symbolicated_frames_dict[index])
-                else:
-                    new_stack.append(index)
-            return new_stack
-
-    else:
-
-        def get_stack(stack: List[int]) -> List[int]:
-            return stack
+    if profile["platform"] in SHOULD_SYMBOLICATE:
+        # the new stacks extend the older ones by replacing
+        # a specific frame index with the indices of
+        # the frames originated from the original frame
+        # should inlines be present
+        stack_table = stack_table.remap(symbolicated_frames_dict)
 
+    frames = profile["profile"]["frames"]
     stacks = []
 
-    for stack in profile["profile"]["stacks"]:
-        new_stack = get_stack(stack)
-
-        if len(new_stack) >= 2:
+    for stack in stack_table:
+        if len(stack) >= 2:
             # truncate some unneeded frames in the stack (related to the profiler itself or impossible to symbolicate)
-            new_stack = truncate_stack_needed(profile["profile"]["frames"], new_stack)
+            stack = truncate_stack_needed(frames, stack)
 
-        stacks.append(new_stack)
+        stacks.append(stack.tolist())
 
     profile["profile"]["stacks"] = stacks
 
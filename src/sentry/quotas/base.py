@@ -213,6 +213,8 @@ class Quota(Service):
         "is_rate_limited",
         "validate",
         "refund",
+        "get_usage",
+        "get_usage_many",
         "get_event_retention",
         "get_quotas",
         "get_blended_sample_rate",
@@ -290,6 +292,37 @@ class Quota(Service):
                           attachment in bytes.
         """
 
+    def get_usage(self, organization_id, quotas, timestamp=None):
+        """
+        Returns the current usage of the given quotas in the current window.
+
+        The return value is a list with one entry per quota, in the same order
+        as ``quotas``. Quotas that are not tracked return ``None``.
+
+        :param organization_id: The identifier of the organization.
+        :param quotas:          A list of ``QuotaConfig`` instances.
+        :param timestamp:       The timestamp that determines the quota window.
+                                Defaults to the current time.
+        """
+        return [None for _ in quotas]
+
+    def get_usage_many(self, requests, timestamp=None):
+        """
+        Returns the current usage of the given quotas for many organizations
+        at once. Prefer this over calling ``quotas.get_usage`` in a loop, since
+        backends may read all counters in a single pass.
+
+        :param requests:  A sequence of ``(organization_id, quotas)`` tuples.
+        :param timestamp: The timestamp that determines the quota window.
+                          Defaults to the current time.
+        :return: A list with one entry per request, each as returned by
+                 ``quotas.get_usage``.
+        """
+        return [
+            self.get_usage(organization_id, quotas, timestamp=timestamp)
+            for organization_id, quotas in requests
+        ]
+
     def get_event_retention(self, organization):
         """
         Returns the retention for events in the given organization in days.
@@ -1,4 +1,5 @@
-from time import time
+import threading
+from time import monotonic, time
 
 import sentry_sdk
 
@@ -12,6 +13,9 @@ from sentry.utils.redis import (
 
 is_rate_limited = load_script("quotas/is_rate_limited.lua")
 
+#: Number of counters cached by ``get_usage`` after which the cache is reset.
+MAX_CACHED_USAGES = 10000
+
 
 class RedisQuota(Quota):
     #: The ``grace`` period allows accommodating for clock drift in TTL
@@ -31,6 +35,13 @@ class RedisQuota(Quota):
         #  - true: `cluster` is a `RedisCluster`. It automatically dispatches to
         #    the correct node and can be used as a client directly.
 
+        #: Number of seconds for which ``get_usage`` caches the counters it
+        #: read in process. Disabled by default, since the cached values lag
+        #: behind the actual consumption.
+        self.usage_cache_ttl = options.get("usage_cache_ttl", 0)
+        self._usage_cache = {}
+        self._usage_cache_lock = threading.Lock()
+
         super().__init__(**options)
         self.namespace = "quota"
 
@@ -112,34 +123,99 @@ class RedisQuota(Quota):
         return results
 
     def get_usage(self, organization_id, quotas, timestamp=None):
-        if timestamp is None:
-            timestamp = time()
+        return self.get_usage_many([(organization_id, quotas)], timestamp=timestamp)[0]
 
-        def get_usage_for_quota(client, quota):
-            if not quota.should_track:
-                return (None, None)
+    def get_usage_many(self, requests, timestamp=None):
+        """
+        Returns the current usage of the given quotas for many organizations
+        at once.
 
-            key = self.__get_redis_key(
-                quota, timestamp, organization_id % quota.window, organization_id
-            )
-            refund_key = self.get_refunded_quota_key(key)
+        :param requests: A sequence of ``(organization_id, quotas)`` tuples.
+        :return: A list with one entry per request, each a list of usages in
+                 the same order as its quotas (see ``get_usage``).
 
-            return (client.get(key), client.get(refund_key))
+        All counters that are not cached are read in a single pass, batched
+        per Redis node.
+        """
+        if timestamp is None:
+            timestamp = time()
 
-        def get_value_for_result(result, refund_result):
-            if result is None:
-                return None
+        now = monotonic()
+        cached = {}
+        routing = {}
+        keys_by_request = []
+        for organization_id, quotas in requests:
+            keys = []
+            for quota in quotas:
+                if not quota.should_track:
+                    keys.append(None)
+                    continue
 
-            return int(result.value or 0) - int(refund_result.value or 0)
+                key = self.__get_redis_key(
+                    quota, timestamp, organization_id % quota.window, organization_id
+                )
+                keys.append(key)
+                if key not in cached and key not in routing:
+                    usage = self.__get_cached_usage(key, now)
+                    if usage is not None:
+                        cached[key] = usage
+                    else:
+                        routing[key] = organization_id
+            keys_by_request.append(keys)
+
+        fetched = self.__fetch_usage(routing)
+        if self.usage_cache_ttl:
+            self.__set_cached_usage(fetched, now)
+
+        usages = {**cached, **fetched}
+        return [[None if key is None else usages[key] for key in keys] for keys in keys_by_request]
+
+    def __fetch_usage(self, routing):
+        """Reads the counters for the given ``{key: organization_id}`` mapping."""
+        if not routing:
+            return {}
 
         if self.is_redis_cluster:
-            results = [get_usage_for_quota(self.cluster, quota) for quota in quotas]
+            pipe = self.cluster.pipeline(transaction=False)
+            for key in routing:
+                pipe.get(key)
+                pipe.get(self.get_refunded_quota_key(key))
+            values = pipe.execute()
+            results = zip(routing, values[::2], values[1::2])
         else:
             with self.cluster.fanout() as client:
-                target = client.target_key(str(organization_id))
-                results = [get_usage_for_quota(target, quota) for quota in quotas]
+                promises = []
+                for key, organization_id in routing.items():
+                    target = client.target_key(str(organization_id))
+                    promises.append(
+                        (key, target.get(key), target.get(self.get_refunded_quota_key(key)))
+                    )
+            results = (
+                (key, result.value, refund_result.value)
+                for key, result, refund_result in promises
+            )
 
-        return [get_value_for_result(*r) for r in results]
+        return {
+            key: int(value or 0) - int(refund_value or 0) for key, value, refund_value in results
+        }
+
+    def __get_cached_usage(self, key, now):
+        if not self.usage_cache_ttl:
+            return None
+
+        with self._usage_cache_lock:
+            entry = self._usage_cache.get(key)
+        if entry is None or entry[0] <= now:
+            return None
+        return entry[1]
+
+    def __set_cached_usage(self, usages, now):
+        expires_at = now + self.usage_cache_ttl
+        with self._usage_cache_lock:
+            if len(self._usage_cache) + len(usages) > MAX_CACHED_USAGES:
+                self._usage_cache = {}
+            for key, usage in usages.items():
+                self._usage_cache[key] = (expires_at, usage)
 
     def get_refunded_quota_key(self, key):
         return f"r:{key}"
@@ -1,5 +1,6 @@
 import logging
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone
 from typing import (
     Any,
@@ -22,6 +23,7 @@ from sentry import features, killswitches, quotas, utils
 from sentry.constants import HEALTH_CHECK_GLOBS, ObjectStatus
 from sentry.datascrubbing import get_datascrubbing_settings, get_pii_config
 from sentry.dynamic_sampling import generate_rules
+from sentry.dynamic_sampling.rules.utils import PolymorphicRule
 from sentry.grouping.api import get_grouping_config_dict_for_project
 from sentry.ingest.inbound_filters import (
     FilterStatKeys,
@@ -63,6 +65,17 @@ EXPOSABLE_FEATURES = [
     "organizations:custom-metrics",
 ]
 
+#: All features checked while computing a project config, see ``get_feature_flags_many``
+CONFIG_FEATURES = [
+    *EXPOSABLE_FEATURES,
+    "projects:custom-inbound-filters",
+    "organizations:dynamic-sampling",
+    "organizations:projconfig-exclude-measurements",
+    "organizations:transaction-metrics-extraction",
+    "organizations:metrics-extraction",
+    "organizations:release-health-drop-sessions",
+]
+
 EXTRACT_METRICS_VERSION = 1
 EXTRACT_ABNORMAL_MECHANISM_VERSION = 2
 
@@ -73,17 +86,62 @@ MIN_CLUSTERER_RUNS = 10
 logger = logging.getLogger(__name__)
 
 
-def get_exposed_features(project: Project) -> Sequence[str]:
+def get_feature_flags_many(projects: Sequence[Project]) -> Dict[int, Dict[str, bool]]:
+    """Checks ``CONFIG_FEATURES`` for many projects at once.
+
+    Organization and project features are each checked with one ``features.batch_has`` call
+    per organization.  Features the handlers cannot check in batch are left out of the result
+    and are checked individually while computing the config.
+
+    :returns: A dict mapping project ids to the resolved feature flags.
+    """
+    org_features = [f for f in CONFIG_FEATURES if f.startswith("organizations:")]
+    project_features = [f for f in CONFIG_FEATURES if f.startswith("projects:")]
+
+    projects_by_org: Dict[int, List[Project]] = defaultdict(list)
+    for project in projects:
+        projects_by_org[project.organization_id].append(project)
+
+    feature_flags: Dict[int, Dict[str, bool]] = {}
+    for org_projects in projects_by_org.values():
+        organization = org_projects[0].organization
+        org_results = features.batch_has(org_features, organization=organization) or {}
+        project_results = (
+            features.batch_has(project_features, projects=org_projects, organization=organization)
+            or {}
+        )
+
+        org_flags = org_results.get(f"organization:{organization.id}", {})
+        for project in org_projects:
+            feature_flags[project.id] = {
+                **org_flags,
+                **project_results.get(f"project:{project.id}", {}),
+            }
+
+    return feature_flags
+
+
+def _has_feature(
+    feature: str, project: Project, feature_flags: Optional[Mapping[str, bool]] = None
+) -> bool:
+    if feature_flags is not None and feature in feature_flags:
+        return feature_flags[feature]
+
+    if feature.startswith("organizations:"):
+        return features.has(feature, project.organization)
+    else:
+        return features.has(feature, project)
+
+
+def get_exposed_features(
+    project: Project, feature_flags: Optional[Mapping[str, bool]] = None
+) -> Sequence[str]:
     active_features = []
     for feature in EXPOSABLE_FEATURES:
-        if feature.startswith("organizations:"):
-            has_feature = features.has(feature, project.organization)
-        elif feature.startswith("projects:"):
-            has_feature = features.has(feature, project)
-        else:
+        if not feature.startswith(("organizations:", "projects:")):
             raise RuntimeError("EXPOSABLE_FEATURES must start with 'organizations:' or 'projects:'")
 
-        if has_feature:
+        if _has_feature(feature, project, feature_flags):
             metrics.incr(
                 "sentry.relay.config.features", tags={"outcome": "enabled", "feature": feature}
             )
@@ -117,7 +175,9 @@ def get_public_key_configs(
     return public_keys
 
 
-def get_filter_settings(project: Project) -> Mapping[str, Any]:
+def get_filter_settings(
+    project: Project, feature_flags: Optional[Mapping[str, bool]] = None
+) -> Mapping[str, Any]:
     filter_settings = {}
 
     for flt in get_all_filter_specs():
@@ -128,7 +188,7 @@ def get_filter_settings(project: Project) -> Mapping[str, Any]:
             filter_settings[filter_id] = settings
 
     error_messages: List[str] = []
-    if features.has("projects:custom-inbound-filters", project):
+    if _has_feature("projects:custom-inbound-filters", project, feature_flags):
         invalid_releases = project.get_option(f"sentry:{FilterTypes.RELEASES}")
         if invalid_releases:
             filter_settings["releases"] = {"releases": invalid_releases}
@@ -177,7 +237,11 @@ def get_quotas(project: Project, keys: Optional[Sequence[ProjectKey]] = None) ->
 
 
 def get_project_config(
-    project: Project, full_config: bool = True, project_keys: Optional[Sequence[ProjectKey]] = None
+    project: Project,
+    full_config: bool = True,
+    project_keys: Optional[Sequence[ProjectKey]] = None,
+    feature_flags: Optional[Mapping[str, bool]] = None,
+    dynamic_sampling_rules: Optional[List[PolymorphicRule]] = None,
 ) -> "ProjectConfig":
     """Constructs the ProjectConfig information.
     :param project: The project to load configuration for. Ensure that
@@ -190,19 +254,36 @@ def get_project_config(
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param feature_flags: Pre-fetched feature flags for performance, see
+        ``get_feature_flags_many``. Features missing from it are checked individually.
+    :param dynamic_sampling_rules: Pre-computed dynamic sampling rules for performance, see
+        ``sentry.dynamic_sampling.generate_rules_many``.
     :return: a ProjectConfig object for the given project
     """
     with sentry_sdk.push_scope() as scope:
         scope.set_tag("project", project.id)
         with metrics.timer("relay.config.get_project_config.duration"):
-            return _get_project_config(project, full_config=full_config, project_keys=project_keys)
+            return _get_project_config(
+                project,
+                full_config=full_config,
+                project_keys=project_keys,
+                feature_flags=feature_flags,
+                dynamic_sampling_rules=dynamic_sampling_rules,
+            )
+
 
+def get_dynamic_sampling_config(
+    project: Project,
+    feature_flags: Optional[Mapping[str, bool]] = None,
+    rules: Optional[List[PolymorphicRule]] = None,
+) -> Optional[Mapping[str, Any]]:
+    if _has_feature("organizations:dynamic-sampling", project, feature_flags):
+        if rules is None:
+            rules = generate_rules(project)
 
-def get_dynamic_sampling_config(project: Project) -> Optional[Mapping[str, Any]]:
-    if features.has("organizations:dynamic-sampling", project.organization):
         # For compatibility reasons we want to return an empty list of old rules. This has been done in order to make
         # old Relays use empty configs which will result in them forwarding sampling decisions to upstream Relays.
-        return {"rules": [], "rulesV2": generate_rules(project)}
+        return {"rules": [], "rulesV2": rules}
 
     return None
 
@@ -222,8 +303,10 @@ class TransactionNameRule(TypedDict):
     redaction: TransactionNameRuleRedaction
 
 
-def get_transaction_names_config(project: Project) -> Optional[Sequence[TransactionNameRule]]:
-    if not features.has("organizations:transaction-name-normalize", project.organization):
+def get_transaction_names_config(
+    project: Project, feature_flags: Optional[Mapping[str, bool]] = None
+) -> Optional[Sequence[TransactionNameRule]]:
+    if not _has_feature("organizations:transaction-name-normalize", project, feature_flags):
         return None
 
     cluster_rules = get_sorted_rules(ClustererNamespace.TRANSACTIONS, project)
@@ -263,8 +346,10 @@ class SpanDescriptionRule(TypedDict):
     redaction: SpanDescriptionRuleRedaction
 
 
-def get_span_descriptions_config(project: Project) -> Optional[Sequence[SpanDescriptionRule]]:
-    if not features.has("projects:span-metrics-extraction", project):
+def get_span_descriptions_config(
+    project: Project, feature_flags: Optional[Mapping[str, bool]] = None
+) -> Optional[Sequence[SpanDescriptionRule]]:
+    if not _has_feature("projects:span-metrics-extraction", project, feature_flags):
         return None
 
     rules = get_sorted_rules(ClustererNamespace.SPANS, project)
@@ -314,7 +399,11 @@ def _should_extract_abnormal_mechanism(project: Project) -> bool:
 
 
 def _get_project_config(
-    project: Project, full_config: bool = True, project_keys: Optional[Sequence[ProjectKey]] = None
+    project: Project,
+    full_config: bool = True,
+    project_keys: Optional[Sequence[ProjectKey]] = None,
+    feature_flags: Optional[Mapping[str, bool]] = None,
+    dynamic_sampling_rules: Optional[List[PolymorphicRule]] = None,
 ) -> "ProjectConfig":
     if project.status != ObjectStatus.ACTIVE:
         return ProjectConfig(project, disabled=True)
@@ -346,23 +435,34 @@ def _get_project_config(
 
     config = cfg["config"]
 
-    if exposed_features := get_exposed_features(project):
+    if exposed_features := get_exposed_features(project, feature_flags):
         config["features"] = exposed_features
 
     # NOTE: Omitting dynamicSampling because of a failure increases the number
     # of events forwarded by Relay, because dynamic sampling will stop filtering
     # anything.
-    add_experimental_config(config, "dynamicSampling", get_dynamic_sampling_config, project)
+    add_experimental_config(
+        config,
+        "dynamicSampling",
+        get_dynamic_sampling_config,
+        project,
+        feature_flags,
+        dynamic_sampling_rules,
+    )
 
-    if not features.has("organizations:projconfig-exclude-measurements", project.organization):
+    if not _has_feature("organizations:projconfig-exclude-measurements", project, feature_flags):
         # Limit the number of custom measurements
         add_experimental_config(config, "measurements", get_measurements_config)
 
     # Rules to replace high cardinality transaction names
-    add_experimental_config(config, "txNameRules", get_transaction_names_config, project)
+    add_experimental_config(
+        config, "txNameRules", get_transaction_names_config, project, feature_flags
+    )
 
     # Rules to replace high cardinality span descriptions
-    add_experimental_config(config, "spanDescriptionRules", get_span_descriptions_config, project)
+    add_experimental_config(
+        config, "spanDescriptionRules", get_span_descriptions_config, project, feature_flags
+    )
 
     # Mark the project as ready if it has seen >= 10 clusterer runs.
     # This prevents projects from prematurely marking all URL transactions as sanitized.
@@ -375,13 +475,14 @@ def _get_project_config(
 
     config["breakdownsV2"] = project.get_option("sentry:breakdowns")
 
-    if _should_extract_transaction_metrics(project):
+    if _should_extract_transaction_metrics(project, feature_flags):
         add_experimental_config(
             config,
             "transactionMetrics",
             get_transaction_metrics_settings,
             project,
             config.get("breakdownsV2"),
+            feature_flags,
         )
 
         # This config key is technically not specific to _transaction_ metrics,
@@ -393,19 +494,19 @@ def _get_project_config(
 
         add_experimental_config(config, "metricExtraction", get_metric_extraction_config, project)
 
-    if features.has("organizations:metrics-extraction", project.organization):
+    if _has_feature("organizations:metrics-extraction", project, feature_flags):
         config["sessionMetrics"] = {
             "version": EXTRACT_ABNORMAL_MECHANISM_VERSION
             if _should_extract_abnormal_mechanism(project)
             else EXTRACT_METRICS_VERSION,
-            "drop": features.has(
-                "organizations:release-health-drop-sessions", project.organization
+            "drop": _has_feature(
+                "organizations:release-health-drop-sessions", project, feature_flags
             ),
         }
 
     config["spanAttributes"] = project.get_option("sentry:span_attributes")
     with Hub.current.start_span(op="get_filter_settings"):
-        if filter_settings := get_filter_settings(project):
+        if filter_settings := get_filter_settings(project, feature_flags):
             config["filterSettings"] = filter_settings
     with Hub.current.start_span(op="get_grouping_config_dict_for_project"):
         grouping_config = get_grouping_config_dict_for_project(project)
@@ -603,16 +704,20 @@ class TransactionMetricsSettings(TypedDict):
     acceptTransactionNames: TransactionNameStrategy
 
 
-def _should_extract_transaction_metrics(project: Project) -> bool:
-    return features.has(
-        "organizations:transaction-metrics-extraction", project.organization
+def _should_extract_transaction_metrics(
+    project: Project, feature_flags: Optional[Mapping[str, bool]] = None
+) -> bool:
+    return _has_feature(
+        "organizations:transaction-metrics-extraction", project, feature_flags
     ) and not killswitches.killswitch_matches_context(
         "relay.drop-transaction-metrics", {"project_id": project.id}
     )
 
 
 def get_transaction_metrics_settings(
-    project: Project, breakdowns_config: Optional[Mapping[str, Any]]
+    project: Project,
+    breakdowns_config: Optional[Mapping[str, Any]],
+    feature_flags: Optional[Mapping[str, bool]] = None,
 ) -> TransactionMetricsSettings:
     """This function assumes that the corresponding feature flag has been checked.
     See _should_extract_transaction_metrics.
@@ -641,7 +746,7 @@ def get_transaction_metrics_settings(
         capture_exception()
 
     version = TRANSACTION_METRICS_EXTRACTION_VERSION
-    if features.has("organizations:projconfig-exclude-measurements", project.organization):
+    if _has_feature("organizations:projconfig-exclude-measurements", project, feature_flags):
         version = 2
 
     return {
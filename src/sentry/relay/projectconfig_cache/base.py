@@ -2,7 +2,7 @@ from sentry.utils.services import Service
 
 
 class ProjectConfigCache(Service):
-    __all__ = ("set_many", "delete_many", "get")
+    __all__ = ("set_many", "delete_many", "get", "exists_many", "get_hashes_many")
 
     def __init__(self, **options):
         pass
@@ -15,3 +15,14 @@ class ProjectConfigCache(Service):
 
     def get(self, public_key):
         raise NotImplementedError()
+
+    def exists_many(self, public_keys):
+        """Returns a mapping of public keys to whether a config is cached for them."""
+        return {public_key: self.get(public_key) is not None for public_key in public_keys}
+
+    def get_hashes_many(self, public_keys):
+        """Returns a mapping of the public keys with a cached config to the content hash stored
+        with it (see :func:`sentry.relay.utils.get_config_hash`), or None if there is none.
+        """
+        cached = self.exists_many(public_keys)
+        return {public_key: None for public_key, exists in cached.items() if exists}
@@ -3,6 +3,7 @@ import logging
 import zstandard
 
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
+from sentry.relay.utils import get_config_hash
 from sentry.utils import json, metrics, redis
 from sentry.utils.redis import validate_dynamic_cluster
 
@@ -28,6 +29,9 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_key(self, public_key):
         return f"relayconfig:{public_key}"
 
+    def __get_redis_hash_key(self, public_key):
+        return f"relayconfig-hash:{public_key}"
+
     def set_many(self, configs):
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
@@ -40,6 +44,9 @@ class RedisProjectConfigCache(ProjectConfigCache):
             metrics.timing("relay.projectconfig_cache.size", len(compressed))
 
             p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
+            p.setex(
+                self.__get_redis_hash_key(public_key), REDIS_CACHE_TIMEOUT, get_config_hash(config)
+            )
 
         p.execute()
 
@@ -48,12 +55,42 @@ class RedisProjectConfigCache(ProjectConfigCache):
         with self.cluster.pipeline() as p:
             for public_key in public_keys:
                 p.delete(self.__get_redis_key(public_key))
+                p.delete(self.__get_redis_hash_key(public_key))
             return_values = p.execute()
 
         metrics.incr(
-            "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
+            "relay.projectconfig_cache.write",
+            amount=sum(return_values[::2]),
+            tags={"action": "delete"},
         )
 
+    def exists_many(self, public_keys):
+        # Note: Those are multiple pipelines, one per cluster node
+        with self.cluster_read.pipeline() as p:
+            for public_key in public_keys:
+                p.exists(self.__get_redis_key(public_key))
+            return_values = p.execute()
+
+        return {
+            public_key: bool(exists) for public_key, exists in zip(public_keys, return_values)
+        }
+
+    def get_hashes_many(self, public_keys):
+        # Note: Those are multiple pipelines, one per cluster node
+        with self.cluster_read.pipeline() as p:
+            for public_key in public_keys:
+                p.exists(self.__get_redis_key(public_key))
+                p.get(self.__get_redis_hash_key(public_key))
+            return_values = p.execute()
+
+        return {
+            public_key: stored_hash.decode() if stored_hash is not None else None
+            for public_key, exists, stored_hash in zip(
+                public_keys, return_values[::2], return_values[1::2]
+            )
+            if exists
+        }
+
     def get(self, public_key):
         rv = self.cluster_read.get(self.__get_redis_key(public_key))
         if rv is not None:
@@ -1,5 +1,21 @@
 import uuid
 
+from sentry.utils.hashlib import sha1_text
+from sentry.utils.json import JSONEncoder, better_default_encoder
+
+#: Top-level project config keys that change on every computation (or
+#: whenever nothing else changed), and are therefore not part of the content hash.
+VOLATILE_CONFIG_KEYS = frozenset(("lastFetch", "lastChange", "rev"))
+
+# `sentry.utils.json.dumps` does not sort keys, but configs are rebuilt from scratch on every
+# computation and the hash must not depend on the order their keys were inserted in.
+_config_hash_encoder = JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+    ignore_nan=True,
+    default=better_default_encoder,
+)
+
 
 def get_header_relay_id(request):
     try:
@@ -57,3 +73,13 @@ def to_camel_case_name(name):
         name = name.strip("_")
         pieces = name.split("_")
         return first_lower(pieces[0]) + "".join(first_upper(x) for x in pieces[1:])
+
+
+def get_config_hash(config):
+    """
+    Returns a stable content hash of a project config, which only changes if
+    the contents of the config change.
+    """
+    if isinstance(config, dict):
+        config = {k: v for k, v in config.items() if k not in VOLATILE_CONFIG_KEYS}
+    return sha1_text(_config_hash_encoder.encode(config)).hexdigest()
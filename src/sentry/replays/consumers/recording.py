@@ -16,6 +16,7 @@ from sentry_sdk.tracing import Span
 
 from sentry.replays.usecases.ingest import ingest_recording
 from sentry.utils.arroyo import RunTaskWithMultiprocessing
+from sentry.utils.outcomes import flush_outcomes
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +94,9 @@ class ProcessReplayRecordingStrategyFactory(ProcessingStrategyFactory[KafkaPaylo
                 ),
             )
 
+    def shutdown(self) -> None:
+        flush_outcomes()
+
 
 def initialize_threaded_context(message: Message[KafkaPayload]) -> MessageContext:
     """Initialize a Sentry transaction and unpack the message."""
@@ -1,10 +1,12 @@
 import functools
+from typing import Dict
 
 from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from sentry import features
+from sentry import features, options
 from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases.project import ProjectEndpoint
@@ -13,6 +15,27 @@ from sentry.replays.lib.storage import storage
 from sentry.replays.usecases.reader import download_segments, fetch_segments_metadata
 
 
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows a gzip encoded response"""
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    # A `q` of 0 means the coding is not acceptable. Explicitly listed codings take precedence
+    # over the `*` wildcard.
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+
 @region_silo_endpoint
 class ProjectReplayRecordingSegmentIndexEndpoint(ProjectEndpoint):
     publish_status = {
@@ -29,11 +52,20 @@ class ProjectReplayRecordingSegmentIndexEndpoint(ProjectEndpoint):
         ):
             return self.respond(status=404)
 
-        return self.paginate(
+        # Clients accepting gzip are sent the stored segments without decompressing them.
+        compressed = options.get("replay.storage.compressed-download") and accepts_gzip(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+
+        response = self.paginate(
             request=request,
             response_cls=StreamingHttpResponse,
             response_kwargs={"content_type": "application/json"},
             paginator_cls=GenericOffsetPaginator,
             data_fn=functools.partial(fetch_segments_metadata, project.id, replay_id),
-            on_results=download_segments,
+            on_results=functools.partial(download_segments, compressed=compressed),
         )
+        if compressed:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import dataclasses
 import logging
-import zlib
 from datetime import datetime, timezone
 from typing import Optional, TypedDict, cast
 
@@ -17,6 +16,7 @@ from sentry.models.project import Project
 from sentry.replays.feature import has_feature_access
 from sentry.replays.lib.storage import RecordingSegmentStorageMeta, make_storage_driver
 from sentry.replays.usecases.ingest.dom_index import parse_and_emit_replay_actions
+from sentry.replays.usecases.ingest.event_stream import RecordingSegmentEvents
 from sentry.signals import first_replay_received
 from sentry.utils import json, metrics
 from sentry.utils.outcomes import Outcome, track_outcome
@@ -151,14 +151,6 @@ def replay_recording_segment_cache_id(project_id: int, replay_id: str, segment_i
     return f"{project_id}:{replay_id}:{segment_id}"
 
 
-def decompress(data: bytes) -> bytes:
-    """Return decompressed bytes."""
-    if data.startswith(b"["):
-        return data
-    else:
-        return zlib.decompress(data, zlib.MAX_WBITS | 32)
-
-
 def _report_size_metrics(
     size_compressed: Optional[int] = None, size_uncompressed: Optional[int] = None
 ) -> None:
@@ -182,12 +174,11 @@ def replay_click_post_processor(
         _report_size_metrics(size_compressed=len(segment_bytes))
         return None
 
-    try:
-        with metrics.timer("replays.usecases.ingest.decompress_and_parse"):
-            decompressed_segment = decompress(segment_bytes)
-            parsed_segment_data = json.loads(decompressed_segment, use_rapid_json=True)
-            _report_size_metrics(len(segment_bytes), len(decompressed_segment))
+    # Events are decoded lazily so only the portion of the segment needed to extract the
+    # replay actions is ever parsed.
+    segment_events = RecordingSegmentEvents(segment_bytes)
 
+    try:
         # Emit DOM search metadata to Clickhouse.
         with transaction.start_child(
             op="replays.usecases.ingest.parse_and_emit_replay_actions",
@@ -197,7 +188,7 @@ def replay_click_post_processor(
                 retention_days=message.retention_days,
                 project_id=message.project_id,
                 replay_id=message.replay_id,
-                segment_data=parsed_segment_data,
+                segment_data=segment_events,
             )
     except Exception:
         logging.exception(
@@ -208,3 +199,5 @@ def replay_click_post_processor(
                 headers["segment_id"],
             )
         )
+    finally:
+        _report_size_metrics(len(segment_bytes), segment_events.close())
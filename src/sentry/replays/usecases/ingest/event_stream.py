@@ -0,0 +1,173 @@
+"""Incremental decoding of recording segments.
+
+A recording segment is a (usually compressed) JSON array of rrweb events. Segments can be several
+megabytes once decompressed, most of which is snapshot data we have no interest in during
+ingest. Rather than decompressing and parsing the whole segment up front, the events are decoded
+one at a time from a bounded decompression window. Consumers which stop iterating early never pay
+for the remainder of the segment.
+"""
+from __future__ import annotations
+
+import codecs
+import re
+import zlib
+from typing import Any, Iterator, Optional
+
+from sentry.utils import json, metrics
+
+# The number of decompressed bytes produced per step.
+READ_SIZE = 64 * 1024
+
+# The maximum number of bytes a single event may occupy before decoding stops. This bounds the
+# memory used per segment regardless of the segment's total size.
+MAX_EVENT_SIZE = 16 * 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class RecordingSegmentEvents:
+    """Iterate the events of a recording segment without decoding it in full.
+
+    Each event is materialized on its own and discarded by the stream as soon as it has been
+    yielded. If a single event would grow beyond `max_event_size` bytes the iteration stops
+    early and the stream is marked as truncated.
+
+    The `decompressed_size` attribute is only complete once `exhausted` is set. Call `close` to
+    get the size of a segment which was not iterated to its end.
+    """
+
+    def __init__(
+        self,
+        segment_bytes: bytes,
+        read_size: int = READ_SIZE,
+        max_event_size: int = MAX_EVENT_SIZE,
+    ) -> None:
+        self.segment_bytes = segment_bytes
+        self.read_size = read_size
+        self.max_event_size = max_event_size
+        self.decompressed_size = 0
+        self.exhausted = False
+        self.truncated = False
+        self._chunks: Optional[Iterator[bytes]] = None
+
+    def __iter__(self) -> Iterator[Any]:
+        chunks = self._chunks = self._iter_decompressed()
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+        buffer = ""
+        pos = 0
+        # The minimum amount of pending text required before attempting to decode again. This
+        # grows geometrically so large events are not re-parsed for every chunk read.
+        required = 0
+        expect_value = True
+        started = False
+        input_exhausted = False
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            pending = len(buffer) - pos
+
+            if pending == 0 or pending < required:
+                if input_exhausted:
+                    if pending == 0:
+                        raise ValueError("Unexpected end of recording segment.")
+                else:
+                    parts = [buffer[pos:]]
+                    while pending < max(required, 1):
+                        if pending > self.max_event_size:
+                            metrics.incr("replays.usecases.ingest.event_stream.truncated")
+                            self.truncated = True
+                            return
+
+                        chunk = next(chunks, None)
+                        if chunk is None:
+                            input_exhausted = True
+                            parts.append(text_decoder.decode(b"", final=True))
+                            break
+
+                        text = text_decoder.decode(chunk)
+                        parts.append(text)
+                        pending += len(text)
+
+                    buffer = "".join(parts)
+                    pos = 0
+                    continue
+
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Recording segment is not a JSON array.")
+                pos += 1
+                started = True
+                continue
+
+            if buffer[pos] == "]":
+                # Drain whatever remains so the decompressed size is complete.
+                for _ in chunks:
+                    pass
+                self.exhausted = True
+                return
+
+            if not expect_value:
+                if buffer[pos] != ",":
+                    raise ValueError("Expected a delimiter between recording segment events.")
+                pos += 1
+                expect_value = True
+                continue
+
+            try:
+                event, end = json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if input_exhausted:
+                    raise
+                required = max(pending * 4, self.read_size)
+                continue
+
+            # A value reaching the end of the buffer may be incomplete (e.g. a truncated number)
+            # so the next chunk must be read before it can be trusted.
+            if end == len(buffer) and not input_exhausted:
+                required = pending + 1
+                continue
+
+            pos = end
+            required = 0
+            expect_value = False
+            yield event
+
+    def close(self) -> Optional[int]:
+        """Decompress the part of the segment that was not read, without decoding it.
+
+        Iteration must not be resumed afterwards. Returns the decompressed size of the whole
+        segment, or `None` if the segment cannot be decompressed.
+        """
+        if self._chunks is None:
+            self._chunks = self._iter_decompressed()
+
+        try:
+            for _ in self._chunks:
+                pass
+        except zlib.error:
+            return None
+        return self.decompressed_size
+
+    def _iter_decompressed(self) -> Iterator[bytes]:
+        data = self.segment_bytes
+
+        if data.startswith(b"["):
+            for i in range(0, len(data), self.read_size):
+                chunk = data[i : i + self.read_size]
+                self.decompressed_size += len(chunk)
+                yield chunk
+            return
+
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        while data and not decompressor.eof:
+            chunk = decompressor.decompress(data, self.read_size)
+            data = decompressor.unconsumed_tail
+            if chunk:
+                self.decompressed_size += len(chunk)
+                yield chunk
+
+        chunk = decompressor.flush()
+        if chunk:
+            self.decompressed_size += len(chunk)
+            yield chunk
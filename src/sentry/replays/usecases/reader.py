@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import functools
+import gzip
+import struct
 import uuid
 import zlib
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Iterator, List, Optional
+from typing import Callable, Deque, Iterator, List, Optional, Sequence, TypeVar
 
 import sentry_sdk
 from django.db.models import Prefetch
@@ -30,6 +33,19 @@ from sentry.replays.lib.storage import RecordingSegmentStorageMeta, filestore, s
 from sentry.replays.models import ReplayRecordingSegment
 from sentry.utils.snuba import raw_snql_query
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# The number of segments which may be downloaded ahead of the segment being streamed to the
+# client. This bounds the memory held by a single download regardless of the replay's length.
+PREFETCH_WINDOW = 10
+
+# The number of decompressed bytes produced per step when checksumming a segment.
+READ_SIZE = 64 * 1024
+
+# A minimal gzip member header: deflate, no flags, no modification time, unknown OS.
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
 # METADATA QUERY BEHAVIOR.
 
 
@@ -242,8 +258,15 @@ def _fetch_segments_from_snuba(
 # BLOB DOWNLOAD BEHAVIOR.
 
 
-def download_segments(segments: List[RecordingSegmentStorageMeta]) -> Iterator[bytes]:
-    """Download segment data from remote storage."""
+def download_segments(
+    segments: List[RecordingSegmentStorageMeta], compressed: bool = False
+) -> Iterator[bytes]:
+    """Download segment data from remote storage.
+
+    If `compressed` is set the output is a multi-member gzip stream and must be served with a
+    gzip content-encoding. The stored segments are passed through in their compressed form
+    rather than being decompressed in full.
+    """
 
     # start a sentry transaction to pass to the thread pool workers
     transaction = sentry_sdk.start_transaction(
@@ -253,26 +276,49 @@ def download_segments(segments: List[RecordingSegmentStorageMeta]) -> Iterator[b
     )
 
     download_segment_with_fixed_args = functools.partial(
-        download_segment, transaction=transaction, current_hub=sentry_sdk.Hub.current
+        download_compressed_segment if compressed else download_segment,
+        transaction=transaction,
+        current_hub=sentry_sdk.Hub.current,
     )
 
-    yield b"["
+    frame: Callable[[bytes], bytes] = _compress_frame if compressed else lambda b: b
+
+    yield frame(b"[")
     # Map all of the segments to a worker process for download.
     with ThreadPoolExecutor(max_workers=10) as exe:
-        results = exe.map(download_segment_with_fixed_args, segments)
+        results = _map_with_window(exe, download_segment_with_fixed_args, segments, PREFETCH_WINDOW)
 
         for i, result in enumerate(results):
             if result is None:
-                yield b"[]"
+                yield frame(b"[]")
             else:
                 yield result
 
             if i < len(segments) - 1:
-                yield b","
-    yield b"]"
+                yield frame(b",")
+    yield frame(b"]")
     transaction.finish()
 
 
+def _map_with_window(
+    exe: Executor, fn: Callable[[T], R], items: Sequence[T], window: int
+) -> Iterator[R]:
+    """Like `Executor.map` but with at most `window` calls scheduled ahead of the consumer."""
+    futures: Deque[Future[R]] = deque()
+    for item in items:
+        if len(futures) == window:
+            yield futures.popleft().result()
+        futures.append(exe.submit(fn, item))
+
+    while futures:
+        yield futures.popleft().result()
+
+
+@functools.lru_cache(maxsize=None)
+def _compress_frame(value: bytes) -> bytes:
+    return gzip.compress(value, mtime=0)
+
+
 def download_segment(
     segment: RecordingSegmentStorageMeta,
     transaction: Span,
@@ -310,3 +356,72 @@ def decompress(buffer: bytes) -> bytes:
         return buffer
 
     return zlib.decompress(buffer, zlib.MAX_WBITS | 32)
+
+
+def download_compressed_segment(
+    segment: RecordingSegmentStorageMeta,
+    transaction: Span,
+    current_hub: sentry_sdk.Hub,
+) -> Optional[bytes]:
+    """Return the segment blob data as a gzip member."""
+    with sentry_sdk.Hub(current_hub):
+        with transaction.start_child(
+            op="download_compressed_segment",
+            description="thread_task",
+        ):
+            driver = filestore if segment.file_id else storage
+            with sentry_sdk.start_span(
+                op="download_compressed_segment",
+                description="download",
+            ):
+                result = driver.get(segment)
+            if result is None:
+                return None
+
+            with sentry_sdk.start_span(
+                op="download_compressed_segment",
+                description="to_gzip_member",
+            ):
+                return to_gzip_member(result)
+
+
+def to_gzip_member(buffer: bytes) -> bytes:
+    """Return the buffer as a single gzip member.
+
+    Gzip buffers are returned as is. Zlib buffers have their deflate stream re-framed with a gzip
+    header and trailer. The trailer's checksum requires inflating the stream but the output is
+    discarded incrementally and nothing is recompressed. Uncompressed buffers are compressed.
+    """
+    if buffer.startswith(b"\x1f\x8b"):
+        return buffer
+    elif buffer.startswith(b"["):
+        return gzip.compress(buffer, mtime=0)
+
+    # Zlib streams with a preset dictionary can not be re-framed.
+    if len(buffer) > 1 and buffer[1] & 0x20:
+        return gzip.compress(decompress(buffer), mtime=0)
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+    crc = 0
+    size = 0
+
+    data = buffer
+    while data and not decompressor.eof:
+        chunk = decompressor.decompress(data, READ_SIZE)
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+        data = decompressor.unconsumed_tail
+
+    # Flushing once the end of the stream was reached would move the unconsumed input into
+    # `unused_data`, throwing off the position of the trailer below.
+    if not decompressor.eof:
+        chunk = decompressor.flush()
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+
+    if not decompressor.eof:
+        raise zlib.error("Incomplete or truncated stream")
+
+    # The deflate stream sits between the two byte zlib header and the four byte checksum.
+    end = len(buffer) - len(decompressor.unused_data) - 4
+    return b"".join((GZIP_HEADER, buffer[2:end], struct.pack("<II", crc, size & 0xFFFFFFFF)))
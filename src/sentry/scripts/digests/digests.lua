@@ -266,7 +266,7 @@ local function add_record_to_timeline(configuration, timeline_id, record_id, val
     return ready
 end
 
-local function digest_timeline(configuration, timeline_id, timeline_capacity)
+local function open_digest(configuration, timeline_id, timeline_capacity)
     -- Check to ensure that the timeline is in the correct state.
     if redis.call('ZSCORE', configuration:get_schedule_ready_key(), timeline_id) == false then
         error('err(invalid_state): timeline is not in the ready state, cannot be digested')
@@ -294,6 +294,12 @@ local function digest_timeline(configuration, timeline_id, timeline_capacity)
         redis.call('EXPIRE', digest_key, configuration.ttl)
     end
 
+    return digest_key
+end
+
+local function digest_timeline(configuration, timeline_id, timeline_capacity)
+    local digest_key = open_digest(configuration, timeline_id, timeline_capacity)
+
     local results = {}
     local records = redis.call('ZREVRANGE', digest_key, 0, -1, 'WITHSCORES')
     local i = 0
@@ -309,6 +315,13 @@ local function digest_timeline(configuration, timeline_id, timeline_capacity)
     return results
 end
 
+-- Like `digest_timeline`, but only returns the record IDs and their scores.
+-- The record contents can then be fetched by the caller in smaller chunks.
+local function digest_timeline_keys(configuration, timeline_id, timeline_capacity)
+    local digest_key = open_digest(configuration, timeline_id, timeline_capacity)
+    return redis.call('ZREVRANGE', digest_key, 0, -1, 'WITHSCORES')
+end
+
 local function close_digest(configuration, timeline_id, delay_minimum, record_ids)
     local timeline_key = configuration:get_timeline_key(timeline_id)
     local digest_key = configuration:get_timeline_digest_key(timeline_id)
@@ -439,6 +452,14 @@ local commands = {
         )(cursor, arguments)
         return digest_timeline(configuration, timeline_id, timeline_capacity)
     end,
+    DIGEST_OPEN_KEYS = function (cursor, arguments)
+        local cursor, configuration, timeline_id, timeline_capacity = multiple_argument_parser(
+            configuration_argument_parser,
+            argument_parser(),
+            argument_parser(tonumber)
+        )(cursor, arguments)
+        return digest_timeline_keys(configuration, timeline_id, timeline_capacity)
+    end,
     DIGEST_CLOSE = function (cursor, arguments)
         local cursor, configuration, timeline_id, delay_minimum, record_ids = multiple_argument_parser(
             configuration_argument_parser,
@@ -0,0 +1,24 @@
+-- Fixed window rate limiter used by `RedisRateLimiter`.
+--
+-- Counts hits in the current window and makes sure the window key expires
+-- once the window is over, in a single round trip. Doing the INCR and EXPIRE
+-- as two separate commands costs an extra round trip on every request, and
+-- leaves a counter without a TTL behind if the second command fails.
+--
+-- Input:
+-- keys:
+--  redis_key (the key of the current time bucket)
+-- args:
+--  expiration (seconds until the current window ends),
+--  hits (number of hits to count, more than one when a process leases hits in advance)
+--
+-- Output:
+-- the value of the counter including these hits
+local key = KEYS[1]
+local expiration = tonumber(ARGV[1])
+local hits = tonumber(ARGV[2])
+
+local current = redis.call("incrby", key, hits)
+redis.call("expire", key, expiration)
+
+return current
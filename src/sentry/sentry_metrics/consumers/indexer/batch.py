@@ -36,7 +36,7 @@ from sentry.sentry_metrics.consumers.indexer.parsed_message import ParsedMessage
 from sentry.sentry_metrics.consumers.indexer.routing_producer import RoutingPayload
 from sentry.sentry_metrics.indexer.base import Metadata
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
-from sentry.utils import json, metrics
+from sentry.utils import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +46,10 @@ MAX_NAME_LENGTH = MAX_INDEXED_COLUMN_LENGTH
 
 ACCEPTED_METRIC_TYPES = {"s", "c", "d"}  # set, counter, distribution
 MRI_RE_PATTERN = re.compile("^([c|s|d|g|e]):([a-zA-Z0-9_]+)/.*$")
+# Strings (which may contain brackets themselves) and brackets are the only tokens that matter
+# when looking for the end of a nested JSON container.
+JSON_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]')
+JSON_WHITESPACE = b" \t\n\r"
 
 OrgId = int
 Headers = MutableSequence[Tuple[str, bytes]]
@@ -70,6 +74,53 @@ def _should_sample_debug_log() -> bool:
     return (rate > 0) and random.random() <= rate
 
 
+def split_raw_value(payload: bytes) -> Optional[Tuple[bytes, str]]:
+    """
+    Cuts the raw JSON of the top-level ``value`` array out of an encoded metric, so that only the
+    rest of the payload has to be decoded and the value can be written to the output as is.
+
+    Returns the payload with the value replaced by ``null`` together with the raw value, or None
+    if the payload has no top-level ``value`` array (counters, or anything unexpected).
+    """
+    depth = 0
+    tokens = JSON_TOKEN_RE.finditer(payload)
+    for token in tokens:
+        first = payload[token.start()]
+        if first == ord("{") or first == ord("["):
+            depth += 1
+        elif first == ord("}") or first == ord("]"):
+            depth -= 1
+        elif depth == 1 and token.group() == b'"value"':
+            colon = _skip_whitespace(payload, token.end())
+            if colon >= len(payload) or payload[colon] != ord(":"):
+                # The string is a value of another member, not a key.
+                continue
+            start = _skip_whitespace(payload, colon + 1)
+            if start >= len(payload) or payload[start] != ord("["):
+                return None
+
+            # Skip over everything up to the bracket closing the array.
+            value_depth = 0
+            for value_token in tokens:
+                first = payload[value_token.start()]
+                if first == ord("{") or first == ord("["):
+                    value_depth += 1
+                elif first == ord("}") or first == ord("]"):
+                    value_depth -= 1
+                    if value_depth == 0:
+                        end = value_token.end()
+                        raw_value = payload[start:end].decode("utf-8")
+                        return payload[:start] + b"null" + payload[end:], raw_value
+            return None
+    return None
+
+
+def _skip_whitespace(payload: bytes, index: int) -> int:
+    while index < len(payload) and payload[index] in JSON_WHITESPACE:
+        index += 1
+    return index
+
+
 # TODO: Move this to where we do use case registration
 def extract_use_case_id(mri: str) -> UseCaseID:
     """
@@ -114,21 +165,38 @@ class IndexerBatch:
     def _extract_messages(self) -> None:
         self.skipped_offsets: Set[PartitionIdxOffset] = set()
         self.parsed_payloads_by_offset: MutableMapping[PartitionIdxOffset, ParsedMessage] = {}
+        # Raw JSON of the values of messages that were decoded without them, see
+        # `split_raw_value`. These are passed through to the output without being decoded.
+        self.raw_values_by_offset: MutableMapping[PartitionIdxOffset, str] = {}
+
+        # Options are read once per batch rather than once per message.
+        disabled_namespaces = options.get("sentry-metrics.indexer.disabled-namespaces")
+        validation_sample_rate = options.get("sentry-metrics.indexer.input-validation-sample-rate")
 
         for msg in self.outer_message.payload:
             assert isinstance(msg.value, BrokerValue)
             partition_offset = PartitionIdxOffset(msg.value.partition.index, msg.value.offset)
 
-            if namespace := self._extract_namespace(msg.payload.headers) in options.get(
-                "sentry-metrics.indexer.disabled-namespaces"
-            ):
+            if namespace := self._extract_namespace(msg.payload.headers) in disabled_namespaces:
                 self.skipped_offsets.add(partition_offset)
                 metrics.incr("process_messages.namespace_disabled", tags={"namespace": namespace})
                 continue
+
+            # Messages that are validated against the schema need their value, all others are
+            # decoded without it.
+            validate = self.__input_codec is not None and (
+                validation_sample_rate >= 1.0 or random.random() < validation_sample_rate
+            )
+            payload_value = msg.payload.value
+            raw_value = None
+            if not validate and (split := split_raw_value(payload_value)) is not None:
+                payload_value, raw_value = split
+
             try:
-                parsed_payload: ParsedMessage = json.loads(
-                    msg.payload.value.decode("utf-8"), use_rapid_json=True
-                )
+                # rapidjson decodes the raw bytes directly, this avoids copying
+                # the payload into a str and opening an SDK span per message
+                # like `sentry.utils.json.loads` does.
+                parsed_payload: ParsedMessage = rapidjson.loads(payload_value)
             except rapidjson.JSONDecodeError:
                 self.skipped_offsets.add(partition_offset)
                 logger.error(
@@ -138,7 +206,8 @@ class IndexerBatch:
                 )
                 continue
             try:
-                if self.__input_codec:
+                if validate:
+                    assert self.__input_codec is not None
                     self.__input_codec.validate(parsed_payload)
             except ValidationError:
                 if settings.SENTRY_METRICS_INDEXER_RAISE_VALIDATION_ERRORS:
@@ -178,6 +247,8 @@ class IndexerBatch:
             _: IngestMetric = parsed_payload
 
             self.parsed_payloads_by_offset[partition_offset] = parsed_payload
+            if raw_value is not None:
+                self.raw_values_by_offset[partition_offset] = raw_value
 
     @metrics.wraps("process_messages.filter_messages")
     def filter_messages(self, keys_to_remove: Sequence[PartitionIdxOffset]) -> None:
@@ -299,6 +370,10 @@ class IndexerBatch:
             if partition_offset in self.skipped_offsets:
                 continue
             old_payload_value = self.parsed_payloads_by_offset.pop(partition_offset)
+            value: Any = old_payload_value["value"]
+            if (raw_value := self.raw_values_by_offset.pop(partition_offset, None)) is not None:
+                # The value was never decoded and is written to the output as is.
+                value = rapidjson.RawJSON(raw_value)
 
             metric_name = old_payload_value["name"]
             org_id = old_payload_value["org_id"]
@@ -429,7 +504,7 @@ class IndexerBatch:
                     "timestamp": old_payload_value["timestamp"],
                     "project_id": old_payload_value["project_id"],
                     "type": old_payload_value["type"],
-                    "value": old_payload_value["value"],
+                    "value": value,
                     "sentry_received_timestamp": sentry_received_timestamp,
                 }
 
@@ -449,7 +524,7 @@ class IndexerBatch:
                     "timestamp": old_payload_value["timestamp"],
                     "project_id": old_payload_value["project_id"],
                     "type": old_payload_value["type"],
-                    "value": old_payload_value["value"],
+                    "value": value,
                     "sentry_received_timestamp": sentry_received_timestamp,
                 }
                 if aggregation_option := get_aggregation_option(old_payload_value["name"]):
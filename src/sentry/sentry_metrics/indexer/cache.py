@@ -2,13 +2,27 @@ from __future__ import annotations
 
 import logging
 import random
-from typing import Collection, Iterable, Mapping, MutableMapping, Optional, Sequence, Set
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import (
+    Collection,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from django.conf import settings
 from django.core.cache import caches
 
 from sentry.sentry_metrics.indexer.base import (
     FetchType,
+    FetchTypeExt,
     OrgId,
     StringIndexer,
     UseCaseKeyCollection,
@@ -26,6 +40,27 @@ logger = logging.getLogger(__name__)
 _INDEXER_CACHE_METRIC = "sentry_metrics.indexer.memcache"
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+
+
+class _RateLimited:
+    """
+    Marker stored in the local cache for strings that were rate limited by
+    the writes limiter, so that we can hand back the same metadata without
+    asking the shared cache or the DB again.
+    """
+
+    __slots__ = ("fetch_type_ext",)
+
+    def __init__(self, fetch_type_ext: Optional[FetchTypeExt]) -> None:
+        self.fetch_type_ext = fetch_type_ext
+
+
+def _randomized_ttl(cache_ttl: float) -> float:
+    # introduce jitter in the cache_ttl so that when we have large
+    # amount of new keys written into the cache, they don't expire all at once
+    jitter = random.uniform(0, 0.25) * cache_ttl
+    return cache_ttl + jitter
 
 
 class StringIndexerCache:
@@ -38,9 +73,7 @@ class StringIndexerCache:
     def randomized_ttl(self) -> int:
         # introduce jitter in the cache_ttl so that when we have large
         # amount of new keys written into the cache, they don't expire all at once
-        cache_ttl = settings.SENTRY_METRICS_INDEXER_CACHE_TTL
-        jitter = random.uniform(0, 0.25) * cache_ttl
-        return int(cache_ttl + jitter)
+        return int(_randomized_ttl(settings.SENTRY_METRICS_INDEXER_CACHE_TTL))
 
     def make_cache_key(self, key: str) -> str:
         use_case_id, org_id, string = key.split(":", 2)
@@ -99,18 +132,185 @@ class StringIndexerCache:
         self.cache.delete_many(cache_keys, version=self.version)
 
 
+class LocalStringIndexerCache:
+    """
+    A bounded, per-process LRU that sits in front of the `StringIndexerCache`.
+
+    Keys are formatted like "use_case_id:org_id:string", same as the ones
+    passed to `StringIndexerCache`. Entries expire after a jittered TTL so
+    that a batch of first-seen strings does not expire all at once.
+
+    Strings that were dropped by the writes limiter can be stored as negative
+    entries with a (much shorter) TTL of their own.
+    """
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, Tuple[float, Union[int, _RateLimited]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(
+        self, keys: Iterable[str]
+    ) -> Tuple[Mapping[str, int], Mapping[str, Optional[FetchTypeExt]]]:
+        """
+        Returns a tuple of `(hits, rate_limited)` where `hits` maps keys to
+        their ids and `rate_limited` maps keys that were negatively cached to
+        the `FetchTypeExt` they were rate limited with. Keys that are in
+        neither mapping are misses.
+        """
+        hits: MutableMapping[str, int] = {}
+        rate_limited: MutableMapping[str, Optional[FetchTypeExt]] = {}
+        now = time.monotonic()
+
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+
+                expires_at, value = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    continue
+
+                self._entries.move_to_end(key)
+                if isinstance(value, _RateLimited):
+                    rate_limited[key] = value.fetch_type_ext
+                else:
+                    hits[key] = value
+
+        return hits, rate_limited
+
+    def set_many(self, key_values: Mapping[str, int]) -> None:
+        self._set_many(key_values, self.ttl)
+
+    def set_rate_limited_many(self, keys: Mapping[str, Optional[FetchTypeExt]]) -> None:
+        self._set_many(
+            {key: _RateLimited(fetch_type_ext) for key, fetch_type_ext in keys.items()},
+            self.negative_ttl,
+        )
+
+    def _set_many(self, key_values: Mapping[str, Union[int, _RateLimited]], ttl: float) -> None:
+        if self.max_size <= 0 or not key_values:
+            return
+
+        expires_at = time.monotonic() + _randomized_ttl(ttl)
+        with self._lock:
+            for key, value in key_values.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _use_case_key_collection_from_strings(keys: Iterable[str]) -> UseCaseKeyCollection:
+    mapping: MutableMapping[UseCaseID, MutableMapping[OrgId, Set[str]]] = defaultdict(
+        lambda: defaultdict(set)
+    )
+    for key in keys:
+        use_case_id, org_id, string = key.split(":", 2)
+        mapping[UseCaseID(use_case_id)][int(org_id)].add(string)
+
+    return UseCaseKeyCollection(mapping)
+
+
 class CachingIndexer(StringIndexer):
-    def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
+    def __init__(
+        self,
+        cache: StringIndexerCache,
+        indexer: StringIndexer,
+        local_cache: Optional[LocalStringIndexerCache] = None,
+    ) -> None:
         self.cache = cache
         self.indexer = indexer
+        self.local_cache = local_cache
+
+    def _local_get_many(
+        self, cache_key_strs: Sequence[str], cache_key_results: UseCaseKeyResults
+    ) -> Tuple[Sequence[str], bool]:
+        """
+        Looks up keys in the local tier and adds whatever was found to
+        `cache_key_results`. Returns the keys that still need to be looked up
+        in the shared cache, and whether any rate-limited keys were found.
+        """
+        if self.local_cache is None:
+            return cache_key_strs, False
+
+        local_hits, local_rate_limited = self.local_cache.get_many(cache_key_strs)
+
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "true"},
+            amount=len(local_hits),
+        )
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "rate_limited"},
+            amount=len(local_rate_limited),
+        )
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "false"},
+            amount=len(cache_key_strs) - len(local_hits) - len(local_rate_limited),
+        )
+
+        cache_key_results.add_use_case_key_results(
+            [UseCaseKeyResult.from_string(k, v) for k, v in local_hits.items()],
+            FetchType.CACHE_HIT,
+        )
+        for key, fetch_type_ext in local_rate_limited.items():
+            cache_key_results.add_use_case_key_result(
+                UseCaseKeyResult.from_string(key, None),  # type: ignore[arg-type]
+                FetchType.RATE_LIMITED,
+                fetch_type_ext,
+            )
+
+        remaining = [
+            k for k in cache_key_strs if k not in local_hits and k not in local_rate_limited
+        ]
+        return remaining, bool(local_rate_limited)
+
+    def _local_set_results(self, results: UseCaseKeyResults) -> None:
+        if self.local_cache is None:
+            return
+
+        self.local_cache.set_many(results.get_mapped_strings_to_ints())
+
+        rate_limited: MutableMapping[str, Optional[FetchTypeExt]] = {}
+        for use_case_id, org_meta in results.get_fetch_metadata().items():
+            for org_id, string_meta in org_meta.items():
+                for string, meta in string_meta.items():
+                    if meta.fetch_type is FetchType.RATE_LIMITED:
+                        rate_limited[f"{use_case_id.value}:{org_id}:{string}"] = meta.fetch_type_ext
+
+        self.local_cache.set_rate_limited_many(rate_limited)
 
     def bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, Set[str]]]
     ) -> UseCaseKeyResults:
         cache_keys = UseCaseKeyCollection(strings)
         metrics.gauge("sentry_metrics.indexer.lookups_per_batch", value=cache_keys.size)
-        cache_key_strs = cache_keys.as_strings()
-        cache_results = self.cache.get_many(cache_key_strs)
+        cache_key_results = UseCaseKeyResults()
+
+        cache_key_strs, has_rate_limited = self._local_get_many(
+            cache_keys.as_strings(), cache_key_results
+        )
+        cache_results = self.cache.get_many(cache_key_strs) if cache_key_strs else {}
 
         hits = [k for k, v in cache_results.items() if v is not None]
 
@@ -132,13 +332,22 @@ class CachingIndexer(StringIndexer):
             amount=cache_keys.size,
         )
 
-        cache_key_results = UseCaseKeyResults()
+        remote_hits = {k: v for k, v in cache_results.items() if v is not None}
         cache_key_results.add_use_case_key_results(
-            [UseCaseKeyResult.from_string(k, v) for k, v in cache_results.items() if v is not None],
+            [UseCaseKeyResult.from_string(k, v) for k, v in remote_hits.items()],
             FetchType.CACHE_HIT,
         )
-
-        db_record_keys = cache_key_results.get_unmapped_use_case_keys(cache_keys)
+        if self.local_cache is not None:
+            self.local_cache.set_many(remote_hits)
+
+        if has_rate_limited:
+            # negatively cached keys have no id, so they would show up as
+            # unmapped here. Only go to the DB for actual misses.
+            db_record_keys = _use_case_key_collection_from_strings(
+                k for k, v in cache_results.items() if v is None
+            )
+        else:
+            db_record_keys = cache_key_results.get_unmapped_use_case_keys(cache_keys)
 
         if db_record_keys.size == 0:
             return cache_key_results
@@ -151,6 +360,7 @@ class CachingIndexer(StringIndexer):
         )
 
         self.cache.set_many(db_record_key_results.get_mapped_strings_to_ints())
+        self._local_set_results(db_record_key_results)
 
         return cache_key_results.merge(db_record_key_results)
 
@@ -1,13 +1,15 @@
 from functools import reduce
 from operator import or_
 from time import sleep
-from typing import Any, Collection, Dict, Mapping, Optional, Sequence, Set
+from typing import Any, Collection, Dict, Mapping, Optional, Sequence, Set, Tuple
 
 import sentry_sdk
 from django.conf import settings
+from django.db import connections, router
 from django.db.models import Q
 from psycopg2 import OperationalError
 from psycopg2.errorcodes import DEADLOCK_DETECTED
+from psycopg2.extras import execute_values
 
 from sentry.sentry_metrics.configuration import IndexerStorage, UseCaseKey, get_ingest_config
 from sentry.sentry_metrics.indexer.base import (
@@ -20,7 +22,11 @@ from sentry.sentry_metrics.indexer.base import (
     metric_path_key_compatible_resolve,
     metric_path_key_compatible_rev_resolve,
 )
-from sentry.sentry_metrics.indexer.cache import CachingIndexer, StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import (
+    CachingIndexer,
+    LocalStringIndexerCache,
+    StringIndexerCache,
+)
 from sentry.sentry_metrics.indexer.limiters.writes import writes_limiter_factory
 from sentry.sentry_metrics.indexer.postgres.models import TABLE_MAPPING, BaseIndexer, IndexerTable
 from sentry.sentry_metrics.indexer.strings import StaticStringIndexer
@@ -35,6 +41,19 @@ _INDEXER_DB_METRIC = "sentry_metrics.indexer.postgres"
 
 _PARTITION_KEY = "pg"
 
+# Columns written on insert. The first two must stay `string` and `organization_id`,
+# rows are sorted on them to get a stable lock order.
+_INSERT_FIELDS = (
+    "string",
+    "organization_id",
+    "date_added",
+    "last_seen",
+    "retention_days",
+    "use_case_id",
+)
+# Columns read back from the insert, after `id`.
+_RETURNING_FIELDS = ("organization_id", "string", "use_case_id")
+
 indexer_cache = StringIndexerCache(
     **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key=_PARTITION_KEY
 )
@@ -76,28 +95,45 @@ class PGStringIndexerV2(StringIndexer):
             reduce(or_, conditions)
         )
 
-    def _bulk_create_with_retry(
+    def _bulk_insert_with_retry(
         self, table: IndexerTable, new_records: Sequence[BaseIndexer]
-    ) -> None:
+    ) -> Sequence[Tuple[Any, ...]]:
         """
+        Inserts `new_records` in a single `INSERT ... ON CONFLICT DO NOTHING RETURNING`
+        statement and returns the rows that were actually written by us. Rows
+        that conflicted (written concurrently by another consumer) are not
+        returned and need to be read back separately.
+
         With multiple instances of the Postgres indexer running, we found that
         rather than direct insert conflicts we were actually observing deadlocks
-        on insert. Here we surround bulk_create with a catch for the deadlock error
+        on insert. Here we surround the insert with a catch for the deadlock error
         specifically so that we don't interrupt processing or raise an error for a
-        fairly normal event.
+        fairly normal event. Records are inserted in a stable order so that
+        concurrent consumers take the unique index locks in the same order.
         """
         retry_count = 0
         sleep_ms = 5
         last_seen_exception: Optional[BaseException] = None
 
+        table_fields = {field.name for field in table._meta.get_fields()}
+        columns = [field for field in _INSERT_FIELDS if field in table_fields]
+        returning = ["id", *(field for field in _RETURNING_FIELDS if field in table_fields)]
+        query = "INSERT INTO {} ({}) VALUES %s ON CONFLICT DO NOTHING RETURNING {}".format(
+            table._meta.db_table, ", ".join(columns), ", ".join(returning)
+        )
+        rows = sorted(
+            (tuple(getattr(record, field) for field in columns) for record in new_records),
+            key=lambda row: (row[1], row[0]),
+        )
+
         with metrics.timer("sentry_metrics.indexer.pg_bulk_create"):
-            # We use `ignore_conflicts=True` here to avoid race conditions where metric indexer
-            # records might have be created between when we queried in `bulk_record` and the
-            # attempt to create the rows down below.
             while retry_count + 1 < settings.SENTRY_POSTGRES_INDEXER_RETRY_COUNT:
                 try:
-                    table.objects.bulk_create(new_records, ignore_conflicts=True)
-                    return
+                    with connections[router.db_for_write(table)].cursor() as cursor:
+                        inserted: Sequence[Tuple[Any, ...]] = execute_values(
+                            cursor, query, rows, page_size=len(rows), fetch=True
+                        )
+                    return inserted
                 except OperationalError as e:
                     sentry_sdk.capture_message(
                         f"retryable deadlock exception encountered; pgcode={e.pgcode}, pgerror={e.pgerror}"
@@ -109,7 +145,7 @@ class PGStringIndexerV2(StringIndexer):
                         last_seen_exception = e
                     else:
                         raise e
-            # If we haven't returned after successful bulk create, we should re-raise the last
+            # If we haven't returned after successful insert, we should re-raise the last
             # seen exception
             assert isinstance(last_seen_exception, BaseException)
             raise last_seen_exception
@@ -211,7 +247,7 @@ class PGStringIndexerV2(StringIndexer):
                     for _, organization_id, string in accepted_keys.as_tuples()
                 ]
 
-            self._bulk_create_with_retry(table, new_records)
+            inserted_rows = self._bulk_insert_with_retry(table, new_records)
 
         db_write_key_results = UseCaseKeyResults()
         db_write_key_results.add_use_case_key_results(
@@ -220,17 +256,39 @@ class PGStringIndexerV2(StringIndexer):
                     use_case_id=(
                         UseCaseID.SESSIONS
                         if metric_path_key is UseCaseKey.RELEASE_HEALTH
-                        else UseCaseID(db_obj.use_case_id)
+                        else UseCaseID(row[3])
                     ),
-                    org_id=db_obj.organization_id,
-                    string=db_obj.string,
-                    id=db_obj.id,
+                    org_id=row[1],
+                    string=row[2],
+                    id=row[0],
                 )
-                for db_obj in self._get_db_records(accepted_keys)
+                for row in inserted_rows
             ],
             fetch_type=FetchType.FIRST_SEEN,
         )
 
+        # Only strings that another consumer inserted concurrently need to be
+        # read back, everything else came back from the insert itself.
+        conflicting_keys = db_write_key_results.get_unmapped_use_case_keys(accepted_keys)
+        metrics.incr("sentry_metrics.indexer.pg_insert_conflicts", amount=conflicting_keys.size)
+        if conflicting_keys.size > 0:
+            db_write_key_results.add_use_case_key_results(
+                [
+                    UseCaseKeyResult(
+                        use_case_id=(
+                            UseCaseID.SESSIONS
+                            if metric_path_key is UseCaseKey.RELEASE_HEALTH
+                            else UseCaseID(db_obj.use_case_id)
+                        ),
+                        org_id=db_obj.organization_id,
+                        string=db_obj.string,
+                        id=db_obj.id,
+                    )
+                    for db_obj in self._get_db_records(conflicting_keys)
+                ],
+                fetch_type=FetchType.FIRST_SEEN,
+            )
+
         return db_read_key_results.merge(db_write_key_results).merge(rate_limited_key_results)
 
     def bulk_record(
@@ -323,4 +381,14 @@ class PGStringIndexerV2(StringIndexer):
 
 class PostgresIndexer(StaticStringIndexer):
     def __init__(self) -> None:
-        super().__init__(CachingIndexer(indexer_cache, PGStringIndexerV2()))
+        super().__init__(
+            CachingIndexer(
+                indexer_cache,
+                PGStringIndexerV2(),
+                local_cache=LocalStringIndexerCache(
+                    max_size=settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE,
+                    ttl=settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_TTL,
+                    negative_ttl=settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_NEGATIVE_TTL,
+                ),
+            )
+        )
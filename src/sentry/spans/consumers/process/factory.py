@@ -1,24 +1,26 @@
 from __future__ import annotations
 
+import logging
 import random
 import uuid
 from datetime import datetime
-from functools import lru_cache
-from typing import Any, Mapping, MutableMapping, Tuple
+from typing import Any, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 import msgpack
 import sentry_sdk
 from arroyo.backends.kafka import KafkaPayload, KafkaProducer, build_kafka_configuration
-from arroyo.dlq import InvalidMessage
-from arroyo.processing.strategies import CommitOffsets, Produce
+from arroyo.processing.strategies import CommitOffsets, MessageRejected, Produce
 from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
-from arroyo.types import BrokerValue, Commit, Message, Partition, Topic
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
+from arroyo.types import Commit, FilteredPayload, Message, Partition, Topic, Value
+from cachetools.func import ttl_cache
 from django.conf import settings
 
 from sentry import quotas
-from sentry.models import Organization, Project
+from sentry.models import Project
 from sentry.spans.grouping.api import load_span_grouping_config
 from sentry.spans.grouping.strategy.base import Span
+from sentry.spans.grouping.strategy.config import SpanGroupingConfig
 from sentry.utils import json, metrics
 from sentry.utils.arroyo import RunTaskWithMultiprocessing
 from sentry.utils.kafka_config import get_kafka_producer_cluster_options, get_topic_definition
@@ -40,9 +42,14 @@ TAG_MAPPING = {
 SPAN_SCHEMA_VERSION = 1
 DEFAULT_SPAN_RETENTION_DAYS = 90
 
+# How long the organization and retention of a project are cached for in each consumer process.
+ORGANIZATION_CACHE_TTL = 10 * 60
 
-@lru_cache(maxsize=10000)
-def get_organization(project_id: int) -> Tuple[Organization, int]:
+logger = logging.getLogger(__name__)
+
+
+@ttl_cache(maxsize=10000, ttl=ORGANIZATION_CACHE_TTL)
+def get_organization(project_id: int) -> Tuple[int, int]:
     project = Project.objects.get_from_cache(id=project_id)
     organization = project.organization
     retention_days = (
@@ -54,10 +61,14 @@ def get_organization(project_id: int) -> Tuple[Organization, int]:
     return organization.id, retention_days
 
 
-def _build_snuba_span(relay_span: Mapping[str, Any]) -> MutableMapping[str, Any]:
-    organization_id, retention_days = get_organization(
-        relay_span["project_id"],
-    )
+def _build_snuba_span(
+    relay_span: Mapping[str, Any],
+    organization: Optional[Tuple[int, int]] = None,
+    grouping_config: Optional[SpanGroupingConfig] = None,
+) -> MutableMapping[str, Any]:
+    if organization is None:
+        organization = get_organization(relay_span["project_id"])
+    organization_id, retention_days = organization
     span_data: Mapping[str, Any] = relay_span.get("data", {})
 
     snuba_span: MutableMapping[str, Any] = {}
@@ -120,7 +131,8 @@ def _build_snuba_span(relay_span: Mapping[str, Any]) -> MutableMapping[str, Any]
 
     snuba_span["sentry_tags"] = sentry_tags
 
-    grouping_config = load_span_grouping_config()
+    if grouping_config is None:
+        grouping_config = load_span_grouping_config()
 
     if snuba_span["is_segment"]:
         group_raw = grouping_config.strategy.get_transaction_span_group(
@@ -162,28 +174,114 @@ def _format_event_id(payload: Mapping[str, Any]) -> str:
     return ""
 
 
-def _process_message(message: Message[KafkaPayload]) -> KafkaPayload:
-    payload = msgpack.unpackb(message.payload.value)
+def _decode_relay_span(value: bytes) -> MutableMapping[str, Any]:
+    payload = msgpack.unpackb(value)
     relay_span = payload["span"]
     relay_span["project_id"] = payload["project_id"]
     relay_span["event_id"] = _format_event_id(payload)
-    snuba_span = _build_snuba_span(relay_span)
-    snuba_payload = json.dumps(snuba_span).encode("utf-8")
-    return KafkaPayload(key=None, value=snuba_payload, headers=[])
+    return relay_span
 
 
-def process_message(message: Message[KafkaPayload]) -> KafkaPayload:
-    try:
-        return _process_message(message)
-    except Exception as e:
-        metrics.incr("spans.consumer.message_processing_error")
-        if random.random() < 0.05:
-            sentry_sdk.capture_exception(e)
-        assert isinstance(message.value, BrokerValue)
-        raise InvalidMessage(
-            message.value.partition,
-            message.value.offset,
-        )
+def process_batch(message: Message[ValuesBatch[KafkaPayload]]) -> List[KafkaPayload]:
+    """
+    Build the Snuba payloads of a batch of spans.
+
+    Spans are grouped per project so the organization and retention of every project in the
+    batch are resolved once. Spans which fail to process are dropped from the batch.
+    """
+    spans_by_project: MutableMapping[int, List[MutableMapping[str, Any]]] = {}
+    for value in message.payload:
+        try:
+            relay_span = _decode_relay_span(value.payload.value)
+        except Exception as e:
+            _handle_processing_error(e)
+            continue
+        spans_by_project.setdefault(relay_span["project_id"], []).append(relay_span)
+
+    grouping_config = load_span_grouping_config()
+    snuba_spans = []
+    for project_id, relay_spans in spans_by_project.items():
+        try:
+            organization = get_organization(project_id)
+        except Exception as e:
+            for _ in relay_spans:
+                _handle_processing_error(e)
+            continue
+
+        for relay_span in relay_spans:
+            try:
+                snuba_spans.append(_build_snuba_span(relay_span, organization, grouping_config))
+            except Exception as e:
+                _handle_processing_error(e)
+
+    metrics.incr("spans.consumer.batch.projects", amount=len(spans_by_project))
+    return [
+        KafkaPayload(key=None, value=json.dumps(snuba_span).encode("utf-8"), headers=[])
+        for snuba_span in snuba_spans
+    ]
+
+
+def _handle_processing_error(e: Exception) -> None:
+    metrics.incr("spans.consumer.message_processing_error")
+    if random.random() < 0.05:
+        sentry_sdk.capture_exception(e)
+
+
+class Unbatcher(ProcessingStrategy[Union[FilteredPayload, List[KafkaPayload]]]):
+    """
+    Submits the payloads built from a batch one at a time. Only the last one carries the offsets
+    of the batch, so they are committed once every payload of the batch has been produced.
+
+    If the next step rejects a payload, the batch is resubmitted by the previous step later on and
+    submission resumes from the rejected payload, so payloads are never produced twice.
+    """
+
+    def __init__(self, next_step: ProcessingStrategy[Union[FilteredPayload, KafkaPayload]]) -> None:
+        self.__next_step = next_step
+        # The offsets of the batch that was only partially submitted, and the index of the first
+        # payload of it that still has to be submitted.
+        self.__pending: Optional[Tuple[Mapping[Partition, int], int]] = None
+        self.__closed = False
+
+    def poll(self) -> None:
+        self.__next_step.poll()
+
+    def submit(self, message: Message[Union[FilteredPayload, List[KafkaPayload]]]) -> None:
+        assert not self.__closed
+
+        payloads = message.payload
+        if isinstance(payloads, FilteredPayload) or not payloads:
+            self.__next_step.submit(Message(Value(FilteredPayload(), message.committable)))
+            return
+
+        start = 0
+        if self.__pending is not None:
+            committable, index = self.__pending
+            if committable == message.committable:
+                start = index
+            self.__pending = None
+
+        last = len(payloads) - 1
+        for i in range(start, len(payloads)):
+            committable = message.committable if i == last else {}
+            try:
+                self.__next_step.submit(Message(Value(payloads[i], committable)))
+            except MessageRejected:
+                self.__pending = (message.committable, i)
+                raise
+
+    def close(self) -> None:
+        self.__closed = True
+
+    def terminate(self) -> None:
+        self.__closed = True
+
+        logger.debug("Terminating %r...", self.__next_step)
+        self.__next_step.terminate()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self.__next_step.close()
+        self.__next_step.join(timeout)
 
 
 class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
@@ -226,14 +324,21 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
             next_step=CommitOffsets(commit),
             max_buffer_size=100000,
         )
-        return RunTaskWithMultiprocessing(
+        # Spans are batched before being handed to the worker processes, so each process
+        # builds a whole batch of spans at once. Every batch is dispatched on its own.
+        process_step = RunTaskWithMultiprocessing(
             num_processes=self.__num_processes,
-            max_batch_size=self.__max_batch_size,
+            max_batch_size=1,
             max_batch_time=self.__max_batch_time,
             input_block_size=self.__input_block_size,
             output_block_size=self.__output_block_size,
-            function=process_message,
-            next_step=next_step,
+            function=process_batch,
+            next_step=Unbatcher(next_step=next_step),
+        )
+        return BatchStep(
+            max_batch_size=self.__max_batch_size,
+            max_batch_time=self.__max_batch_time,
+            next_step=process_step,
         )
 
     def shutdown(self) -> None:
@@ -1,8 +1,11 @@
 import re
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional, Sequence, TypedDict, Union
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypedDict, Union
 from urllib.parse import urlparse
 
+from cachetools import LRUCache
+
 from sentry.spans.grouping.utils import Hash, parse_fingerprint_var
 
 
@@ -27,6 +30,14 @@ class Span(TypedDict):
 # return a list of strings that will serve as the span fingerprint.
 CallableStrategy = Callable[[Span], Optional[Sequence[str]]]
 
+# The number of span groups each strategy remembers. Transactions tend to repeat the same handful
+# of queries and requests, so most spans hit the cache instead of running the strategies again.
+SPAN_GROUP_CACHE_SIZE = 10000
+
+# Strategies only look at the op and description of a span, so together with the fingerprint
+# they determine its group.
+SpanGroupKey = Tuple[Optional[str], Optional[str], Optional[Tuple[str, ...]]]
+
 
 @dataclass(frozen=True)
 class SpanGroupingStrategy:
@@ -34,9 +45,19 @@ class SpanGroupingStrategy:
     # The strategies to use with the default fingerprint
     strategies: Sequence[CallableStrategy]
 
+    _cache: "LRUCache[SpanGroupKey, str]" = field(
+        default_factory=lambda: LRUCache(maxsize=SPAN_GROUP_CACHE_SIZE),
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _cache_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
     def execute(self, event_data: Any) -> Dict[str, str]:
         spans = event_data.get("spans", [])
-        span_groups = {span["span_id"]: self.get_span_group(span) for span in spans}
+        span_groups = dict(zip((span["span_id"] for span in spans), self.get_span_groups(spans)))
 
         # make sure to get the group id for the transaction root span
         span_id = event_data["contexts"]["trace"]["span_id"]
@@ -49,7 +70,32 @@ class SpanGroupingStrategy:
         result.update(event_data["transaction"])
         return result.hexdigest()
 
+    def get_span_groups(self, spans: Sequence[Span]) -> List[str]:
+        """Get the groups of many spans at once. Spans sharing an op, description and
+        fingerprint are only grouped once."""
+        groups: Dict[SpanGroupKey, str] = {}
+        result = []
+        for span in spans:
+            key = _get_span_group_key(span)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = self._get_cached_span_group(key, span)
+            result.append(group)
+        return result
+
     def get_span_group(self, span: Span) -> str:
+        return self._get_cached_span_group(_get_span_group_key(span), span)
+
+    def _get_cached_span_group(self, key: SpanGroupKey, span: Span) -> str:
+        with self._cache_lock:
+            group = self._cache.get(key)
+        if group is None:
+            group = self._calculate_span_group(span)
+            with self._cache_lock:
+                self._cache[key] = group
+        return group
+
+    def _calculate_span_group(self, span: Span) -> str:
         fingerprints = span.get("fingerprint") or ["{{ default }}"]
 
         result = Hash()
@@ -84,6 +130,15 @@ class SpanGroupingStrategy:
         return span_group
 
 
+def _get_span_group_key(span: Span) -> SpanGroupKey:
+    fingerprint = span.get("fingerprint")
+    return (
+        span.get("op"),
+        span.get("description"),
+        tuple(fingerprint) if fingerprint else None,
+    )
+
+
 def span_op(op_name: Union[str, Sequence[str]]) -> Callable[[CallableStrategy], CallableStrategy]:
     permitted_ops = [op_name] if isinstance(op_name, str) else op_name
 
@@ -2,9 +2,10 @@ import logging
 import time
 from typing import List, Optional
 
+from sentry import options
 from sentry.digests import Record, get_option_key
 from sentry.digests.backends.base import InvalidState
-from sentry.digests.notifications import build_digest, split_key
+from sentry.digests.notifications import build_digest, split_key, truncate_records
 from sentry.models import Project, ProjectOption
 from sentry.silo import SiloMode
 from sentry.tasks.base import instrumented_task
@@ -61,7 +62,13 @@ def deliver_digest(key, schedule_timestamp=None, notification_uuid: Optional[str
     with snuba.options_override({"consistent": True}):
         try:
             with digests.digest(key, minimum_delay=minimum_delay) as records:
-                digest, logs = build_digest(project, records)
+                truncated = truncate_records(
+                    records, options.get("digests.max-records-per-group")
+                )
+                records = truncated.records
+                digest, logs = build_digest(
+                    project, records, start=truncated.start, end=truncated.end
+                )
 
                 if not notification_uuid:
                     notification_uuid = get_notification_uuid_from_records(records)
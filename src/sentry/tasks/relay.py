@@ -6,6 +6,7 @@ from django.db import router, transaction
 
 from sentry.models.organization import Organization
 from sentry.relay import projectconfig_cache, projectconfig_debounce_cache
+from sentry.relay.utils import get_config_hash
 from sentry.silo import SiloMode
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
@@ -124,38 +125,13 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
         for organization in Organization.objects.filter(id=organization_id):
-            for project in Project.objects.filter(organization_id=organization_id):
+            projects = list(Project.objects.filter(organization_id=organization_id))
+            for project in projects:
                 project.set_cached_field_value("organization", organization)
-                for key in ProjectKey.objects.filter(project_id=project.id):
-                    key.set_cached_field_value("project", project)
-                    # If we find the config in the cache it means it was active.  As such we want to
-                    # recalculate it.  If the config was not there at all, we leave it and avoid the
-                    # cost of re-computation.
-                    if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
-                    else:
-                        action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "organization"},
-                    )
+            configs.update(compute_cached_projects_configs(projects, scope="organization"))
     elif project_id:
-        for project in Project.objects.filter(id=project_id):
-            for key in ProjectKey.objects.filter(project_id=project_id):
-                key.set_cached_field_value("project", project)
-                # If we find the config in the cache it means it was active.  As such we want to
-                # recalculate it.  If the config was not there at all, we leave it and avoid the
-                # cost of re-computation.
-                if projectconfig_cache.backend.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
-                    action = "recompute"
-                else:
-                    action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "project"},
-                    )
+        projects = list(Project.objects.filter(id=project_id))
+        configs.update(compute_cached_projects_configs(projects, scope="project"))
     elif public_key:
         try:
             key = ProjectKey.objects.get(public_key=public_key)
@@ -178,9 +154,81 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
-def compute_projectkey_config(key):
+def compute_cached_projects_configs(projects, scope):
+    """Re-computes the configs of all keys of the given projects which are currently cached.
+
+    The keys of all projects, the content hashes of their cached configs and the options of
+    the projects that need a config are each fetched with a single query or round trip,
+    rather than once per project and key.  Feature flags and dynamic sampling rules are
+    resolved once per organization.  Keys whose config is not in the cache are skipped
+    to avoid the cost of computing configs nobody asked for.
+
+    :returns: A dict mapping the public keys of re-computed configs to their config.  Configs
+       whose content did not change are left out, so that the cache is not rewritten and
+       Relay keeps the previous revision.
+    """
+    from sentry.dynamic_sampling import generate_rules_many
+    from sentry.models import ProjectKey, ProjectOption
+    from sentry.relay.config import get_feature_flags_many
+
+    projects_by_id = {project.id: project for project in projects}
+    if not projects_by_id:
+        return {}
+
+    keys = list(ProjectKey.objects.filter(project_id__in=projects_by_id.keys()))
+    stored_hashes = projectconfig_cache.backend.get_hashes_many([key.public_key for key in keys])
+
+    metrics.incr(
+        "relay.projectconfig_cache.invalidation.recompute",
+        amount=len(keys) - len(stored_hashes),
+        tags={"action": "not-cached", "scope": scope},
+    )
+
+    keys = [key for key in keys if key.public_key in stored_hashes]
+    cached_projects = [projects_by_id[project_id] for project_id in {k.project_id for k in keys}]
+    ProjectOption.objects.prefetch_all_values([project.id for project in cached_projects])
+
+    feature_flags = get_feature_flags_many(cached_projects)
+    dynamic_sampling_rules = generate_rules_many(
+        [
+            project
+            for project in cached_projects
+            if feature_flags[project.id].get("organizations:dynamic-sampling")
+        ]
+    )
+
+    configs = {}
+    for key in keys:
+        # If we find the config in the cache it means it was active.  As such we want to
+        # recalculate it.
+        key.set_cached_field_value("project", projects_by_id[key.project_id])
+        config = compute_projectkey_config(
+            key,
+            feature_flags=feature_flags[key.project_id],
+            dynamic_sampling_rules=dynamic_sampling_rules.get(key.project_id),
+        )
+        if get_config_hash(config) == stored_hashes[key.public_key]:
+            metrics.incr(
+                "relay.projectconfig_cache.invalidation.recompute",
+                tags={"action": "unchanged", "scope": scope},
+            )
+            continue
+
+        configs[key.public_key] = config
+        metrics.incr(
+            "relay.projectconfig_cache.invalidation.recompute",
+            tags={"action": "recompute", "scope": scope},
+        )
+
+    return configs
+
+
+def compute_projectkey_config(key, feature_flags=None, dynamic_sampling_rules=None):
     """Computes a single config for the given :class:`ProjectKey`.
 
+    :param feature_flags: Pre-fetched feature flags of the key's project, see
+       :func:`sentry.relay.config.get_feature_flags_many`.
+    :param dynamic_sampling_rules: Pre-computed dynamic sampling rules of the key's project.
     :returns: A dict with the project config.
     """
     from sentry.models import ProjectKeyStatus
@@ -189,7 +237,13 @@ def compute_projectkey_config(key):
     if key.status != ProjectKeyStatus.ACTIVE:
         return {"disabled": True}
     else:
-        return get_project_config(key.project, project_keys=[key], full_config=True).to_dict()
+        return get_project_config(
+            key.project,
+            project_keys=[key],
+            full_config=True,
+            feature_flags=feature_flags,
+            dynamic_sampling_rules=dynamic_sampling_rules,
+        ).to_dict()
 
 
 @instrumented_task(
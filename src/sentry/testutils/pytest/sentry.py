@@ -148,6 +148,8 @@ def pytest_configure(config: pytest.Config) -> None:
     settings.CELERY_COMPLAIN_ABOUT_BAD_USE_OF_PICKLE = True
     settings.CELERY_EAGER_PROPAGATES_EXCEPTIONS = True
     settings.SENTRY_METRICS_DISALLOW_BAD_TAGS = True
+    # The in-process indexer cache outlives the per-test DB and cache resets.
+    settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE = 0
 
     settings.DEBUG_VIEWS = True
     settings.SERVE_UPLOADED_FILES = True
@@ -138,6 +138,14 @@ def loads(value: str | bytes, use_rapid_json: bool = False, **kwargs: NoReturn)
             return _default_decoder.decode(value)
 
 
+def raw_decode(value: str, idx: int = 0) -> tuple[JSONData, int]:
+    """Decode the JSON value starting at `idx`, returning it along with the index it ends at.
+
+    Unlike `loads`, trailing data after the value is permitted.
+    """
+    return _default_decoder.raw_decode(value, idx)
+
+
 def dumps_htmlsafe(value: object) -> SafeString:
     return mark_safe(_default_escaped_encoder.encode(value))
 
@@ -179,4 +187,5 @@ __all__ = (
     "load",
     "loads",
     "prune_empty_keys",
+    "raw_decode",
 )
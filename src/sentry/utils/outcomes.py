@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import atexit
+import os
+import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime
 from enum import IntEnum
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional
 
+from celery.signals import worker_process_shutdown
 from django.conf import settings
 
 from sentry.constants import DataCategory
@@ -108,6 +113,66 @@ def track_outcome(
     # are used for spike protection and quota enforcement.
     topic_name = settings.KAFKA_OUTCOMES_BILLING if use_billing else settings.KAFKA_OUTCOMES
 
+    # Billing outcomes are used for spike protection and quota enforcement and are never held back
+    # in the aggregator.
+    if settings.SENTRY_OUTCOMES_AGGREGATION_WINDOW > 0 and not use_billing:
+        _aggregator.add(
+            _OutcomeKey(
+                publisher=publisher,
+                topic_name=topic_name,
+                # Outcomes are stored with minute precision at best, aggregating
+                # within the minute does not lose any resolution.
+                timestamp=timestamp.replace(second=0, microsecond=0),
+                org_id=org_id,
+                project_id=project_id,
+                key_id=key_id,
+                outcome=outcome,
+                reason=reason,
+                category=category,
+            ),
+            event_id,
+            quantity,
+        )
+    else:
+        _publish(
+            publisher,
+            topic_name,
+            timestamp=timestamp,
+            org_id=org_id,
+            project_id=project_id,
+            key_id=key_id,
+            outcome=outcome,
+            reason=reason,
+            event_id=event_id,
+            category=category,
+            quantity=quantity,
+        )
+
+    metrics.incr(
+        "events.outcomes",
+        skip_internal=True,
+        tags={
+            "outcome": outcome.name.lower(),
+            "reason": reason,
+            "category": category.api_name() if category is not None else "null",
+            "topic": topic_name,
+        },
+    )
+
+
+def _publish(
+    publisher: KafkaPublisher,
+    topic_name: str,
+    timestamp: datetime,
+    org_id: int,
+    project_id: int,
+    key_id: Optional[int],
+    outcome: Outcome,
+    reason: Optional[str],
+    event_id: Optional[str],
+    category: Optional[DataCategory],
+    quantity: int,
+) -> None:
     # Send a snuba metrics payload.
     publisher.publish(
         topic_name,
@@ -126,13 +191,122 @@ def track_outcome(
         ),
     )
 
-    metrics.incr(
-        "events.outcomes",
-        skip_internal=True,
-        tags={
-            "outcome": outcome.name.lower(),
-            "reason": reason,
-            "category": category.api_name() if category is not None else "null",
-            "topic": topic_name,
-        },
-    )
+
+class _OutcomeKey(NamedTuple):
+    publisher: KafkaPublisher
+    topic_name: str
+    timestamp: datetime
+    org_id: int
+    project_id: int
+    key_id: Optional[int]
+    outcome: Outcome
+    reason: Optional[str]
+    category: Optional[DataCategory]
+
+
+@dataclass
+class _AggregatedOutcome:
+    quantity: int
+    #: The event id is only kept as long as the outcome stands for a single event.
+    event_id: Optional[str]
+
+
+class OutcomeAggregator:
+    """
+    Merges identical outcomes into one message with the summed quantity.
+
+    Outcomes are held for at most ``SENTRY_OUTCOMES_AGGREGATION_WINDOW``
+    seconds, and are produced early once more than
+    ``SENTRY_OUTCOMES_AGGREGATION_MAX_SIZE`` distinct outcomes are held, or
+    when the process, Celery worker process or consumer shuts down.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        # Called again in forked children, which inherit the parent's outcomes and timer
+        # object but not the timer thread.
+        self._lock = threading.Lock()
+        self._outcomes: Dict[_OutcomeKey, _AggregatedOutcome] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, key: _OutcomeKey, event_id: Optional[str], quantity: int) -> None:
+        with self._lock:
+            aggregated = self._outcomes.get(key)
+            if aggregated is None:
+                self._outcomes[key] = _AggregatedOutcome(quantity=quantity, event_id=event_id)
+            else:
+                aggregated.quantity += quantity
+                aggregated.event_id = None
+
+            if self._timer is None:
+                self._timer = threading.Timer(
+                    settings.SENTRY_OUTCOMES_AGGREGATION_WINDOW, self.flush
+                )
+                self._timer.daemon = True
+                self._timer.start()
+
+            if len(self._outcomes) < settings.SENTRY_OUTCOMES_AGGREGATION_MAX_SIZE:
+                return
+
+            outcomes = self._take()
+
+        # Only enqueue the outcomes here, waiting for their delivery would block the caller.
+        # The producer delivers them in the background and the shutdown hooks wait for them.
+        self._publish(outcomes)
+
+    def flush(self) -> None:
+        with self._lock:
+            outcomes = self._take()
+
+        publishers = self._publish(outcomes)
+
+        # Publishing only enqueues the messages, make sure they are delivered before the
+        # process is allowed to go away.
+        for publisher in publishers:
+            publisher.flush()
+
+    def _take(self) -> Dict[_OutcomeKey, _AggregatedOutcome]:
+        # Must be called with the lock held.
+        outcomes, self._outcomes = self._outcomes, {}
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return outcomes
+
+    def _publish(self, outcomes: Dict[_OutcomeKey, _AggregatedOutcome]) -> List[KafkaPublisher]:
+        publishers: Dict[int, KafkaPublisher] = {}
+        for key, aggregated in outcomes.items():
+            publishers[id(key.publisher)] = key.publisher
+            _publish(
+                key.publisher,
+                key.topic_name,
+                timestamp=key.timestamp,
+                org_id=key.org_id,
+                project_id=key.project_id,
+                key_id=key.key_id,
+                outcome=key.outcome,
+                reason=key.reason,
+                event_id=aggregated.event_id,
+                category=key.category,
+                quantity=aggregated.quantity,
+            )
+
+        return list(publishers.values())
+
+
+_aggregator = OutcomeAggregator()
+atexit.register(_aggregator.flush)
+os.register_at_fork(after_in_child=_aggregator._reset)
+
+
+def flush_outcomes() -> None:
+    """Produce all outcomes that are currently being aggregated."""
+    _aggregator.flush()
+
+
+@worker_process_shutdown.connect(weak=False)
+def _flush_outcomes_on_worker_shutdown(**kwargs: object) -> None:
+    # Celery prefork children exit through `os._exit`, which skips `atexit` handlers.
+    flush_outcomes()
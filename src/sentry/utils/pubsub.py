@@ -12,3 +12,6 @@ class KafkaPublisher:
             self.producer.poll(0)
         else:
             self.producer.flush()
+
+    def flush(self):
+        self.producer.flush()
@@ -1,6 +1,8 @@
 import copy
 
-from sentry.attachments.base import BaseAttachmentCache, CachedAttachment
+import pytest
+
+from sentry.attachments.base import BaseAttachmentCache, CachedAttachment, MissingAttachmentChunks
 
 
 class InMemoryCache:
@@ -110,3 +112,45 @@ def test_basic_rate_limited():
     assert att2.id == att.id == 0
     assert att2.data == att.data == b"Hello World! Bye."
     assert att2.rate_limited is True
+
+
+def test_open_chunked():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    cache.set_chunk("c:foo", 123, 0, b"Hello World! ")
+    cache.set_chunk("c:foo", 123, 1, b"")
+    cache.set_chunk("c:foo", 123, 2, b"Bye.")
+
+    att = CachedAttachment(key="c:foo", id=123, name="lol.txt", content_type="text/plain", chunks=3)
+    cache.set("c:foo", [att])
+
+    (att2,) = cache.get("c:foo")
+    with att2.open() as fp:
+        assert fp.read(5) == b"Hello"
+        assert fp.read(10) == b" World! By"
+        assert fp.read() == b"e."
+        assert fp.read() == b""
+
+
+def test_open_chunked_missing_chunks():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    cache.set_chunk("c:foo", 123, 0, b"Hello World! ")
+
+    att = CachedAttachment(key="c:foo", id=123, name="lol.txt", content_type="text/plain", chunks=2)
+    cache.set("c:foo", [att])
+
+    (att2,) = cache.get("c:foo")
+    with att2.open() as fp:
+        assert fp.read(5) == b"Hello"
+        with pytest.raises(MissingAttachmentChunks):
+            fp.read()
+
+
+def test_open_unchunked():
+    att = CachedAttachment(key="c:foo", id=123, name="lol.txt", data=b"Hello World!")
+
+    with att.open() as fp:
+        assert fp.read() == b"Hello World!"
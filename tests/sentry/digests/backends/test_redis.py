@@ -1,4 +1,5 @@
 import time
+from unittest import mock
 
 import pytest
 
@@ -46,8 +47,8 @@ class RedisBackendTestCase(TestCase):
         for record in records:
             backend.add("timeline", record)
 
-        with backend.digest("timeline", 0) as records:
-            assert set(records) == set(records[-2:])
+        with backend.digest("timeline", 0) as digest_records:
+            assert set(digest_records) == set(records[-2:])
 
     def test_maintenance_failure_recovery(self):
         backend = RedisBackend()
@@ -151,3 +152,51 @@ class RedisBackendTestCase(TestCase):
 
         with backend.digest("timeline", 0) as records:
             assert len(set(records)) == n
+
+    def test_chunked_digest(self):
+        backend = RedisBackend(chunk_size=3)
+
+        t = time.time()
+        records = [Record(f"record:{i}", f"{i}", t + i) for i in range(10)]
+        for record in records:
+            backend.add("timeline", record)
+        backend._get_connection("timeline").delete("d:t:timeline:r:record:4")
+
+        with backend.digest("timeline", 0) as digest_records:
+            # records are fetched lazily, newest first
+            assert not isinstance(digest_records, list)
+            assert list(digest_records) == [r for r in reversed(records) if r.key != "record:4"]
+
+        # All records, including the missing one, should have been removed
+        # from the digest when it was closed.
+        with backend.digest("timeline", 0) as digest_records:
+            assert list(digest_records) == []
+        assert backend._get_connection("timeline").keys("d:t:timeline:r:*") == []
+
+    @mock.patch("sentry.digests.backends.redis.metrics")
+    def test_schedule_reports_partition_lag(self, mock_metrics):
+        backend = RedisBackend()
+
+        t = time.time()
+        backend.add("timeline", Record("record:1", "value", t), timestamp=t)
+        with backend.digest("timeline", 0, timestamp=t):
+            pass
+
+        entries = list(backend.schedule(t + 10, timestamp=t + 10))
+        assert [entry.key for entry in entries] == ["timeline"]
+
+        mock_metrics.gauge.assert_called_once_with(
+            "digests.schedule.ready", 1, tags={"partition": "0"}
+        )
+        ((name, lag), kwargs) = mock_metrics.timing.call_args
+        assert name == "digests.schedule.lag"
+        assert lag == pytest.approx(10)
+
+    def test_schedule_partition_failure(self):
+        backend = RedisBackend()
+        backend.add("timeline", Record("record:1", "value", time.time()))
+
+        with mock.patch.object(
+            backend, "_RedisBackend__schedule_partition", side_effect=Exception("boom")
+        ):
+            assert list(backend.schedule(time.time())) == []
@@ -3,7 +3,8 @@ from __future__ import annotations
 import uuid
 from collections import defaultdict
 from functools import cached_property, reduce
-from typing import Mapping, MutableMapping, MutableSequence
+from types import SimpleNamespace
+from typing import Mapping, MutableMapping, MutableSequence, Sequence
 
 from sentry.digests import Record
 from sentry.digests.notifications import (
@@ -14,6 +15,7 @@ from sentry.digests.notifications import (
     sort_group_contents,
     sort_rule_groups,
     split_key,
+    truncate_records,
     unsplit_key,
 )
 from sentry.models import Rule
@@ -200,3 +202,48 @@ class UnsplitKeyTestCase(TestCase):
             unsplit_key(self.project, ActionTargetType.ISSUE_OWNERS, identifier, fallthrough_choice)
             == f"mail:p:{self.project.id}:{ActionTargetType.ISSUE_OWNERS.value}:{identifier}:{fallthrough_choice.value}"
         )
+
+
+class TruncateRecordsTestCase(TestCase):
+    def make_record(
+        self, key: str, group_id: int, timestamp: float, rules: Sequence[int] = (1,)
+    ) -> Record:
+        event = SimpleNamespace(group_id=group_id)
+        return Record(key, Notification(event, list(rules)), timestamp)
+
+    def test_keeps_everything_without_limit(self):
+        records = [self.make_record(f"record:{i}", 1, 10 - i) for i in range(5)]
+        assert truncate_records(iter(records), 0) == (records, None, None)
+
+    def test_keeps_most_recent_per_group(self):
+        # records are ordered newest first, like the backend returns them
+        records = [
+            self.make_record("a:1", 1, 10),
+            self.make_record("b:1", 2, 9),
+            self.make_record("a:2", 1, 8),
+            self.make_record("a:3", 1, 7),
+            self.make_record("b:2", 2, 6),
+            self.make_record("b:3", 2, 5),
+        ]
+        truncated = truncate_records(iter(records), 2)
+        assert [record.key for record in truncated.records] == ["a:1", "b:1", "a:2", "b:2"]
+        # the time range still covers the dropped records
+        assert truncated.start == records[-1].datetime
+        assert truncated.end == records[0].datetime
+
+    def test_keeps_most_recent_per_rule_and_group(self):
+        records = [
+            self.make_record("a:1", 1, 10, rules=[1]),
+            self.make_record("a:2", 1, 9, rules=[1]),
+            self.make_record("a:3", 1, 8, rules=[1, 2]),
+            self.make_record("a:4", 1, 7, rules=[2]),
+            self.make_record("a:5", 1, 6, rules=[1, 2]),
+            self.make_record("a:6", 1, 5, rules=[]),
+        ]
+        truncated = truncate_records(iter(records), 2)
+        # rule 1 keeps a:1 and a:2, rule 2 keeps a:3 and a:4
+        assert [record.key for record in truncated.records] == ["a:1", "a:2", "a:3", "a:4"]
+        assert truncated.start == records[-1].datetime
+
+    def test_empty(self):
+        assert truncate_records(iter([]), 2) == ([], None, None)
@@ -2,6 +2,7 @@ from sentry.dynamic_sampling.models.common import RebalancedItem
 from sentry.dynamic_sampling.tasks.helpers.boost_low_volume_transactions import (
     get_transactions_resampling_rates,
     set_transactions_resampling_rates,
+    set_transactions_resampling_rates_many,
 )
 
 
@@ -93,3 +94,23 @@ def test_resampling_rates_missing():
 
     assert actual_trans_rates == {}
     assert actual_global_rate == expected_global_rate
+
+
+def test_resampling_rates_many():
+    """
+    Tests that the rates of many projects of an organization are stored together
+    """
+    org_id = 1
+    rates = [
+        (10, [RebalancedItem(id="t1", count=1, new_sample_rate=0.6)], 0.3),
+        (20, [RebalancedItem(id="t2", count=1, new_sample_rate=0.7)], 0.4),
+    ]
+
+    set_transactions_resampling_rates_many(org_id=org_id, rates=rates, ttl_ms=100 * 1000)
+
+    for proj_id, named_rates, default_rate in rates:
+        actual_trans_rates, actual_global_rate = get_transactions_resampling_rates(
+            org_id=org_id, proj_id=proj_id, default_rate=1.0
+        )
+        assert actual_trans_rates == {elm.id: elm.new_sample_rate for elm in named_rates}
+        assert actual_global_rate == default_rate
@@ -1,5 +1,7 @@
 from datetime import timedelta
+from unittest import mock
 
+import pytest
 from django.utils import timezone
 from freezegun import freeze_time
 
@@ -9,13 +11,14 @@ from sentry.dynamic_sampling.tasks.boost_low_volume_transactions import (
     ProjectIdentity,
     ProjectTransactions,
     ProjectTransactionsTotals,
+    fetch_concurrently,
     is_project_identity_before,
     is_same_project,
     merge_transactions,
     next_totals,
     transactions_zip,
 )
-from sentry.dynamic_sampling.tasks.common import GetActiveOrgs
+from sentry.dynamic_sampling.tasks.common import GetActiveOrgs, TimeoutException
 from sentry.snuba.metrics.naming_layer.mri import TransactionMRI
 from sentry.testutils.cases import BaseMetricsLayerTestCase, SnubaTestCase, TestCase
 
@@ -280,6 +283,29 @@ def test_transactions_zip():
     assert actual == expected
 
 
+def test_fetch_concurrently():
+    p1: ProjectIdentity = {"project_id": 1, "org_id": 1}
+    p2: ProjectIdentity = {"project_id": 2, "org_id": 1}
+    p3: ProjectIdentity = {"project_id": 1, "org_id": 2}
+
+    def failing(*items, exception):
+        yield from items
+        raise exception
+
+    assert fetch_concurrently(iter([p1, p2]), iter([]), iter([p3])) == ([[p1, p2], [], [p3]], None)
+
+    # projects from the last one yielded by the timed out iterator on are incomplete
+    timeout = TimeoutException(mock.Mock())
+    assert fetch_concurrently(iter([p1, p2, p3]), failing(p1, p3, exception=timeout)) == (
+        [[p1, p2], [p1]],
+        timeout,
+    )
+    assert fetch_concurrently(iter([p1, p2, p3]), failing(exception=timeout)) == ([[], []], timeout)
+
+    with pytest.raises(ValueError):
+        fetch_concurrently(iter([p1]), failing(p1, exception=ValueError("boom")))
+
+
 def test_same_project():
     p1: ProjectIdentity = {"project_id": 1, "org_id": 2}
     p1bis: ProjectIdentity = {"project_id": 1, "org_id": 2}
@@ -8,7 +8,12 @@ from sentry_relay.processing import validate_project_config
 
 from sentry.constants import HEALTH_CHECK_GLOBS
 from sentry.discover.models import TeamKeyTransaction
-from sentry.dynamic_sampling import ENVIRONMENT_GLOBS, generate_rules, get_redis_client_for_ds
+from sentry.dynamic_sampling import (
+    ENVIRONMENT_GLOBS,
+    generate_rules,
+    generate_rules_many,
+    get_redis_client_for_ds,
+)
 from sentry.dynamic_sampling.rules.base import NEW_MODEL_THRESHOLD_IN_MINUTES
 from sentry.dynamic_sampling.rules.utils import (
     LATEST_RELEASES_BOOST_DECAYED_FACTOR,
@@ -689,3 +694,23 @@ def test_generate_rules_return_boost_replay_id(get_blended_sample_rate, default_
     ]
 
     _validate_rules(default_old_project)
+
+
+@django_db_all
+@patch("sentry.dynamic_sampling.rules.base.quotas.get_blended_sample_rate")
+def test_generate_rules_many(get_blended_sample_rate, default_old_project):
+    get_blended_sample_rate.return_value = 0.5
+    other_project = _apply_old_date_to_project_and_org(
+        Factories.create_project(organization=default_old_project.organization)
+    )
+
+    rules = generate_rules_many([default_old_project, other_project])
+
+    # The blended sample rate is fetched once for the whole organization.
+    get_blended_sample_rate.assert_called_once_with(
+        organization_id=default_old_project.organization.id
+    )
+    assert rules == {
+        default_old_project.id: generate_rules(default_old_project),
+        other_project.id: generate_rules(other_project),
+    }
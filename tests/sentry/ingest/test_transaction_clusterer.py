@@ -6,6 +6,7 @@ from freezegun import freeze_time
 from sentry.ingest.transaction_clusterer import ClustererNamespace
 from sentry.ingest.transaction_clusterer.base import ReplacementRule
 from sentry.ingest.transaction_clusterer.datasource.redis import (
+    SampleBuffer,
     _get_projects_key,
     _get_redis_key,
     _record_sample,
@@ -13,6 +14,7 @@ from sentry.ingest.transaction_clusterer.datasource.redis import (
     get_active_projects,
     get_redis_client,
     get_transaction_names,
+    get_tree_state,
     record_transaction_name,
 )
 from sentry.ingest.transaction_clusterer.meta import get_clusterer_meta
@@ -62,6 +64,27 @@ def test_single_leaf():
     assert clusterer.get_rules() == ["/a/*/**"]
 
 
+def test_incremental_state():
+    clusterer = TreeClusterer(merge_threshold=3)
+    clusterer.add_input(["/a/b1/c", "/a/b2/c", "/a/b3/c", "/x/y"])
+    assert clusterer.get_rules() == ["/a/*/**"]
+    state = clusterer.dump_state()
+
+    # Without new input, nothing changed and no rules are extracted again
+    assert TreeClusterer(merge_threshold=3, state=state).get_rules() == []
+
+    # New input below a merged node goes into the merged node
+    clusterer = TreeClusterer(merge_threshold=3, state=state)
+    clusterer.add_input(["/a/b4/d/e1", "/a/b5/d/e2", "/a/b6/d/e3"])
+    assert clusterer.get_rules() == ["/a/*/d/*/**", "/a/*/**"]
+    assert clusterer.tree_size() == 8
+
+    # Only the changed subtree produces rules
+    clusterer = TreeClusterer(merge_threshold=3, state=clusterer.dump_state())
+    clusterer.add_input(["/x/z", "/x/w"])
+    assert clusterer.get_rules() == ["/x/*/**"]
+
+
 @mock.patch("sentry.ingest.transaction_clusterer.datasource.redis.MAX_SET_SIZE", 5)
 def test_collection():
     org = Organization(pk=666)
@@ -173,6 +196,72 @@ def test_record_transactions(mocked_record, default_organization, source, txname
     assert len(mocked_record.mock_calls) == expected
 
 
+@django_db_all
+def test_record_transactions_buffered(default_organization):
+    project = Project(id=111, name="project", organization_id=default_organization.id)
+    client = get_redis_client()
+
+    def _record(name):
+        record_transaction_name(
+            project, {"transaction": name, "transaction_info": {"source": "url"}}
+        )
+
+    with override_options(
+        {"txnames.sample-buffer.flush-size": 3, "txnames.sample-buffer.flush-interval": 60}
+    ):
+        _record("/a/1")
+        _record("/a/1")
+        _record("/a/2")
+        # Duplicates are not counted towards the flush size
+        assert set(get_transaction_names(project)) == set()
+
+        _record("/a/3")
+
+    assert set(get_transaction_names(project)) == {"/a/1", "/a/2", "/a/3"}
+    assert client.smembers(_get_projects_key(ClustererNamespace.TRANSACTIONS)) == {"111"}
+
+
+@django_db_all
+def test_record_transactions_buffering_disabled(default_organization):
+    project = Project(id=111, name="project", organization_id=default_organization.id)
+
+    def _record(name):
+        record_transaction_name(
+            project, {"transaction": name, "transaction_info": {"source": "url"}}
+        )
+
+    with override_options(
+        {"txnames.sample-buffer.flush-size": 3, "txnames.sample-buffer.flush-interval": 60}
+    ):
+        _record("/a/1")
+        assert set(get_transaction_names(project)) == set()
+
+    # Switching buffering off writes out the samples that are still buffered
+    _record("/a/2")
+    assert set(get_transaction_names(project)) == {"/a/1", "/a/2"}
+
+
+@mock.patch(
+    "sentry.ingest.transaction_clusterer.datasource.redis.MAX_BUFFERED_SAMPLES_PER_PROJECT", 3
+)
+def test_sample_buffer_reservoir():
+    project1 = Project(id=101, name="p1", organization=Organization(pk=66))
+    project2 = Project(id=102, name="p2", organization=Organization(pk=66))
+    buffer = SampleBuffer(ClustererNamespace.TRANSACTIONS)
+
+    for i in range(10):
+        buffer.add(project1, f"/a/{i}", flush_size=100, flush_interval=60)
+    buffer.add(project2, "/b", flush_size=100, flush_interval=60)
+    assert set(get_transaction_names(project1)) == set()
+
+    buffer.flush()
+
+    names = set(get_transaction_names(project1))
+    assert len(names) == 3
+    assert names <= {f"/a/{i}" for i in range(10)}
+    assert set(get_transaction_names(project2)) == {"/b"}
+
+
 def test_sort_rules():
     rules = {
         ReplacementRule("/a/*/**"): 1,
@@ -345,6 +434,33 @@ def test_clusterer_only_runs_when_enough_transactions(mock_update_rules, default
     )
 
 
+@mock.patch("sentry.ingest.transaction_clusterer.tasks.MERGE_THRESHOLD", 2)
+@mock.patch("sentry.ingest.transaction_clusterer.rules.update_rules")
+@django_db_all
+def test_clusterer_incremental(mock_update_rules, default_project):
+    project = default_project
+
+    with override_options({"txnames.clusterer.incremental": True}):
+        _record_sample(ClustererNamespace.TRANSACTIONS, project, "/transaction/number/1")
+        cluster_projects([project])
+        assert mock_update_rules.call_args == mock.call(
+            ClustererNamespace.TRANSACTIONS, project, []
+        )
+        assert get_tree_state(ClustererNamespace.TRANSACTIONS, project) is not None
+
+        # The sample of the previous run is still part of the tree
+        _record_sample(ClustererNamespace.TRANSACTIONS, project, "/transaction/number/2")
+        cluster_projects([project])
+        assert mock_update_rules.call_args == mock.call(
+            ClustererNamespace.TRANSACTIONS, project, ["/transaction/number/*/**"]
+        )
+
+        with mock.patch("sentry.ingest.transaction_clusterer.tasks.MAX_TREE_SIZE", 1):
+            _record_sample(ClustererNamespace.TRANSACTIONS, project, "/transaction/number/3")
+            cluster_projects([project])
+        assert get_tree_state(ClustererNamespace.TRANSACTIONS, project) is None
+
+
 @django_db_all
 def test_get_deleted_project():
     deleted_project = Project(pk=666, organization=Organization(pk=666))
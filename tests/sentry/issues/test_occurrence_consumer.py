@@ -4,6 +4,7 @@ import uuid
 from copy import deepcopy
 from datetime import timezone
 from typing import Any, Dict, Optional, Sequence, Type
+from unittest import mock
 
 import pytest
 from jsonschema import ValidationError
@@ -16,6 +17,7 @@ from sentry.issues.occurrence_consumer import (
     EventLookupError,
     InvalidEventPayloadError,
     _get_kwargs,
+    _process_batch,
     _process_message,
 )
 from sentry.models import Group
@@ -181,6 +183,81 @@ class IssueOccurrenceLookupEventIdTest(IssueOccurrenceTestBase):
         assert fetched_event.get_event_type() == "transaction"
 
 
+class IssueOccurrenceProcessBatchTest(IssueOccurrenceTestBase):
+    @django_db_all
+    def test_process_batch(self) -> None:
+        messages = [
+            get_test_message(self.project.id),
+            get_test_message(self.project.id, type=300),
+            get_test_message(self.project.id),
+            get_test_message(self.project.id, include_event=False),
+        ]
+        with self.feature("organizations:profile-file-io-main-thread-ingest"):
+            results = _process_batch(messages)
+
+        # the invalid occurrence and the one referencing a missing event are skipped
+        assert len(results) == 2
+        (first, first_group_info), (second, second_group_info) = results
+        assert first.event_id == messages[0]["event_id"]
+        assert second.event_id == messages[2]["event_id"]
+
+        # both occurrences share a fingerprint, the second one must reuse the group created
+        # by the first one in the same batch
+        assert first_group_info is not None and first_group_info.is_new
+        assert second_group_info is not None and not second_group_info.is_new
+        assert first_group_info.group.id == second_group_info.group.id
+        assert Group.objects.filter(grouphash__hash=first.fingerprint[0]).count() == 1
+
+    @django_db_all
+    def test_process_batch_lookup_events(self) -> None:
+        from sentry.event_manager import EventManager
+
+        event_data = load_data("transaction")
+        event_data["timestamp"] = iso_format(before_now(minutes=1))
+        event_data["start_timestamp"] = iso_format(before_now(minutes=1, seconds=1))
+        event_data["event_id"] = "d" * 32
+
+        manager = EventManager(data=event_data)
+        manager.normalize()
+        event = manager.save(self.project.id)
+
+        messages = [
+            get_test_message(
+                self.project.id,
+                include_event=False,
+                event_id=event.event_id,
+                type=PerformanceSlowDBQueryGroupType.type_id,
+                fingerprint=[fingerprint],
+            )
+            for fingerprint in ("a", "b")
+        ]
+        with self.feature("organizations:performance-slow-db-query-ingest"):
+            results = _process_batch(messages)
+
+        assert [occurrence.event_id for occurrence, _ in results] == [event.event_id] * 2
+        assert len({group_info.group.id for _, group_info in results if group_info}) == 2
+
+    @django_db_all
+    def test_process_batch_partial_failures(self) -> None:
+        messages = [get_test_message(self.project.id), get_test_message(self.project.id)]
+        messages[0]["fingerprint"] = ["a"]
+
+        def hash_fingerprint(fingerprint):
+            if fingerprint == ["a"]:
+                raise ValueError("bad fingerprint")
+            return [fingerprint[0]]
+
+        with self.feature("organizations:profile-file-io-main-thread-ingest"), mock.patch(
+            "sentry.issues.occurrence_consumer.hash_fingerprint", side_effect=hash_fingerprint
+        ), mock.patch(
+            "sentry.issues.occurrence_consumer.lookup_events", side_effect=RuntimeError("nodestore")
+        ):
+            results = _process_batch(messages)
+
+        # only the occurrence with the bad fingerprint is dropped
+        assert [occurrence.event_id for occurrence, _ in results] == [messages[1]["event_id"]]
+
+
 class ParseEventPayloadTest(IssueOccurrenceTestBase):
     def run_test(self, message: Dict[str, Any]) -> None:
         _get_kwargs(message)
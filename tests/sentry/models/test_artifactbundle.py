@@ -1,4 +1,10 @@
-from sentry.models import ArtifactBundleFlatFileIndex
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from sentry.models import ArtifactBundle, ArtifactBundleFlatFileIndex, File
+from sentry.models.artifactbundle import ArtifactBundleArchive
 from sentry.testutils.cases import TestCase
 from sentry.testutils.silo import region_silo_test
 from sentry.utils import json
@@ -73,3 +79,49 @@ class ArtifactBundleTest(TestCase):
         flat_file_index = index.load_flat_file_index()
         assert flat_file_index is not None
         assert json.loads(flat_file_index) == updated_file_contents
+
+
+@region_silo_test(stable=True)
+class ArtifactBundleFileCacheTest(TestCase):
+    def setUp(self):
+        self.cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_path)
+
+    def test_getfile(self):
+        artifact_bundle = self.create_artifact_bundle(self.organization)
+        with artifact_bundle.file.getfile() as f:
+            contents = f.read()
+
+        with self.options({"artifactbundle.cache-path": self.cache_path}):
+            expected_path = ArtifactBundle.cache.get_path(artifact_bundle.file)
+            assert expected_path.startswith(self.cache_path)
+
+            fp = ArtifactBundle.cache.getfile(artifact_bundle)
+            assert fp.seekable()
+            with ArtifactBundleArchive(fp) as archive:
+                assert archive.get_files()
+
+            with open(expected_path, "rb") as f:
+                assert f.read() == contents
+
+            # The second lookup is served from disk
+            with patch.object(File, "save_to") as save_to:
+                fp = ArtifactBundle.cache.getfile(artifact_bundle)
+                assert fp.read() == contents
+                fp.close()
+                assert not save_to.called
+
+    def test_evict(self):
+        for i, name in enumerate(["a", "b", "c"]):
+            os.makedirs(os.path.join(self.cache_path, name))
+            path = os.path.join(self.cache_path, name, name)
+            with open(path, "wb") as f:
+                f.write(b"x" * 10)
+            os.utime(path, (1000 + i, 1000 + i))
+
+        with self.options({"artifactbundle.cache-path": self.cache_path}):
+            ArtifactBundle.cache.evict(20)
+
+        assert not os.path.exists(os.path.join(self.cache_path, "a", "a"))
+        assert os.path.exists(os.path.join(self.cache_path, "b", "b"))
+        assert os.path.exists(os.path.join(self.cache_path, "c", "c"))
@@ -1,5 +1,6 @@
 import os
 from datetime import timedelta
+from hashlib import sha1
 from io import BytesIO
 from unittest.mock import patch
 
@@ -30,6 +31,17 @@ class FileBlobTest(TestCase):
         assert my_file1.checksum == my_file2.checksum
         assert my_file1.path == my_file2.path
 
+    def test_from_files(self):
+        contents = [f"blob {i}".encode() for i in range(20)]
+
+        FileBlob.from_files([ContentFile(c) for c in contents + contents[:5]])
+
+        for content in contents:
+            blob = FileBlob.objects.get(checksum=sha1(content).hexdigest())
+            assert blob.size == len(content)
+            with blob.getfile() as f:
+                assert f.read() == content
+
     def test_generate_unique_path(self):
         path = FileBlob.generate_unique_path()
         assert path
@@ -162,6 +174,24 @@ class FileTest(TestCase):
             with pytest.raises(ValueError):
                 fp.seek(0, 666)
 
+    def test_read_ahead(self):
+        bytes = BytesIO(b"abcdefghijklmnopqrstuvwxyz")
+        file1 = File.objects.create(name="baz.js", type="default", size=26)
+        file1.putfile(bytes, 5)
+
+        with file1.getfile(read_ahead=2) as fp:
+            assert fp.read() == b"abcdefghijklmnopqrstuvwxyz"
+
+            fp.seek(3)
+            assert fp.read(9) == b"defghijkl"
+            assert fp.tell() == 12
+
+            fp.seek(-4, 2)
+            assert fp.read() == b"wxyz"
+
+            fp.seek(0)
+            assert fp.read(1) == b"a"
+
     def test_multi_chunk_prefetch(self):
         random_data = os.urandom(1 << 25)
 
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 from unittest import mock
 
 import msgpack
@@ -575,3 +575,49 @@ class MonitorConsumerTest(TestCase):
             assert MonitorCheckIn.objects.filter(guid=self.guid).exists()
             logger.exception.assert_called_with("Failed to trigger monitor tasks", exc_info=True)
             try_monitor_tasks_trigger.side_effect = None
+
+
+@mock.patch("sentry.monitors.consumers.monitor_consumer.try_monitor_tasks_trigger")
+@mock.patch("sentry.monitors.consumers.monitor_consumer._process_checkin")
+def test_parallel_mode_groups_by_monitor_environment(process_checkin, try_monitor_tasks_trigger):
+    now = datetime.now().replace(second=0, microsecond=0)
+    partition = Partition(Topic("test"), 0)
+
+    def make_message(offset: int, ts: datetime, wrapper: Dict[str, Any]) -> BrokerValue:
+        payload = KafkaPayload(b"fake-key", msgpack.packb(wrapper), [])
+        return BrokerValue(payload, partition, offset, ts)
+
+    def make_checkin(slug: str, environment: str, guid: str) -> Dict[str, Any]:
+        payload = {"monitor_slug": slug, "environment": environment, "check_in_id": guid}
+        return {"project_id": 1, "payload": json.dumps(payload), "sdk": "test/1.0"}
+
+    values = [
+        make_message(0, now, make_checkin("my-monitor", "production", "a")),
+        make_message(1, now, make_checkin("other-monitor", "production", "b")),
+        make_message(2, now + timedelta(minutes=1), {"message_type": "clock_pulse"}),
+        make_message(3, now + timedelta(minutes=1), make_checkin("My Monitor", "production", "c")),
+        make_message(4, now + timedelta(minutes=1), make_checkin("my-monitor", "staging", "d")),
+    ]
+
+    commit = mock.Mock()
+    factory = StoreMonitorCheckInStrategyFactory(mode="parallel", max_batch_size=len(values))
+    consumer = factory.create_with_partitions(commit, {partition: 0})
+    for value in values:
+        consumer.submit(Message(value))
+    consumer.poll()
+    consumer.join()
+    factory.shutdown()
+
+    # Tasks are triggered once for each minute seen in the batch
+    assert [c.args[0] for c in try_monitor_tasks_trigger.call_args_list] == [
+        now,
+        now + timedelta(minutes=1),
+    ]
+
+    # Every check-in is processed and check-ins for the same monitor
+    # environment keep their ordering
+    processed = [
+        json.loads(c.args[0]["payload"])["check_in_id"] for c in process_checkin.call_args_list
+    ]
+    assert sorted(processed) == ["a", "b", "c", "d"]
+    assert processed.index("a") < processed.index("c")
@@ -0,0 +1,31 @@
+import pytest
+
+from sentry.profiles.stacks import StackTable
+
+
+def test_stack_table_round_trip():
+    stacks = [[0, 1, 2], [], [2, 1], [3]]
+    table = StackTable.from_stacks(stacks)
+
+    assert len(table) == 4
+    assert list(table[2]) == [2, 1]
+    assert list(table[-1]) == [3]
+    assert table.to_stacks() == stacks
+
+    with pytest.raises(IndexError):
+        table[4]
+
+
+def test_stack_table_remap():
+    table = StackTable.from_stacks([[0, 1, 2], [], [2, 1, 0]])
+
+    remapped = table.remap({0: [0], 1: [3, 4], 5: [6]})
+
+    assert remapped.to_stacks() == [[0, 3, 4, 2], [], [2, 3, 4, 0]]
+    # the original table is left untouched
+    assert table.to_stacks() == [[0, 1, 2], [], [2, 1, 0]]
+
+
+@pytest.mark.parametrize("stacks", [[], [[]]])
+def test_stack_table_remap_empty(stacks):
+    assert StackTable.from_stacks(stacks).remap({0: [1]}).to_stacks() == stacks
@@ -3,12 +3,19 @@ from __future__ import annotations
 from os.path import join
 from tempfile import TemporaryFile
 from typing import Any
+from unittest import mock
 
 import pytest
 
 from sentry.lang.javascript.processing import _handles_frame as is_valid_javascript_frame
 from sentry.models import Project
-from sentry.profiles.task import _deobfuscate, _normalize, _process_symbolicator_results_for_sample
+from sentry.profiles import task
+from sentry.profiles.task import (
+    _deobfuscate,
+    _normalize,
+    _process_symbolicator_results_for_sample,
+    run_symbolicate_native,
+)
 from sentry.testutils.factories import Factories, get_fixture_path
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import json
@@ -458,3 +465,95 @@ def test_decode_signature(project, android_profile):
 
     assert frames[0]["signature"] == "()"
     assert frames[1]["signature"] == "(): boolean"
+
+
+@pytest.fixture
+def symbolicated_frames_cache():
+    task._symbolicated_frames.clear()
+    task._symbolicated_modules.clear()
+    yield
+    task._symbolicated_frames.clear()
+    task._symbolicated_modules.clear()
+
+
+def fake_symbolicate(project, profile, modules, stacktraces):
+    # every frame resolves to an inlined frame followed by the physical one
+    frames = []
+    for idx, frame in enumerate(stacktraces[0]["frames"]):
+        addr = int(frame["instruction_addr"], 16)
+        for name in ("inlined", "physical"):
+            frames.append(
+                {
+                    "instruction_addr": hex(addr),
+                    "function": f"{name}_{addr - int(modules[0]['image_addr'], 16):x}",
+                    "status": "symbolicated",
+                    "original_index": idx,
+                }
+            )
+    return [{**m, "debug_status": "found"} for m in modules], [{"frames": frames}], True
+
+
+def test_run_symbolicate_native_deduplicates_frames(symbolicated_frames_cache):
+    project = Project(id=1)
+    modules = [{"debug_id": "abc", "image_addr": "0x1000", "image_size": 4096}]
+    stacktraces = [
+        {"frames": [{"instruction_addr": "0x1010"}, {"instruction_addr": "0x1020"}]},
+        {"frames": [{"instruction_addr": "0x1010"}, {"instruction_addr": "0x1020"}]},
+        {"frames": [{"instruction_addr": "0x1020"}, {"instruction_addr": "0x1010"}]},
+    ]
+
+    with mock.patch.object(task, "run_symbolicate", side_effect=fake_symbolicate) as run:
+        _, symbolicated, success = run_symbolicate_native(project, {}, modules, stacktraces)
+
+    assert success
+    assert run.call_count == 1
+    assert run.call_args.kwargs["stacktraces"] == [
+        {
+            "frames": [
+                {"instruction_addr": "0x1010", "adjust_instruction_addr": False},
+                {"instruction_addr": "0x1020", "adjust_instruction_addr": True},
+                {"instruction_addr": "0x1020", "adjust_instruction_addr": False},
+                {"instruction_addr": "0x1010", "adjust_instruction_addr": True},
+            ]
+        }
+    ]
+    assert [[(f["function"], f["original_index"]) for f in s["frames"]] for s in symbolicated] == [
+        [("inlined_10", 0), ("physical_10", 0), ("inlined_20", 1), ("physical_20", 1)],
+        [("inlined_10", 0), ("physical_10", 0), ("inlined_20", 1), ("physical_20", 1)],
+        [("inlined_20", 0), ("physical_20", 0), ("inlined_10", 1), ("physical_10", 1)],
+    ]
+
+
+def test_run_symbolicate_native_reuses_cached_frames(symbolicated_frames_cache):
+    project = Project(id=1)
+    stacktraces = [
+        {"frames": [{"instruction_addr": "0x1010"}, {"instruction_addr": "0x1020"}]},
+    ]
+
+    with mock.patch.object(task, "run_symbolicate", side_effect=fake_symbolicate) as run:
+        run_symbolicate_native(
+            project,
+            {},
+            [{"debug_id": "abc", "image_addr": "0x1000", "image_size": 4096}],
+            stacktraces,
+        )
+
+        # the same image loaded at another address in a different process
+        modules, symbolicated, success = run_symbolicate_native(
+            project,
+            {},
+            [{"debug_id": "abc", "image_addr": "0x5000", "image_size": 4096}],
+            [{"frames": [{"instruction_addr": "0x5010"}, {"instruction_addr": "0x5030"}]}],
+        )
+
+    assert success
+    assert run.call_count == 2
+    assert run.call_args.kwargs["stacktraces"] == [
+        {"frames": [{"instruction_addr": "0x5030", "adjust_instruction_addr": True}]}
+    ]
+    assert [(f["instruction_addr"], f["function"]) for f in symbolicated[0]["frames"]] == [
+        ("0x5010", "inlined_10"),
+        ("0x5010", "physical_10"),
+        ("0x5030", "inlined_30"),
+        ("0x5030", "physical_30"),
+    ]
@@ -40,6 +40,16 @@ class QuotaTest(TestCase):
         )
         assert self.backend.get_key_quota(key) == (None, 0)
 
+    def test_get_usage_many(self):
+        quotas = [
+            QuotaConfig(id="a", limit=10, window=60, reason_code="a"),
+            QuotaConfig(limit=0, reason_code="b"),
+        ]
+        assert self.backend.get_usage_many([(1, quotas), (2, quotas[:1])]) == [
+            [None, None],
+            [None],
+        ]
+
     def test_get_key_quota_multiple_keys(self):
         # This checks for a regression where we'd cache key quotas per project
         # rather than per key.
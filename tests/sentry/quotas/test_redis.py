@@ -331,6 +331,53 @@ class RedisQuotaTest(TestCase):
         # count for these quotas and None for the others.
         assert usage == [n if q.id else None for q in quotas] + [0, 0]
 
+    def test_get_usage_many(self):
+        timestamp = time.time()
+
+        self.get_project_quota.return_value = (200, 60)
+        self.get_organization_quota.return_value = (300, 60)
+
+        other_project = self.create_project(organization=self.create_organization())
+        for project, n in ((self.project, 3), (other_project, 5)):
+            for _ in range(n):
+                self.quota.is_rate_limited(project, timestamp=timestamp)
+
+        usage = self.quota.get_usage_many(
+            [
+                (project.organization_id, self.quota.get_quotas(project))
+                for project in (self.project, other_project)
+            ],
+            timestamp=timestamp,
+        )
+
+        assert usage == [
+            [3 if q.id else None for q in self.quota.get_quotas(self.project)],
+            [5 if q.id else None for q in self.quota.get_quotas(other_project)],
+        ]
+
+    def test_get_usage_cached(self):
+        timestamp = time.time()
+        quota = RedisQuota(usage_cache_ttl=60)
+
+        self.get_project_quota.return_value = (200, 60)
+        self.get_organization_quota.return_value = (300, 60)
+        quota.is_rate_limited(self.project, timestamp=timestamp)
+
+        quotas = quota.get_quotas(self.project)
+        assert quota.get_usage(self.project.organization_id, quotas, timestamp=timestamp) == [
+            1 if q.id else None for q in quotas
+        ]
+
+        # The counters are served from the cache until it expires
+        quota.is_rate_limited(self.project, timestamp=timestamp)
+        assert quota.get_usage(self.project.organization_id, quotas, timestamp=timestamp) == [
+            1 if q.id else None for q in quotas
+        ]
+        with mock.patch("sentry.quotas.redis.monotonic", return_value=time.monotonic() + 61):
+            assert quota.get_usage(self.project.organization_id, quotas, timestamp=timestamp) == [
+                2 if q.id else None for q in quotas
+            ]
+
     @mock.patch.object(RedisQuota, "get_quotas")
     def test_refund_defaults(self, mock_get_quotas):
         timestamp = time.time()
@@ -1,7 +1,9 @@
 from time import time
+from unittest import mock
 
 from freezegun import freeze_time
 from freezegun.api import FrozenDateTimeFactory
+from redis.exceptions import RedisError
 
 from sentry.ratelimits.redis import RedisRateLimiter
 from sentry.testutils.cases import TestCase
@@ -70,3 +72,42 @@ class RedisRateLimiterTest(TestCase):
             assert not limited
             assert value == 1
             assert reset_time == expected_reset_time + 5
+
+    def test_is_limited_with_value_sets_expiration(self):
+        with freeze_time("2000-01-01 00:00:03"):
+            self.backend.is_limited_with_value("foo", 1, window=10)
+            redis_key = self.backend._construct_redis_key("foo", window=10)
+            assert 0 < self.backend.client.ttl(redis_key) <= 7
+
+    def test_is_limited_with_value_redis_error(self):
+        with freeze_time("2000-01-01"), mock.patch(
+            "sentry.ratelimits.redis.fixed_window_hit", side_effect=RedisError
+        ):
+            limited, value, reset_time = self.backend.is_limited_with_value("foo", 1, window=5)
+        assert not limited
+        assert value == 0
+
+    def test_leased_hits(self):
+        backend = RedisRateLimiter(lease_size=5)
+        with freeze_time("2000-01-01"):
+            for expected in range(1, 6):
+                limited, value, _ = backend.is_limited_with_value("foo", 100)
+                assert not limited
+                assert value == expected
+            # A single lease was taken from redis for the first five hits
+            assert backend.current_value("foo") == 5
+
+            assert backend.is_limited_with_value("foo", 100)[1] == 6
+            assert backend.current_value("foo") == 10
+
+    def test_leased_hits_limited(self):
+        backend = RedisRateLimiter(lease_size=5)
+        with freeze_time("2000-01-01"):
+            results = [backend.is_limited("foo", 50) for _ in range(60)]
+        assert results == [False] * 50 + [True] * 10
+
+    def test_small_limits_are_not_leased(self):
+        backend = RedisRateLimiter(lease_size=5)
+        with freeze_time("2000-01-01"):
+            backend.is_limited("foo", 10)
+            assert backend.current_value("foo") == 1
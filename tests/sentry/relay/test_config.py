@@ -7,6 +7,7 @@ import pytest
 from freezegun import freeze_time
 from sentry_relay.processing import validate_project_config
 
+from sentry import features
 from sentry.constants import HEALTH_CHECK_GLOBS, ObjectStatus
 from sentry.discover.models import TeamKeyTransaction
 from sentry.dynamic_sampling import (
@@ -20,7 +21,12 @@ from sentry.dynamic_sampling.rules.base import NEW_MODEL_THRESHOLD_IN_MINUTES
 from sentry.models import ProjectKey
 from sentry.models.projectteam import ProjectTeam
 from sentry.models.transaction_threshold import TransactionMetric
-from sentry.relay.config import ProjectConfig, get_project_config
+from sentry.relay.config import (
+    CONFIG_FEATURES,
+    ProjectConfig,
+    get_feature_flags_many,
+    get_project_config,
+)
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.factories import Factories
 from sentry.testutils.helpers import Feature
@@ -218,6 +224,22 @@ def test_project_config_exposed_features(default_project):
     assert cfg_features == ["organizations:profiling"]
 
 
+@django_db_all
+@region_silo_test(stable=True)
+def test_project_config_prefetched_feature_flags(default_project):
+    with Feature({"organizations:profiling": True, "projects:custom-inbound-filters": True}):
+        feature_flags = get_feature_flags_many([default_project])[default_project.id]
+        assert feature_flags["organizations:profiling"] is True
+        assert feature_flags["projects:custom-inbound-filters"] is True
+
+        with mock.patch("sentry.features.has", wraps=features.has) as has:
+            cfg = get_project_config(default_project, feature_flags=feature_flags).to_dict()
+
+    # None of the prefetched features are checked again.
+    assert not {call.args[0] for call in has.call_args_list} & set(CONFIG_FEATURES)
+    assert "organizations:profiling" in get_path(cfg, "config", "features")
+
+
 @django_db_all
 @region_silo_test(stable=True)
 @mock.patch("sentry.relay.config.EXPOSABLE_FEATURES", ["badprefix:custom-inbound-filters"])
@@ -1,6 +1,7 @@
 from unittest import mock
 
 from sentry.relay.projectconfig_cache import redis
+from sentry.relay.utils import get_config_hash
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import metrics
 
@@ -24,3 +25,42 @@ def test_read_write():
     my_key = "fake-dsn-1"
     cache.set_many({my_key: "my-value"})
     assert cache.get(my_key) == "my-value"
+
+
+@django_db_all
+def test_exists_many():
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many({"fake-dsn-1": "my-value"})
+    assert cache.exists_many(["fake-dsn-1", "fake-dsn-2"]) == {
+        "fake-dsn-1": True,
+        "fake-dsn-2": False,
+    }
+
+
+@django_db_all
+def test_get_hashes_many():
+    cache = redis.RedisProjectConfigCache()
+    config = {"config": {"a": 1}, "lastFetch": "yesterday"}
+    cache.set_many({"fake-dsn-1": config})
+    cache.cluster.set("relayconfig:fake-dsn-2", b"{}")
+
+    assert cache.get_hashes_many(["fake-dsn-1", "fake-dsn-2", "fake-dsn-3"]) == {
+        "fake-dsn-1": get_config_hash(config),
+        # cached without a hash
+        "fake-dsn-2": None,
+    }
+
+    cache.delete_many(["fake-dsn-1"])
+    assert cache.get_hashes_many(["fake-dsn-1"]) == {}
+
+
+def test_config_hash_ignores_volatile_keys():
+    config = {"rev": "a", "lastFetch": "x", "projectId": 1, "config": {"a": 1, "b": [1, 2]}}
+    assert get_config_hash(config) == get_config_hash({**config, "rev": "b", "lastFetch": "y"})
+    assert get_config_hash(config) != get_config_hash({**config, "config": {"a": 2, "b": [1, 2]}})
+
+
+def test_config_hash_ignores_key_order():
+    config = {"projectId": 1, "config": {"a": 1, "b": {"c": 2, "d": 3}}}
+    reordered = {"config": {"b": {"d": 3, "c": 2}, "a": 1}, "projectId": 1}
+    assert get_config_hash(config) == get_config_hash(reordered)
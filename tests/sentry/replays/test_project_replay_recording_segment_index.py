@@ -1,10 +1,13 @@
 import datetime
+import gzip
 import uuid
 import zlib
 from collections import namedtuple
 
+import pytest
 from django.urls import reverse
 
+from sentry.replays.endpoints.project_replay_recording_segment_index import accepts_gzip
 from sentry.replays.lib.storage import FilestoreBlob, RecordingSegmentStorageMeta, StorageBlob
 from sentry.replays.testutils import mock_replay
 from sentry.testutils.cases import APITestCase, ReplaysSnubaTestCase, TransactionTestCase
@@ -14,6 +17,25 @@ from sentry.testutils.silo import region_silo_test
 Message = namedtuple("Message", ["project_id", "replay_id"])
 
 
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("", False),
+        ("gzip", True),
+        ("deflate, GZIP;q=0.5", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, deflate", False),
+        ("*", True),
+        ("*, gzip;q=0", False),
+        ("gzip;q=invalid", False),
+        ("x-gzip", True),
+        ("gzipped", False),
+    ],
+)
+def test_accepts_gzip(accept_encoding, expected):
+    assert accepts_gzip(accept_encoding) is expected
+
+
 class ProjectReplayRecordingSegmentIndexMixin:
     endpoint = "sentry-api-0-project-replay-recording-segment-index"
 
@@ -55,6 +77,50 @@ class ProjectReplayRecordingSegmentIndexMixin:
             == close_streaming_response(response)
         )
 
+    def test_index_download_compressed_passthrough(self):
+        for i in range(0, 3):
+            self.save_recording_segment(i, f'[{{"test":"hello {i}"}}]'.encode(), compressed=i != 1)
+
+        with self.feature("organizations:session-replay"), self.options(
+            {"replay.storage.compressed-download": True}
+        ):
+            response = self.client.get(
+                self.url + "?download=true", HTTP_ACCEPT_ENCODING="gzip, deflate"
+            )
+
+        assert response.status_code == 200
+        assert response.get("Content-Type") == "application/json"
+        assert response.get("Content-Encoding") == "gzip"
+        assert b'[[{"test":"hello 0"}],[{"test":"hello 1"}],[{"test":"hello 2"}]]' == (
+            gzip.decompress(close_streaming_response(response))
+        )
+
+    def test_index_download_compressed_not_accepted(self):
+        self.save_recording_segment(0, b'[{"test":"hello 0"}]')
+
+        with self.feature("organizations:session-replay"), self.options(
+            {"replay.storage.compressed-download": True}
+        ):
+            response = self.client.get(self.url + "?download=true")
+
+        assert response.status_code == 200
+        assert response.get("Content-Encoding") is None
+        assert b'[[{"test":"hello 0"}]]' == close_streaming_response(response)
+
+    def test_index_download_compressed_refused(self):
+        self.save_recording_segment(0, b'[{"test":"hello 0"}]')
+
+        with self.feature("organizations:session-replay"), self.options(
+            {"replay.storage.compressed-download": True}
+        ):
+            response = self.client.get(
+                self.url + "?download=true", HTTP_ACCEPT_ENCODING="gzip;q=0, deflate"
+            )
+
+        assert response.status_code == 200
+        assert response.get("Content-Encoding") is None
+        assert b'[[{"test":"hello 0"}]]' == close_streaming_response(response)
+
     def test_index_download_paginate(self):
         for i in range(0, 3):
             self.save_recording_segment(i, f'[{{"test":"hello {i}"}}]'.encode())
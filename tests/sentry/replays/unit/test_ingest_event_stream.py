@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+
+import pytest
+
+from sentry.replays.usecases.ingest.event_stream import RecordingSegmentEvents
+from sentry.utils import json
+
+EVENTS = [
+    {"type": 2, "data": {"node": {"id": 1, "childNodes": ["x" * 1000 for _ in range(50)]}}},
+    {"type": 5, "data": {"tag": "breadcrumb", "payload": {"category": "ui.click"}}},
+    {"type": 3, "data": {"text": "héllo wörld"}},
+    [],
+    1234,
+]
+
+
+@pytest.mark.parametrize(
+    "encode", [lambda b: b, zlib.compress, gzip.compress], ids=["raw", "zlib", "gzip"]
+)
+@pytest.mark.parametrize("read_size", [1, 7, 4096])
+def test_recording_segment_events(encode, read_size):
+    segment = json.dumps(EVENTS).encode()
+
+    events = RecordingSegmentEvents(encode(segment), read_size=read_size)
+    assert list(events) == EVENTS
+    assert events.exhausted
+    assert not events.truncated
+    assert events.decompressed_size == len(segment)
+
+
+def test_recording_segment_events_empty():
+    events = RecordingSegmentEvents(b"[ ]")
+    assert list(events) == []
+    assert events.exhausted
+
+
+def test_recording_segment_events_lazy():
+    segment = json.dumps([{"type": 3, "data": {"text": "x" * 100}}] * 1000).encode()
+
+    events = RecordingSegmentEvents(zlib.compress(segment), read_size=1024)
+    iterator = iter(events)
+    assert next(iterator) == {"type": 3, "data": {"text": "x" * 100}}
+    assert not events.exhausted
+    assert events.decompressed_size < len(segment)
+
+    # Closing the stream completes the size without decoding the remaining events.
+    assert events.close() == len(segment)
+
+
+def test_recording_segment_events_close():
+    segment = json.dumps(EVENTS).encode()
+
+    assert RecordingSegmentEvents(zlib.compress(segment)).close() == len(segment)
+    assert RecordingSegmentEvents(segment).close() == len(segment)
+    assert RecordingSegmentEvents(b"\x78\x9cgarbage").close() is None
+
+
+def test_recording_segment_events_max_event_size():
+    segment = json.dumps(EVENTS[1:] + EVENTS[:1]).encode()
+
+    events = RecordingSegmentEvents(zlib.compress(segment), read_size=1024, max_event_size=10000)
+    assert list(events) == EVENTS[1:]
+    assert events.truncated
+    assert not events.exhausted
+
+
+@pytest.mark.parametrize("segment", [b"", b"[1, 2", b"[1 2]", b"[{]", zlib.compress(b"{}")])
+def test_recording_segment_events_invalid(segment):
+    with pytest.raises(ValueError):
+        list(RecordingSegmentEvents(segment))
+
+
+def test_recording_segment_events_trailing_data():
+    segment = json.dumps(EVENTS).encode()
+
+    events = RecordingSegmentEvents(zlib.compress(segment) + b"trailing", read_size=1024)
+    assert list(events) == EVENTS
+    assert events.exhausted
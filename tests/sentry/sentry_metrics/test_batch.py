@@ -11,7 +11,11 @@ from arroyo.backends.kafka import KafkaPayload
 from arroyo.types import BrokerValue, Message, Partition, Topic, Value
 
 from sentry.sentry_metrics.aggregation_option_registry import AggregationOption
-from sentry.sentry_metrics.consumers.indexer.batch import IndexerBatch, PartitionIdxOffset
+from sentry.sentry_metrics.consumers.indexer.batch import (
+    IndexerBatch,
+    PartitionIdxOffset,
+    split_raw_value,
+)
 from sentry.sentry_metrics.consumers.indexer.tags_validator import ReleaseHealthTagsValidator
 from sentry.sentry_metrics.indexer.base import FetchType, FetchTypeExt, Metadata
 from sentry.snuba.metrics.naming_layer.mri import SessionMRI, TransactionMRI
@@ -251,6 +255,89 @@ def test_extract_strings_with_rollout(should_index_tag_values, expected):
     assert batch.extract_strings() == expected
 
 
+@pytest.mark.parametrize(
+    "sample_rate, validated",
+    [
+        pytest.param(1.0, True, id="always validated"),
+        pytest.param(0.0, False, id="never validated"),
+    ],
+)
+def test_input_validation_sample_rate(sample_rate, validated):
+    outer_message = _construct_outer_message([(counter_payload, counter_headers)])
+
+    with override_options(
+        {"sentry-metrics.indexer.input-validation-sample-rate": sample_rate}
+    ), patch.object(_INGEST_CODEC, "validate") as validate:
+        batch = IndexerBatch(
+            outer_message,
+            True,
+            False,
+            input_codec=_INGEST_CODEC,
+            tags_validator=ReleaseHealthTagsValidator().is_allowed,
+        )
+
+    assert validate.called is validated
+    assert list(batch.parsed_payloads_by_offset.values())[0]["org_id"] == 1
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        pytest.param(
+            b'{"type":"d","value":[1.5,2],"org_id":1}',
+            (b'{"type":"d","value":null,"org_id":1}', "[1.5,2]"),
+            id="array",
+        ),
+        pytest.param(
+            b'{"tags":{"value":"[x]","a\\"]":"}"},"value" : [[1], {"b": "]"}] }',
+            (b'{"tags":{"value":"[x]","a\\"]":"}"},"value" : null }', '[[1], {"b": "]"}]'),
+            id="brackets in strings and nested containers",
+        ),
+        pytest.param(b'{"name":"value","type":"c","value":1.0}', None, id="scalar"),
+        pytest.param(b'{"type":"d","value":[1,2', None, id="truncated"),
+    ],
+)
+def test_split_raw_value(payload, expected):
+    assert split_raw_value(payload) == expected
+
+
+@pytest.mark.django_db
+@patch("sentry.sentry_metrics.consumers.indexer.batch.UseCaseID", MockUseCaseID)
+def test_unvalidated_values_passed_through():
+    outer_message = _construct_outer_message(
+        [(distribution_payload, distribution_headers), (set_payload, set_headers)]
+    )
+
+    with override_options({"sentry-metrics.indexer.input-validation-sample-rate": 0.0}):
+        batch = IndexerBatch(
+            outer_message,
+            True,
+            False,
+            input_codec=_INGEST_CODEC,
+            tags_validator=ReleaseHealthTagsValidator().is_allowed,
+        )
+
+    # values are not decoded, but kept as raw JSON
+    assert all(payload["value"] is None for payload in batch.parsed_payloads_by_offset.values())
+    assert len(batch.raw_values_by_offset) == 2
+
+    strings = batch.extract_strings()
+    mapping = {
+        use_case_id: {
+            org_id: {string: i for i, string in enumerate(sorted(org_strings), 1)}
+            for org_id, org_strings in orgs.items()
+        }
+        for use_case_id, orgs in strings.items()
+    }
+    snuba_payloads = batch.reconstruct_messages(mapping, {MockUseCaseID.SESSIONS: {1: {}}})
+
+    assert [payload["value"] for payload, _ in _deconstruct_messages(snuba_payloads)] == [
+        [4, 5, 6],
+        [3],
+    ]
+    assert batch.raw_values_by_offset == {}
+
+
 @pytest.mark.django_db
 @patch("sentry.sentry_metrics.consumers.indexer.batch.UseCaseID", MockUseCaseID)
 def test_extract_strings_with_multiple_use_case_ids():
@@ -1,7 +1,15 @@
+from unittest import mock
+
 import pytest
 from django.conf import settings
 
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.base import FetchType, FetchTypeExt, Metadata
+from sentry.sentry_metrics.indexer.cache import (
+    CachingIndexer,
+    LocalStringIndexerCache,
+    StringIndexerCache,
+)
+from sentry.sentry_metrics.indexer.mock import RawSimpleIndexer
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import md5_text
@@ -81,3 +89,75 @@ def test_separate_namespacing() -> None:
     indexer_cache.set("transactions:3:what", 2)
     assert indexer_cache.get("sessions:3:what") == 1
     assert indexer_cache.get("transactions:3:what") == 2
+
+
+def test_local_cache_lru_eviction() -> None:
+    local_cache = LocalStringIndexerCache(max_size=2, ttl=60, negative_ttl=10)
+    local_cache.set_many({"sessions:1:a": 1, "sessions:1:b": 2})
+
+    # touch "a" so that "b" is the least recently used
+    assert local_cache.get_many(["sessions:1:a"]) == ({"sessions:1:a": 1}, {})
+    local_cache.set_many({"sessions:1:c": 3})
+
+    assert len(local_cache) == 2
+    hits, rate_limited = local_cache.get_many(["sessions:1:a", "sessions:1:b", "sessions:1:c"])
+    assert hits == {"sessions:1:a": 1, "sessions:1:c": 3}
+    assert rate_limited == {}
+
+
+def test_local_cache_expiry() -> None:
+    local_cache = LocalStringIndexerCache(max_size=10, ttl=60, negative_ttl=10)
+    with mock.patch("sentry.sentry_metrics.indexer.cache.time.monotonic", return_value=0):
+        local_cache.set_many({"sessions:1:a": 1})
+        local_cache.set_rate_limited_many({"sessions:1:b": FetchTypeExt(is_global=True)})
+
+    with mock.patch("sentry.sentry_metrics.indexer.cache.time.monotonic", return_value=30):
+        assert local_cache.get_many(["sessions:1:a", "sessions:1:b"]) == ({"sessions:1:a": 1}, {})
+
+    with mock.patch("sentry.sentry_metrics.indexer.cache.time.monotonic", return_value=100):
+        assert local_cache.get_many(["sessions:1:a"]) == ({}, {})
+
+    assert len(local_cache) == 0
+
+
+def test_local_cache_disabled() -> None:
+    local_cache = LocalStringIndexerCache(max_size=0, ttl=60, negative_ttl=10)
+    local_cache.set_many({"sessions:1:a": 1})
+    assert local_cache.get_many(["sessions:1:a"]) == ({}, {})
+
+
+def test_caching_indexer_local_tier(use_case_id: str) -> None:
+    cache.clear()
+    local_cache = LocalStringIndexerCache(max_size=100, ttl=60, negative_ttl=10)
+    mock_indexer = RawSimpleIndexer()
+    caching_indexer = CachingIndexer(indexer_cache, mock_indexer, local_cache=local_cache)
+
+    results = caching_indexer.bulk_record({UseCaseID.SESSIONS: {1: {"a", "b"}}})
+    assert len(local_cache) == 2
+
+    with mock.patch.object(indexer_cache, "get_many") as remote_get_many:
+        local_results = caching_indexer.bulk_record({UseCaseID.SESSIONS: {1: {"a", "b"}}})
+        remote_get_many.assert_not_called()
+
+    assert local_results[UseCaseID.SESSIONS][1] == results[UseCaseID.SESSIONS][1]
+    assert {
+        meta.fetch_type
+        for meta in local_results.get_fetch_metadata()[UseCaseID.SESSIONS][1].values()
+    } == {FetchType.CACHE_HIT}
+
+
+def test_caching_indexer_negative_cache(use_case_id: str) -> None:
+    cache.clear()
+    local_cache = LocalStringIndexerCache(max_size=100, ttl=60, negative_ttl=10)
+    local_cache.set_rate_limited_many({"sessions:1:a": FetchTypeExt(is_global=False)})
+    mock_indexer = RawSimpleIndexer()
+    caching_indexer = CachingIndexer(indexer_cache, mock_indexer, local_cache=local_cache)
+
+    with mock.patch.object(mock_indexer, "bulk_record", wraps=mock_indexer.bulk_record) as record:
+        results = caching_indexer.bulk_record({UseCaseID.SESSIONS: {1: {"a", "b"}}})
+        record.assert_called_once_with({UseCaseID.SESSIONS: {1: {"b"}}})
+
+    assert results[UseCaseID.SESSIONS][1]["a"] is None
+    assert results.get_fetch_metadata()[UseCaseID.SESSIONS][1]["a"] == Metadata(
+        id=None, fetch_type=FetchType.RATE_LIMITED, fetch_type_ext=FetchTypeExt(is_global=False)
+    )
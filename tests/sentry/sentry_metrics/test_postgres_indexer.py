@@ -1,4 +1,5 @@
 from typing import Mapping, Set
+from unittest import mock
 
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.indexer.base import FetchType, Metadata, UseCaseKeyCollection
@@ -41,3 +42,40 @@ class PostgresIndexerV2Test(TestCase):
         )
 
         assert indexer_cache.get(key) is None
+
+    def test_bulk_record_reads_back_conflicts_only(self):
+        """
+        Strings inserted concurrently by another consumer are skipped by the
+        insert and read back from the DB.
+        """
+        pg_indexer = PGStringIndexerV2()
+        existing = pg_indexer.record(self.use_case_id, self.org2.id, "hello")
+        assert existing is not None
+
+        get_db_records = pg_indexer._get_db_records
+
+        def stale_first_read(keys: UseCaseKeyCollection):
+            # the initial read misses "hello" as if it was not written yet
+            if stale_read.call_count == 1:
+                return []
+            return get_db_records(keys)
+
+        with mock.patch.object(
+            pg_indexer, "_get_db_records", side_effect=stale_first_read
+        ) as stale_read, mock.patch.object(
+            pg_indexer, "_bulk_insert_with_retry", wraps=pg_indexer._bulk_insert_with_retry
+        ) as bulk_insert:
+            results = pg_indexer.bulk_record({self.use_case_id: {self.org2.id: self.strings}})
+
+        assert bulk_insert.call_count == 1
+        assert stale_read.call_count == 2
+        assert stale_read.call_args_list[-1] == mock.call(
+            UseCaseKeyCollection({self.use_case_id: {self.org2.id: {"hello"}}})
+        )
+        assert results[self.use_case_id][self.org2.id]["hello"] == existing
+        assert all(results[self.use_case_id][self.org2.id][s] is not None for s in self.strings)
+        assert_fetch_type_for_tag_string_set(
+            results.get_fetch_metadata()[self.use_case_id][self.org2.id],
+            FetchType.FIRST_SEEN,
+            self.strings,
+        )
@@ -571,3 +571,31 @@ def test_default_2022_10_27_strategy(spans: List[Span], expected: Mapping[str, L
         key: hash_values(values)
         for key, values in {**expected, "a" * 16: ["transaction name"]}.items()
     }
+
+
+def test_get_span_groups_dedupes_spans() -> None:
+    calls = []
+
+    def counting_strategy(span: Span) -> Optional[List[str]]:
+        calls.append(span["description"])
+        return None
+
+    strategy = SpanGroupingStrategy(name="counting-strategy", strategies=[counting_strategy])
+    spans = [
+        SpanBuilder().with_op("db").with_description("SELECT 1").build(),
+        SpanBuilder().with_op("db").with_description("SELECT 2").build(),
+        SpanBuilder().with_op("db").with_description("SELECT 1").build(),
+        SpanBuilder().with_op("db").with_description("SELECT 1").with_fingerprint(["a"]).build(),
+    ]
+
+    assert strategy.get_span_groups(spans) == [
+        hash_values(["SELECT 1"]),
+        hash_values(["SELECT 2"]),
+        hash_values(["SELECT 1"]),
+        hash_values(["a"]),
+    ]
+    assert calls == ["SELECT 1", "SELECT 2"]
+
+    # groups are remembered across batches
+    assert strategy.get_span_group(spans[1]) == hash_values(["SELECT 2"])
+    assert calls == ["SELECT 1", "SELECT 2"]
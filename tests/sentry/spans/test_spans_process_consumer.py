@@ -3,12 +3,20 @@ from typing import Any, Dict
 from unittest.mock import Mock
 
 import msgpack
+import pytest
 from arroyo.backends.kafka import KafkaPayload
-from arroyo.types import BrokerValue, Message, Partition, Topic
+from arroyo.processing.strategies import MessageRejected
+from arroyo.types import BrokerValue, Message, Partition, Topic, Value
 
 from sentry.receivers import create_default_projects
-from sentry.spans.consumers.process.factory import ProcessSpansStrategyFactory, _build_snuba_span
+from sentry.spans.consumers.process.factory import (
+    ProcessSpansStrategyFactory,
+    Unbatcher,
+    _build_snuba_span,
+    process_batch,
+)
 from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.utils import json
 
 
 @django_db_all
@@ -125,3 +133,66 @@ def test_null_tags_and_data():
 
     assert snuba_span["sentry_tags"].get("group") is None
     assert snuba_span["sentry_tags"].get("status_code") is None
+
+
+@django_db_all
+def test_process_batch():
+    create_default_projects()
+
+    def make_value(offset: int, payload: bytes) -> BrokerValue[KafkaPayload]:
+        return BrokerValue(
+            KafkaPayload(None, payload, []),
+            Partition(Topic("ingest-spans"), 1),
+            offset,
+            datetime.now(),
+        )
+
+    span = {
+        "description": "SELECT * FROM users WHERE id = %s",
+        "exclusive_time": 1.5,
+        "op": "db",
+        "span_id": "d0a0690671b04a29",
+        "start_timestamp": 1699208266.433295,
+        "timestamp": 1699208266.441931,
+        "trace_id": "3f0bba60b0a7471abe18732abe6506c2",
+    }
+    batch = [
+        make_value(1, msgpack.packb({"project_id": 1, "span": span})),
+        make_value(2, b"not msgpack"),
+        make_value(
+            3, msgpack.packb({"project_id": 1, "span": {**span, "span_id": "ac80578cd5d64fa9"}})
+        ),
+    ]
+
+    payloads = process_batch(Message(Value(batch, {})))
+
+    snuba_spans = [json.loads(payload.value) for payload in payloads]
+    assert [s["span_id"] for s in snuba_spans] == ["d0a0690671b04a29", "ac80578cd5d64fa9"]
+    assert all(s["project_id"] == 1 and s["retention_days"] == 90 for s in snuba_spans)
+
+
+def test_unbatcher_resumes_after_rejection():
+    produced = []
+    rejections = [2]
+
+    def submit(message):
+        if rejections and len(produced) == rejections[0]:
+            rejections.pop()
+            raise MessageRejected()
+        produced.append(message.value)
+
+    next_step = Mock()
+    next_step.submit.side_effect = submit
+    unbatcher = Unbatcher(next_step)
+
+    partition = Partition(Topic("ingest-spans"), 1)
+    payloads = [KafkaPayload(None, f"{i}".encode(), []) for i in range(4)]
+    message = Message(Value(payloads, {partition: 5}))
+
+    with pytest.raises(MessageRejected):
+        unbatcher.submit(message)
+    # the previous step retries the same batch once the next step accepts messages again
+    unbatcher.submit(message)
+
+    assert [value.payload for value in produced] == payloads
+    assert [value.committable for value in produced] == [{}, {}, {}, {partition: 5}]
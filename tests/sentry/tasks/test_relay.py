@@ -12,6 +12,7 @@ from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDe
 from sentry.tasks.relay import (
     _schedule_invalidate_project_config,
     build_project_config,
+    compute_cached_projects_configs,
     invalidate_project_config,
     schedule_build_project_config,
     schedule_invalidate_project_config,
@@ -91,6 +92,8 @@ def redis_cache(monkeypatch):
     monkeypatch.setattr("sentry.relay.projectconfig_cache.set_many", cache.set_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.delete_many", cache.delete_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.get", cache.get)
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.exists_many", cache.exists_many)
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.get_hashes_many", cache.get_hashes_many)
 
     return cache
 
@@ -326,6 +329,45 @@ def test_projectkeys(
         assert not redis_cache.get(key.public_key)
 
 
+@django_db_all
+def test_compute_cached_projects_configs(
+    default_project, default_projectkey, factories, redis_cache, django_cache
+):
+    uncached_key = factories.create_project_key(default_project)
+    other_project = factories.create_project(organization=default_project.organization)
+    other_key = ProjectKey.objects.get(project=other_project)
+
+    redis_cache.set_many({default_projectkey.public_key: {}, other_key.public_key: {}})
+
+    configs = compute_cached_projects_configs(
+        [default_project, other_project], scope="organization"
+    )
+
+    assert set(configs) == {default_projectkey.public_key, other_key.public_key}
+    assert uncached_key.public_key not in configs
+    assert configs[default_projectkey.public_key]["projectId"] == default_project.id
+    assert configs[other_key.public_key]["projectId"] == other_project.id
+
+
+@django_db_all
+def test_compute_cached_projects_configs_unchanged(
+    default_project, default_projectkey, redis_cache, django_cache
+):
+    configs = compute_cached_projects_configs([default_project], scope="project")
+    redis_cache.set_many(configs)
+
+    # Nothing changed, so the cached config is kept as it is
+    assert compute_cached_projects_configs([default_project], scope="project") == {}
+
+    default_project.update_option("sentry:scrub_ip_address", True)
+    configs = compute_cached_projects_configs([default_project], scope="project")
+    assert set(configs) == {default_projectkey.public_key}
+
+
+def test_compute_cached_projects_configs_empty():
+    assert compute_cached_projects_configs([], scope="project") == {}
+
+
 @django_db_all(transaction=True)
 def test_db_transaction(
     default_project,
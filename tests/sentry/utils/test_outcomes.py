@@ -1,4 +1,5 @@
 import types
+from datetime import datetime, timezone
 from unittest import mock
 
 import pytest
@@ -182,3 +183,71 @@ def test_track_outcome_billing_cluster(settings, setup):
         assert topic_name == settings.KAFKA_OUTCOMES_BILLING
 
         assert outcomes.outcomes_publisher is None
+
+
+def test_track_outcome_aggregated(settings, setup):
+    """
+    Checks that identical outcomes are merged into a single message when
+    aggregation is enabled.
+    """
+    settings.SENTRY_OUTCOMES_AGGREGATION_WINDOW = 60
+    timestamp = datetime(2023, 1, 1, 12, 30, 15, tzinfo=timezone.utc)
+
+    for event_id in ("a" * 32, "b" * 32):
+        track_outcome(
+            org_id=1,
+            project_id=2,
+            key_id=3,
+            outcome=Outcome.FILTERED,
+            reason="legacy-browsers",
+            timestamp=timestamp,
+            event_id=event_id,
+            quantity=2,
+        )
+    track_outcome(
+        org_id=1,
+        project_id=2,
+        key_id=3,
+        outcome=Outcome.INVALID,
+        timestamp=timestamp,
+        event_id="c" * 32,
+    )
+
+    assert not setup.mock_publisher.return_value.publish.called
+    outcomes.flush_outcomes()
+
+    payloads = [
+        json.loads(payload)
+        for (_, payload), _ in setup.mock_publisher.return_value.publish.call_args_list
+    ]
+    assert [(p["outcome"], p["event_id"], p["quantity"]) for p in payloads] == [
+        (Outcome.FILTERED.value, None, 4),
+        (Outcome.INVALID.value, "c" * 32, 1),
+    ]
+    assert {p["timestamp"] for p in payloads} == {"2023-01-01T12:30:00.000000Z"}
+    assert setup.mock_publisher.return_value.flush.call_count == 1
+
+
+def test_track_outcome_aggregated_billing(settings, setup):
+    """
+    Checks that billing outcomes bypass the aggregator and are produced right away.
+    """
+    settings.SENTRY_OUTCOMES_AGGREGATION_WINDOW = 60
+
+    track_outcome(org_id=1, project_id=2, key_id=3, outcome=Outcome.ACCEPTED)
+
+    assert setup.mock_publisher.return_value.publish.call_count == 1
+    outcomes.flush_outcomes()
+    assert setup.mock_publisher.return_value.publish.call_count == 1
+
+
+def test_track_outcome_aggregated_max_size(settings, setup):
+    settings.SENTRY_OUTCOMES_AGGREGATION_WINDOW = 60
+    settings.SENTRY_OUTCOMES_AGGREGATION_MAX_SIZE = 2
+
+    for project_id in (1, 2):
+        track_outcome(org_id=1, project_id=project_id, key_id=None, outcome=Outcome.INVALID)
+
+    assert setup.mock_publisher.return_value.publish.call_count == 2
+    # Reaching the maximum size only enqueues the outcomes, without waiting for the producer.
+    assert not setup.mock_publisher.return_value.flush.called